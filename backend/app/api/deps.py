@@ -1,10 +1,12 @@
 """FastAPI dependency injection utilities."""
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from ..database import SessionLocal, get_async_db, get_read_db, get_async_read_db  # noqa: F401 — re-exported for routers
 from ..core.security import decode_token
+from ..core.principal_cache import Principal, principal_cache
 from ..models.user import User
 
 # HTTP Bearer token scheme
@@ -26,16 +28,19 @@ def get_db() -> Generator:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Dependency function to get current authenticated user from JWT token.
 
+    The user is resolved through the principal cache, so the database is
+    only queried on a cache miss.
+
     Args:
         credentials: HTTP Bearer token credentials
         db: Database session
 
     Returns:
-        User object
+        Principal with the user's id, email and admin flag
 
     Raises:
         HTTPException: If token is invalid or user not found
@@ -66,17 +71,25 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    # Fetch user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    # Fetch user from database (off the event loop, this dependency is async)
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.id == user_id).first()
+    )
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(user_id, principal)
+    return principal
 
 
 async def get_current_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Dependency function to ensure current user is an admin.
     Chains on get_current_user for authentication first.
@@ -1,15 +1,19 @@
 """Admin dashboard metrics endpoints."""
-from fastapi import APIRouter, Depends
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, literal, tuple_
+from typing import Literal, Optional
+from uuid import UUID
 from datetime import datetime, date, timedelta, timezone
 
-from ...api.deps import get_db, get_current_admin
-from ...models.user import User, UserSettings, BodyMeasurement
-from ...models.workout import Workout, Set
+from ...api.deps import get_read_db, get_current_admin
+from ...core.principal_cache import principal_cache
+from ...services import platform_metrics
+from ...models.user import User, UserSettings
+from ...models.workout import Workout
 from ...models.nutrition import Meal
-from ...models.exercise import Exercise, WorkoutTemplate
-from ...models.supplement import Supplement
 from ...schemas.admin import (
     AdminOverviewResponse,
     UserGrowthResponse,
@@ -17,6 +21,7 @@ from ...schemas.admin import (
     UserListResponse,
     UserDetailRow,
     FeatureAdoptionResponse,
+    PrincipalCacheStatsResponse,
 )
 
 router = APIRouter()
@@ -25,60 +30,12 @@ router = APIRouter()
 @router.get("/overview", response_model=AdminOverviewResponse)
 def get_admin_overview(
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """Get high-level platform metrics."""
-    total_users = db.query(func.count(User.id)).scalar()
-
-    now = datetime.now(timezone.utc)
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
-
-    # Active users = users with a workout or meal in the window
-    active_7d_workout = db.query(Workout.user_id).filter(
-        Workout.started_at >= seven_days_ago,
-        Workout.deleted_at.is_(None),
-    ).distinct()
-    active_7d_meal = db.query(Meal.user_id).filter(
-        Meal.created_at >= seven_days_ago,
-        Meal.deleted_at.is_(None),
-    ).distinct()
-    active_7d = db.query(func.count()).select_from(
-        active_7d_workout.union(active_7d_meal).subquery()
-    ).scalar()
-
-    active_30d_workout = db.query(Workout.user_id).filter(
-        Workout.started_at >= thirty_days_ago,
-        Workout.deleted_at.is_(None),
-    ).distinct()
-    active_30d_meal = db.query(Meal.user_id).filter(
-        Meal.created_at >= thirty_days_ago,
-        Meal.deleted_at.is_(None),
-    ).distinct()
-    active_30d = db.query(func.count()).select_from(
-        active_30d_workout.union(active_30d_meal).subquery()
-    ).scalar()
-
-    total_completed = db.query(func.count(Workout.id)).filter(
-        Workout.completed_at.isnot(None),
-        Workout.deleted_at.is_(None),
-    ).scalar()
-
-    total_meals = db.query(func.count(Meal.id)).filter(
-        Meal.deleted_at.is_(None),
-    ).scalar()
-
-    total_sets = db.query(func.count(Set.id)).filter(
-        Set.is_completed.is_(True),
-    ).scalar()
-
-    # Avg workouts per active user
-    users_with_workouts = db.query(
-        func.count(func.distinct(Workout.user_id))
-    ).filter(
-        Workout.completed_at.isnot(None),
-        Workout.deleted_at.is_(None),
-    ).scalar()
+    """Get high-level platform metrics from the maintained counters."""
+    counters = platform_metrics.read_counters(db)
+    total_completed = counters.get(platform_metrics.WORKOUTS_COMPLETED, 0)
+    users_with_workouts = counters.get(platform_metrics.USERS_WITH_COMPLETED_WORKOUTS, 0)
 
     avg_per_user = (
         round(total_completed / users_with_workouts, 1)
@@ -87,12 +44,12 @@ def get_admin_overview(
     )
 
     return AdminOverviewResponse(
-        total_users=total_users,
-        users_active_last_7_days=active_7d,
-        users_active_last_30_days=active_30d,
+        total_users=counters.get(platform_metrics.USERS_TOTAL, 0),
+        users_active_last_7_days=platform_metrics.active_users(db, 7),
+        users_active_last_30_days=platform_metrics.active_users(db, 30),
         total_workouts_completed=total_completed,
-        total_meals_logged=total_meals,
-        total_sets_logged=total_sets,
+        total_meals_logged=counters.get(platform_metrics.MEALS_LOGGED, 0),
+        total_sets_logged=counters.get(platform_metrics.SETS_COMPLETED, 0),
         avg_workouts_per_active_user=avg_per_user,
     )
 
@@ -101,7 +58,7 @@ def get_admin_overview(
 def get_user_growth(
     days: int = 30,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get daily user registration counts."""
     today = date.today()
@@ -136,102 +93,166 @@ def get_user_growth(
     return UserGrowthResponse(data_points=data_points)
 
 
+# Sort key -> column of the aggregated user row
+USER_SORT_COLUMNS = {
+    "created_at": "created_at",
+    "email": "email",
+    "last_active": "last_active_sort",
+    "total_workouts": "total_workouts",
+    "total_meals": "total_meals",
+}
+# Users with no activity sort as if last active at the epoch
+_NEVER_ACTIVE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _user_activity_rows(db: Session):
+    """Subquery with one row per user and every UserDetailRow field, aggregated set-wise."""
+    workout_stats = db.query(
+        Workout.user_id,
+        func.count(Workout.id).filter(Workout.completed_at.isnot(None)).label("total_workouts"),
+        func.max(Workout.started_at).label("last_workout"),
+    ).filter(
+        Workout.deleted_at.is_(None),
+    ).group_by(Workout.user_id).subquery()
+
+    meal_stats = db.query(
+        Meal.user_id,
+        func.count(Meal.id).label("total_meals"),
+        func.max(Meal.created_at).label("last_meal"),
+    ).filter(
+        Meal.deleted_at.is_(None),
+    ).group_by(Meal.user_id).subquery()
+
+    # GREATEST ignores NULLs, so one missing side falls back to the other
+    last_active_at = func.greatest(workout_stats.c.last_workout, meal_stats.c.last_meal)
+
+    return db.query(
+        User.id,
+        User.email,
+        User.created_at,
+        func.coalesce(workout_stats.c.total_workouts, 0).label("total_workouts"),
+        func.coalesce(meal_stats.c.total_meals, 0).label("total_meals"),
+        last_active_at.label("last_active_at"),
+        func.coalesce(last_active_at, literal(_NEVER_ACTIVE)).label("last_active_sort"),
+        UserSettings.coach_type,
+        UserSettings.macro_target_calories,
+    ).outerjoin(
+        workout_stats, workout_stats.c.user_id == User.id
+    ).outerjoin(
+        meal_stats, meal_stats.c.user_id == User.id
+    ).outerjoin(
+        UserSettings, UserSettings.user_id == User.id
+    ).subquery()
+
+
+def _encode_user_cursor(sort: str, order: str, value, user_id: UUID) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"sort": sort, "order": order, "value": value, "id": str(user_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_user_cursor(cursor: str, sort: str, order: str) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["sort"] != sort or payload["order"] != order:
+            raise ValueError("cursor was issued for a different ordering")
+        value = payload["value"]
+        if USER_SORT_COLUMNS[sort] in ("created_at", "last_active_sort"):
+            value = datetime.fromisoformat(value)
+        return value, UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("/users", response_model=UserListResponse)
 def get_user_list(
+    sort: Literal["created_at", "email", "last_active", "total_workouts", "total_meals"] = Query("created_at"),
+    order: Literal["asc", "desc"] = Query("desc"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """Get all users with activity summaries."""
-    users = db.query(User).order_by(User.created_at.desc()).all()
-
-    rows = []
-    for u in users:
-        workout_count = db.query(func.count(Workout.id)).filter(
-            Workout.user_id == u.id,
-            Workout.completed_at.isnot(None),
-            Workout.deleted_at.is_(None),
-        ).scalar()
-
-        meal_count = db.query(func.count(Meal.id)).filter(
-            Meal.user_id == u.id,
-            Meal.deleted_at.is_(None),
-        ).scalar()
-
-        # Last active: most recent workout or meal
-        last_workout = db.query(func.max(Workout.started_at)).filter(
-            Workout.user_id == u.id,
-            Workout.deleted_at.is_(None),
-        ).scalar()
-        last_meal = db.query(func.max(Meal.created_at)).filter(
-            Meal.user_id == u.id,
-            Meal.deleted_at.is_(None),
-        ).scalar()
-        last_active_dt = max(filter(None, [last_workout, last_meal]), default=None)
-        last_active = last_active_dt.date() if last_active_dt else None
-
-        settings = db.query(UserSettings).filter(
-            UserSettings.user_id == u.id
-        ).first()
-
-        rows.append(UserDetailRow(
-            email=u.email,
-            created_at=u.created_at.date(),
-            last_active=last_active,
-            total_workouts=workout_count,
-            total_meals=meal_count,
-            coach_type=settings.coach_type if settings else None,
-            has_macro_targets=bool(settings and settings.macro_target_calories),
-        ))
-
-    return UserListResponse(users=rows, total=len(rows))
+    """
+    Get users with activity summaries, one keyset-paginated page at a time.
+
+    Every field comes from a single aggregated query, so the cost does not
+    grow with the number of users on the page.
+    """
+    rows = _user_activity_rows(db)
+    sort_col = rows.c[USER_SORT_COLUMNS[sort]]
+
+    query = db.query(rows)
+    if cursor:
+        value, last_id = _decode_user_cursor(cursor, sort, order)
+        position = tuple_(sort_col, rows.c.id)
+        if order == "desc":
+            query = query.filter(position < tuple_(value, last_id))
+        else:
+            query = query.filter(position > tuple_(value, last_id))
+
+    if order == "desc":
+        query = query.order_by(sort_col.desc(), rows.c.id.desc())
+    else:
+        query = query.order_by(sort_col.asc(), rows.c.id.asc())
+    page = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        next_cursor = _encode_user_cursor(sort, order, getattr(last, USER_SORT_COLUMNS[sort]), last.id)
+
+    total = db.query(func.count(User.id)).scalar()
+
+    users = [
+        UserDetailRow(
+            email=row.email,
+            created_at=row.created_at.date(),
+            last_active=row.last_active_at.date() if row.last_active_at else None,
+            total_workouts=row.total_workouts,
+            total_meals=row.total_meals,
+            coach_type=row.coach_type,
+            has_macro_targets=bool(row.macro_target_calories),
+        )
+        for row in page
+    ]
+
+    return UserListResponse(users=users, total=total, next_cursor=next_cursor)
 
 
 @router.get("/feature-adoption", response_model=FeatureAdoptionResponse)
 def get_feature_adoption(
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """Get feature adoption metrics across all users."""
-    users_with_templates = db.query(
-        func.count(func.distinct(WorkoutTemplate.user_id))
-    ).filter(WorkoutTemplate.deleted_at.is_(None)).scalar()
-
-    users_with_custom_exercises = db.query(
-        func.count(func.distinct(Exercise.user_id))
-    ).filter(
-        Exercise.is_custom.is_(True),
-        Exercise.deleted_at.is_(None),
-    ).scalar()
-
-    users_with_meals = db.query(
-        func.count(func.distinct(Meal.user_id))
-    ).filter(Meal.deleted_at.is_(None)).scalar()
-
-    users_with_macros = db.query(func.count(UserSettings.id)).filter(
-        UserSettings.macro_target_calories.isnot(None),
-    ).scalar()
-
-    users_with_supplements = db.query(
-        func.count(func.distinct(Supplement.user_id))
-    ).scalar()
-
-    users_with_measurements = db.query(
-        func.count(func.distinct(BodyMeasurement.user_id))
-    ).scalar()
-
-    # Coach type breakdown
-    coach_counts = db.query(
-        UserSettings.coach_type,
-        func.count(UserSettings.id),
-    ).group_by(UserSettings.coach_type).all()
-    coach_breakdown = {ct: count for ct, count in coach_counts if ct}
+    """Get feature adoption metrics as of the last metrics compaction."""
+    counters = platform_metrics.read_counters(db)
+    prefix = platform_metrics.COACH_TYPE_PREFIX
+    coach_breakdown = {
+        name[len(prefix):]: count
+        for name, count in counters.items()
+        if name.startswith(prefix)
+    }
 
     return FeatureAdoptionResponse(
-        users_with_templates=users_with_templates,
-        users_with_custom_exercises=users_with_custom_exercises,
-        users_with_meals=users_with_meals,
-        users_with_macro_targets=users_with_macros,
-        users_with_supplements=users_with_supplements,
-        users_with_measurements=users_with_measurements,
+        users_with_templates=counters.get(platform_metrics.USERS_WITH_TEMPLATES, 0),
+        users_with_custom_exercises=counters.get(platform_metrics.USERS_WITH_CUSTOM_EXERCISES, 0),
+        users_with_meals=counters.get(platform_metrics.USERS_WITH_MEALS, 0),
+        users_with_macro_targets=counters.get(platform_metrics.USERS_WITH_MACRO_TARGETS, 0),
+        users_with_supplements=counters.get(platform_metrics.USERS_WITH_SUPPLEMENTS, 0),
+        users_with_measurements=counters.get(platform_metrics.USERS_WITH_MEASUREMENTS, 0),
         coach_type_breakdown=coach_breakdown,
     )
+
+
+@router.get("/principal-cache", response_model=PrincipalCacheStatsResponse)
+def get_principal_cache_stats(
+    current_user: User = Depends(get_current_admin),
+):
+    """Get hit/miss counters for the in-process authenticated principal cache."""
+    return PrincipalCacheStatsResponse(**principal_cache.stats())
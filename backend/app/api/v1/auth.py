@@ -11,6 +11,7 @@ from ...core.security import (
 )
 from ...config import settings as app_settings
 from ...models.user import User, UserSettings
+from ...services import platform_metrics
 from ...schemas.auth import UserRegister, UserLogin, Token, TokenRefresh, UserResponse
 
 router = APIRouter()
@@ -53,6 +54,8 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     # Create default user settings
     settings = UserSettings(user_id=user.id)
     db.add(settings)
+    platform_metrics.increment(db, platform_metrics.USERS_TOTAL)
+    platform_metrics.settings_changed(db, settings)
 
     db.commit()
     db.refresh(user)
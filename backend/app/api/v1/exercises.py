@@ -10,6 +10,7 @@ from ...api.deps import get_db, get_current_user
 from ...models.user import User
 from ...models.exercise import Exercise
 from ...schemas.exercise import ExerciseCreate, ExerciseUpdate, ExerciseResponse
+from ...services import platform_metrics
 
 router = APIRouter()
 
@@ -69,6 +70,12 @@ def create_exercise(
         is_custom=True,
         user_id=current_user.id
     )
+    platform_metrics.increment_if_first(
+        db, platform_metrics.USERS_WITH_CUSTOM_EXERCISES,
+        Exercise.user_id == current_user.id,
+        Exercise.is_custom.is_(True),
+        Exercise.deleted_at.is_(None),
+    )
     db.add(exercise)
     db.commit()
     db.refresh(exercise)
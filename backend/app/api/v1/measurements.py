@@ -1,13 +1,15 @@
 """Body measurements API endpoints."""
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
 from pydantic import BaseModel
 from typing import Optional, List
 
-from ...database import get_db
+from ...database import get_async_db
 from ...models.user import User, BodyMeasurement
+from ...services import platform_metrics
 from ..deps import get_current_user
 
 
@@ -38,16 +40,16 @@ class MeasurementResponse(BaseModel):
 async def log_measurement(
     request: CreateMeasurementRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Log a body measurement. Upserts — if an entry exists for the given date, it updates it.
     """
     # Check for existing entry on this date
-    existing = db.query(BodyMeasurement).filter(
+    existing = (await db.execute(select(BodyMeasurement).where(
         BodyMeasurement.user_id == current_user.id,
         BodyMeasurement.measurement_date == request.measurement_date,
-    ).first()
+    ))).scalars().first()
 
     if existing:
         # Update existing entry
@@ -55,8 +57,8 @@ async def log_measurement(
             existing.weight = request.weight
         if request.notes is not None:
             existing.notes = request.notes
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         return _to_response(existing)
 
     # Create new entry
@@ -67,9 +69,12 @@ async def log_measurement(
         weight=request.weight,
         notes=request.notes,
     )
+    await platform_metrics.increment_if_first_async(
+        db, platform_metrics.USERS_WITH_MEASUREMENTS, BodyMeasurement.user_id == current_user.id
+    )
     db.add(measurement)
-    db.commit()
-    db.refresh(measurement)
+    await db.commit()
+    await db.refresh(measurement)
     return _to_response(measurement)
 
 
@@ -78,7 +83,7 @@ async def get_measurements(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get body measurements in a date range. Defaults to last 30 days."""
     if end_date is None:
@@ -86,11 +91,11 @@ async def get_measurements(
     if start_date is None:
         start_date = end_date - timedelta(days=30)
 
-    measurements = db.query(BodyMeasurement).filter(
+    measurements = (await db.execute(select(BodyMeasurement).where(
         BodyMeasurement.user_id == current_user.id,
         BodyMeasurement.measurement_date >= start_date,
         BodyMeasurement.measurement_date <= end_date,
-    ).order_by(BodyMeasurement.measurement_date.desc()).all()
+    ).order_by(BodyMeasurement.measurement_date.desc()))).scalars().all()
 
     return [_to_response(m) for m in measurements]
 
@@ -98,12 +103,12 @@ async def get_measurements(
 @router.get("/measurements/latest", response_model=Optional[MeasurementResponse])
 async def get_latest_measurement(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get the most recent body measurement."""
-    measurement = db.query(BodyMeasurement).filter(
+    measurement = (await db.execute(select(BodyMeasurement).where(
         BodyMeasurement.user_id == current_user.id,
-    ).order_by(BodyMeasurement.measurement_date.desc()).first()
+    ).order_by(BodyMeasurement.measurement_date.desc()).limit(1))).scalars().first()
 
     if not measurement:
         return None
@@ -115,19 +120,19 @@ async def get_latest_measurement(
 async def delete_measurement(
     measurement_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a body measurement."""
-    measurement = db.query(BodyMeasurement).filter(
+    measurement = (await db.execute(select(BodyMeasurement).where(
         BodyMeasurement.id == measurement_id,
         BodyMeasurement.user_id == current_user.id,
-    ).first()
+    ))).scalars().first()
 
     if not measurement:
         raise HTTPException(status_code=404, detail="Measurement not found")
 
-    db.delete(measurement)
-    db.commit()
+    await db.delete(measurement)
+    await db.commit()
     return {"message": "Measurement deleted"}
 
 
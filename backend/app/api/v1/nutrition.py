@@ -1,14 +1,14 @@
 """Nutrition tracking endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, date, timedelta, timezone
 
 from ...api.deps import get_db, get_current_user
 from ...models.user import User, UserSettings
-from ...models.nutrition import MealCategory, Food, Meal, MealItem, CheatDay
+from ...models.nutrition import MealCategory, Food, Meal, MealItem, CheatDay, DailyNutritionTotal
 from ...schemas.nutrition import (
     MealCategoryCreate,
     MealCategoryUpdate,
@@ -28,6 +28,8 @@ from ...schemas.nutrition import (
     CheatDayToggleRequest,
     CheatDayResponse,
 )
+from ...services import nutrition_totals, platform_metrics
+from ...services.food_search import search_foods
 
 router = APIRouter()
 
@@ -134,8 +136,12 @@ def get_foods(
     """
     Get foods (system + user custom foods).
 
-    Supports search by name.
+    With a search term, results are ranked by name similarity and boosted
+    for foods the user logged recently; otherwise they are ordered by name.
     """
+    if search:
+        return search_foods(db, current_user.id, search, skip, limit)
+
     query = db.query(Food).filter(
         and_(
             Food.deleted_at.is_(None),
@@ -146,10 +152,6 @@ def get_foods(
         )
     )
 
-    # Apply search filter
-    if search:
-        query = query.filter(Food.name.ilike(f"%{search}%"))
-
     # Order by name and apply pagination
     foods = query.order_by(Food.name).offset(skip).limit(limit).all()
 
@@ -278,10 +280,14 @@ def create_meal(
         meal_date=meal_data.meal_date,
         meal_time=meal_data.meal_time
     )
+    platform_metrics.increment_if_first(
+        db, platform_metrics.USERS_WITH_MEALS, Meal.user_id == current_user.id, Meal.deleted_at.is_(None)
+    )
     db.add(meal)
     db.flush()
 
     # Add food items with macro snapshots
+    items = []
     for item_data in meal_data.items:
         # Get food
         food = db.query(Food).filter(
@@ -307,7 +313,11 @@ def create_meal(
             fat_snapshot=food.fat,
         )
         db.add(meal_item)
+        items.append(meal_item)
 
+    nutrition_totals.add_meal(db, meal, items)
+    platform_metrics.increment(db, platform_metrics.MEALS_LOGGED)
+    platform_metrics.record_activity(db, current_user.id)
     db.commit()
     db.refresh(meal)
 
@@ -392,6 +402,8 @@ def delete_meal(
         )
 
     meal.deleted_at = datetime.now(timezone.utc)
+    nutrition_totals.remove_meal(db, meal)
+    platform_metrics.increment(db, platform_metrics.MEALS_LOGGED, -1)
     db.commit()
     return None
 
@@ -464,6 +476,9 @@ def delete_meal_item(
             detail="Meal item not found"
         )
 
+    if item.meal.deleted_at is None:
+        nutrition_totals.remove_item(db, item.meal, item)
+    item.meal.updated_at = datetime.now(timezone.utc)
     db.delete(item)
     db.commit()
     return None
@@ -488,7 +503,11 @@ def update_meal_item(
             detail="Meal item not found"
         )
 
+    old_servings = item.servings
     item.servings = item_data.servings
+    if item.meal.deleted_at is None:
+        nutrition_totals.change_servings(db, item.meal, item, old_servings)
+    item.meal.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(item)
     return item
@@ -535,6 +554,8 @@ def add_meal_item(
         servings=item_data.servings
     )
     db.add(meal_item)
+    nutrition_totals.add_item(db, meal, meal_item)
+    meal.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(meal_item)
 
@@ -572,10 +593,14 @@ def copy_meal(
         meal_date=copy_data.get('meal_date'),
         meal_time=copy_data.get('meal_time')
     )
+    platform_metrics.increment_if_first(
+        db, platform_metrics.USERS_WITH_MEALS, Meal.user_id == current_user.id, Meal.deleted_at.is_(None)
+    )
     db.add(new_meal)
     db.flush()
 
     # Copy all meal items
+    new_items = []
     for item in original_meal.items:
         new_item = MealItem(
             meal_id=new_meal.id,
@@ -588,7 +613,11 @@ def copy_meal(
             servings=item.servings
         )
         db.add(new_item)
+        new_items.append(new_item)
 
+    nutrition_totals.add_meal(db, new_meal, new_items)
+    platform_metrics.increment(db, platform_metrics.MEALS_LOGGED)
+    platform_metrics.record_activity(db, current_user.id)
     db.commit()
     db.refresh(new_meal)
 
@@ -618,16 +647,10 @@ def get_nutrition_summary(
         UserSettings.user_id == current_user.id
     ).first()
 
-    # Calculate totals from meal items for the date (multiply by servings)
-    totals = db.query(
-        func.sum(MealItem.calories_snapshot * MealItem.servings).label('total_calories'),
-        func.sum(MealItem.protein_snapshot * MealItem.servings).label('total_protein'),
-        func.sum(MealItem.carbs_snapshot * MealItem.servings).label('total_carbs'),
-        func.sum(MealItem.fat_snapshot * MealItem.servings).label('total_fat'),
-    ).join(Meal).filter(
-        Meal.user_id == current_user.id,
-        Meal.meal_date == summary_date,
-        Meal.deleted_at.is_(None)
+    # Day totals come from the maintained rollup
+    totals = db.query(DailyNutritionTotal).filter(
+        DailyNutritionTotal.user_id == current_user.id,
+        DailyNutritionTotal.total_date == summary_date
     ).first()
 
     # Check if this date is a cheat day
@@ -639,10 +662,10 @@ def get_nutrition_summary(
     return NutritionSummaryResponse(
         date=summary_date,
         is_cheat_day=is_cheat_day,
-        total_calories=int(totals.total_calories or 0),
-        total_protein=int(totals.total_protein or 0),
-        total_carbs=int(totals.total_carbs or 0),
-        total_fat=int(totals.total_fat or 0),
+        total_calories=int(totals.calories) if totals else 0,
+        total_protein=int(totals.protein) if totals else 0,
+        total_carbs=int(totals.carbs) if totals else 0,
+        total_fat=int(totals.fat) if totals else 0,
         target_calories=settings.macro_target_calories if settings else None,
         target_protein=settings.macro_target_protein if settings else None,
         target_carbs=settings.macro_target_carbs if settings else None,
@@ -673,27 +696,21 @@ def get_weekly_average(
     cheat_date_set = {cd.cheat_date for cd in cheat_days_in_range}
     cheat_day_count = len(cheat_date_set)
 
-    # Query daily totals for each day in range (multiply by servings)
-    daily_totals = db.query(
-        Meal.meal_date,
-        func.sum(MealItem.calories_snapshot * MealItem.servings).label('daily_calories'),
-        func.sum(MealItem.protein_snapshot * MealItem.servings).label('daily_protein'),
-        func.sum(MealItem.carbs_snapshot * MealItem.servings).label('daily_carbs'),
-        func.sum(MealItem.fat_snapshot * MealItem.servings).label('daily_fat'),
-    ).join(MealItem).filter(
-        Meal.user_id == current_user.id,
-        Meal.meal_date >= start_date,
-        Meal.meal_date <= end_date,
-        Meal.deleted_at.is_(None)
-    ).group_by(Meal.meal_date).all()
+    # Daily totals for days in range that have logged items
+    daily_totals = db.query(DailyNutritionTotal).filter(
+        DailyNutritionTotal.user_id == current_user.id,
+        DailyNutritionTotal.total_date >= start_date,
+        DailyNutritionTotal.total_date <= end_date,
+        DailyNutritionTotal.item_count > 0
+    ).all()
 
     # Exclude cheat days from totals
-    non_cheat_totals = [day for day in daily_totals if day.meal_date not in cheat_date_set]
+    non_cheat_totals = [day for day in daily_totals if day.total_date not in cheat_date_set]
 
-    total_calories = sum(day.daily_calories or 0 for day in non_cheat_totals)
-    total_protein = sum(day.daily_protein or 0 for day in non_cheat_totals)
-    total_carbs = sum(day.daily_carbs or 0 for day in non_cheat_totals)
-    total_fat = sum(day.daily_fat or 0 for day in non_cheat_totals)
+    total_calories = sum(day.calories for day in non_cheat_totals)
+    total_protein = sum(day.protein for day in non_cheat_totals)
+    total_carbs = sum(day.carbs for day in non_cheat_totals)
+    total_fat = sum(day.fat for day in non_cheat_totals)
 
     # Get user settings for targets
     settings = db.query(UserSettings).filter(
@@ -2,8 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from ...database import get_db
 from ...models.user import User, UserSettings
+from ...services import platform_metrics
 from ..deps import get_current_user
 from pydantic import BaseModel
 
@@ -28,6 +30,7 @@ class UserSettingsResponse(BaseModel):
     macro_percentage_carbs: Optional[int]
     macro_percentage_fat: Optional[int]
     coach_type: str
+    timezone: str
 
     class Config:
         from_attributes = True
@@ -47,6 +50,7 @@ class UpdateUserSettingsRequest(BaseModel):
     macro_percentage_carbs: Optional[int] = None
     macro_percentage_fat: Optional[int] = None
     coach_type: Optional[str] = None
+    timezone: Optional[str] = None
 
 
 @router.get("/settings", response_model=UserSettingsResponse)
@@ -67,6 +71,7 @@ def get_user_settings(
             default_rest_timer=90,
         )
         db.add(settings)
+        platform_metrics.settings_changed(db, settings)
         db.commit()
         db.refresh(settings)
 
@@ -86,6 +91,9 @@ def update_user_settings(
     if not settings:
         settings = UserSettings(user_id=current_user.id)
         db.add(settings)
+        old_coach_type, had_macro_target = None, False
+    else:
+        old_coach_type, had_macro_target = settings.coach_type, settings.macro_target_calories is not None
 
     # Update provided fields
     if request.theme is not None:
@@ -108,6 +116,13 @@ def update_user_settings(
             raise HTTPException(status_code=400, detail=f"Coach type must be one of: {', '.join(VALID_COACHES)}")
         settings.coach_type = request.coach_type
 
+    if request.timezone is not None:
+        try:
+            ZoneInfo(request.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise HTTPException(status_code=400, detail="Timezone must be an IANA name such as 'America/New_York'")
+        settings.timezone = request.timezone
+
     # Handle macro input mode
     if request.macro_input_mode is not None:
         if request.macro_input_mode not in ["grams", "percentage"]:
@@ -176,6 +191,7 @@ def update_user_settings(
         settings.macro_percentage_carbs = None
         settings.macro_percentage_fat = None
 
+    platform_metrics.settings_changed(db, settings, old_coach_type, had_macro_target)
     db.commit()
     db.refresh(settings)
 
@@ -1,15 +1,16 @@
 """Supplement tracking API endpoints."""
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from datetime import date
 from pydantic import BaseModel
 from typing import Optional, List
 
-from ...database import get_db
+from ...database import get_async_db
 from ...models.user import User
 from ...models.supplement import Supplement, SupplementLog
+from ...services import platform_metrics
 from ..deps import get_current_user
 
 
@@ -84,14 +85,14 @@ class SupplementWithLogResponse(BaseModel):
 async def create_supplement(
     request: CreateSupplementRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new supplement."""
     # Check for duplicate name (case-insensitive)
-    existing = db.query(Supplement).filter(
+    existing = (await db.execute(select(Supplement).where(
         Supplement.user_id == current_user.id,
         func.lower(Supplement.name) == request.name.strip().lower(),
-    ).first()
+    ))).scalars().first()
 
     if existing:
         raise HTTPException(status_code=400, detail="A supplement with this name already exists")
@@ -104,9 +105,12 @@ async def create_supplement(
         dosage=request.dosage.strip() if request.dosage else None,
         notes=request.notes.strip() if request.notes else None,
     )
+    await platform_metrics.increment_if_first_async(
+        db, platform_metrics.USERS_WITH_SUPPLEMENTS, Supplement.user_id == current_user.id
+    )
     db.add(supplement)
-    db.commit()
-    db.refresh(supplement)
+    await db.commit()
+    await db.refresh(supplement)
     return _to_supplement_response(supplement)
 
 
@@ -114,16 +118,16 @@ async def create_supplement(
 async def get_supplements(
     include_inactive: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List user's supplements."""
-    query = db.query(Supplement).filter(
+    query = select(Supplement).where(
         Supplement.user_id == current_user.id,
     )
     if not include_inactive:
-        query = query.filter(Supplement.is_active == True)  # noqa: E712
+        query = query.where(Supplement.is_active == True)  # noqa: E712
 
-    supplements = query.order_by(Supplement.name).all()
+    supplements = (await db.execute(query.order_by(Supplement.name))).scalars().all()
     return [_to_supplement_response(s) for s in supplements]
 
 
@@ -131,7 +135,7 @@ async def get_supplements(
 async def get_daily_supplements(
     date: Optional[date] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get active supplements with daily log status for a given date."""
     if date is None:
@@ -139,17 +143,17 @@ async def get_daily_supplements(
         date = date_module.today()
 
     # Get active supplements
-    supplements = db.query(Supplement).filter(
+    supplements = (await db.execute(select(Supplement).where(
         Supplement.user_id == current_user.id,
         Supplement.is_active == True,  # noqa: E712
-    ).order_by(Supplement.name).all()
+    ).order_by(Supplement.name))).scalars().all()
 
     # Get logs for this date
-    logs = db.query(SupplementLog).filter(
+    logs = (await db.execute(select(SupplementLog).where(
         SupplementLog.user_id == current_user.id,
         SupplementLog.log_date == date,
         SupplementLog.taken == True,  # noqa: E712
-    ).all()
+    ))).scalars().all()
     logged_ids = {log.supplement_id for log in logs}
 
     return [
@@ -170,24 +174,24 @@ async def update_supplement(
     supplement_id: str,
     request: UpdateSupplementRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a supplement."""
-    supplement = db.query(Supplement).filter(
+    supplement = (await db.execute(select(Supplement).where(
         Supplement.id == supplement_id,
         Supplement.user_id == current_user.id,
-    ).first()
+    ))).scalars().first()
 
     if not supplement:
         raise HTTPException(status_code=404, detail="Supplement not found")
 
     if request.name is not None:
         # Check for duplicate name (case-insensitive), excluding current
-        existing = db.query(Supplement).filter(
+        existing = (await db.execute(select(Supplement).where(
             Supplement.user_id == current_user.id,
             func.lower(Supplement.name) == request.name.strip().lower(),
             Supplement.id != supplement.id,
-        ).first()
+        ))).scalars().first()
         if existing:
             raise HTTPException(status_code=400, detail="A supplement with this name already exists")
         supplement.name = request.name.strip()
@@ -201,8 +205,8 @@ async def update_supplement(
     if request.is_active is not None:
         supplement.is_active = request.is_active
 
-    db.commit()
-    db.refresh(supplement)
+    await db.commit()
+    await db.refresh(supplement)
     return _to_supplement_response(supplement)
 
 
@@ -210,19 +214,19 @@ async def update_supplement(
 async def delete_supplement(
     supplement_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a supplement and all its logs."""
-    supplement = db.query(Supplement).filter(
+    supplement = (await db.execute(select(Supplement).where(
         Supplement.id == supplement_id,
         Supplement.user_id == current_user.id,
-    ).first()
+    ))).scalars().first()
 
     if not supplement:
         raise HTTPException(status_code=404, detail="Supplement not found")
 
-    db.delete(supplement)
-    db.commit()
+    await db.delete(supplement)
+    await db.commit()
     return {"message": "Supplement deleted"}
 
 
@@ -232,28 +236,28 @@ async def delete_supplement(
 async def log_supplement(
     request: LogSupplementRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Log taking a supplement. Upserts — if a log exists for this supplement+date, updates it."""
     # Verify supplement belongs to user
-    supplement = db.query(Supplement).filter(
+    supplement = (await db.execute(select(Supplement).where(
         Supplement.id == request.supplement_id,
         Supplement.user_id == current_user.id,
-    ).first()
+    ))).scalars().first()
 
     if not supplement:
         raise HTTPException(status_code=404, detail="Supplement not found")
 
     # Check for existing log
-    existing = db.query(SupplementLog).filter(
+    existing = (await db.execute(select(SupplementLog).where(
         SupplementLog.supplement_id == supplement.id,
         SupplementLog.log_date == request.log_date,
-    ).first()
+    ))).scalars().first()
 
     if existing:
         existing.taken = True
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         return _to_log_response(existing)
 
     log = SupplementLog(
@@ -264,8 +268,8 @@ async def log_supplement(
         taken=True,
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    await db.commit()
+    await db.refresh(log)
     return _to_log_response(log)
 
 
@@ -274,20 +278,20 @@ async def unlog_supplement(
     supplement_id: str,
     log_date: date,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Remove a supplement log entry."""
-    log = db.query(SupplementLog).filter(
+    log = (await db.execute(select(SupplementLog).where(
         SupplementLog.supplement_id == supplement_id,
         SupplementLog.log_date == log_date,
         SupplementLog.user_id == current_user.id,
-    ).first()
+    ))).scalars().first()
 
     if not log:
         raise HTTPException(status_code=404, detail="Log entry not found")
 
-    db.delete(log)
-    db.commit()
+    await db.delete(log)
+    await db.commit()
     return {"message": "Supplement log removed"}
 
 
@@ -0,0 +1,156 @@
+"""Delta sync endpoint for the offline PWA."""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Session, selectinload
+
+from ...api.deps import get_db, get_current_user
+from ...models.user import User
+from ...models.exercise import Exercise, WorkoutTemplate, TemplateExercise
+from ...models.workout import Workout
+from ...models.nutrition import MealCategory, Food, Meal
+from ...schemas.sync import SyncChangesResponse, SyncTombstone
+
+router = APIRouter()
+
+# Rows stamped within this window may belong to transactions that have not
+# committed yet, so a page never reads past now() minus this lag
+SETTLE_SECONDS = 2
+
+
+@dataclass
+class _SyncStream:
+    """One entity feed ordered by (updated_at, id)."""
+    entity: str
+    model: Any
+    scope: Callable[[UUID], Any]
+    options: Tuple = ()
+
+
+STREAMS = [
+    _SyncStream(
+        "exercises", Exercise,
+        lambda user_id: or_(Exercise.is_custom == False, Exercise.user_id == user_id),
+    ),
+    # System foods are searched online; only the user's custom foods sync
+    _SyncStream(
+        "foods", Food,
+        lambda user_id: and_(Food.is_custom == True, Food.user_id == user_id),
+    ),
+    _SyncStream(
+        "meal_categories", MealCategory,
+        lambda user_id: MealCategory.user_id == user_id,
+    ),
+    _SyncStream(
+        "templates", WorkoutTemplate,
+        lambda user_id: WorkoutTemplate.user_id == user_id,
+        (selectinload(WorkoutTemplate.exercises).selectinload(TemplateExercise.exercise),),
+    ),
+    _SyncStream(
+        "workouts", Workout,
+        lambda user_id: Workout.user_id == user_id,
+        (selectinload(Workout.sets),),
+    ),
+    _SyncStream(
+        "meals", Meal,
+        lambda user_id: Meal.user_id == user_id,
+        (selectinload(Meal.items),),
+    ),
+]
+
+
+def _encode_cursor(positions: Dict[str, Tuple[datetime, UUID]], until: Optional[datetime]) -> str:
+    payload = {
+        "pos": {entity: [ts.isoformat(), str(row_id)] for entity, (ts, row_id) in positions.items()},
+        "until": until.isoformat() if until else None,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Tuple[Dict[str, Tuple[datetime, UUID]], Optional[datetime]]:
+    if not cursor:
+        return {}, None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        positions = {
+            entity: (datetime.fromisoformat(ts), UUID(row_id))
+            for entity, (ts, row_id) in payload["pos"].items()
+        }
+        until = datetime.fromisoformat(payload["until"]) if payload.get("until") else None
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync cursor"
+        )
+    return positions, until
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def get_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous response; omit for a full sync"),
+    limit: int = Query(200, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get every row changed since a cursor, including soft-delete tombstones.
+
+    Each entity is read in (updated_at, id) order from its own position in
+    the cursor. While has_more is true, pass next_cursor back to fetch the
+    next page; once it is false, store next_cursor for the next reconnect.
+    """
+    positions, until = _decode_cursor(since)
+    if until is None:
+        until = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+
+    response: Dict[str, List] = {stream.entity: [] for stream in STREAMS}
+    deleted: List[SyncTombstone] = []
+    remaining = limit
+    has_more = False
+
+    for stream in STREAMS:
+        if remaining <= 0:
+            has_more = True
+            break
+
+        model = stream.model
+        query = db.query(model).filter(
+            stream.scope(current_user.id),
+            model.updated_at <= until,
+        )
+        position = positions.get(stream.entity)
+        if position:
+            query = query.filter(tuple_(model.updated_at, model.id) > tuple_(*position))
+        rows = query.options(*stream.options).order_by(
+            model.updated_at, model.id
+        ).limit(remaining + 1).all()
+
+        if len(rows) > remaining:
+            rows = rows[:remaining]
+            has_more = True
+
+        for row in rows:
+            if row.deleted_at is not None:
+                deleted.append(SyncTombstone(entity=stream.entity, id=row.id))
+            else:
+                response[stream.entity].append(row)
+        if rows:
+            positions[stream.entity] = (rows[-1].updated_at, rows[-1].id)
+        remaining -= len(rows)
+
+        if has_more:
+            break
+
+    return SyncChangesResponse(
+        **response,
+        deleted=deleted,
+        # Keep the read window fixed while paginating; a finished sync starts fresh next time
+        next_cursor=_encode_cursor(positions, until if has_more else None),
+        has_more=has_more,
+    )
@@ -1,15 +1,17 @@
 """Workout logging and template management endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, func, insert
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, date, timedelta, timezone
 
-from ...api.deps import get_db, get_current_user
+from ...api.deps import get_db, get_read_db, get_current_user
 from ...models.user import User
 from ...models.exercise import Exercise, WorkoutTemplate, TemplateExercise
-from ...models.workout import Workout, Set
+from ...models.workout import Workout, Set, PersonalRecord
+from ...services import exercise_progression, last_performance, personal_records, platform_metrics
 from ...schemas.exercise import (
     WorkoutTemplateCreate,
     WorkoutTemplateUpdate,
@@ -24,6 +26,7 @@ from ...schemas.workout import (
     SetCreate,
     SetUpdate,
     SetResponse,
+    SetBatchRequest,
     SaveAsTemplateRequest,
     SwapExerciseRequest,
     PreviousPerformanceResponse,
@@ -32,6 +35,8 @@ from ...schemas.workout import (
     LastCompletedWorkoutResponse,
     LastWorkoutExerciseSummary,
     RecentPRResponse,
+    ExerciseProgressionResponse,
+    ExerciseWeekStats,
 )
 
 router = APIRouter()
@@ -73,6 +78,11 @@ def create_template(
         workout_type=template_data.workout_type,
         user_id=current_user.id
     )
+    platform_metrics.increment_if_first(
+        db, platform_metrics.USERS_WITH_TEMPLATES,
+        WorkoutTemplate.user_id == current_user.id,
+        WorkoutTemplate.deleted_at.is_(None),
+    )
     db.add(template)
     db.flush()
 
@@ -260,8 +270,11 @@ def create_workout(
     db.add(workout)
     db.flush()  # Get workout.id
 
-    # If using a template, create sets from template exercises
+    # If using a template, create its sets with one INSERT ... RETURNING
+    sets = []
     if template:
+        now = datetime.now(timezone.utc)
+        rows = []
         for template_exercise in template.exercises:
             # Tally mode exercises start with zero sets — user adds them via taps
             if template_exercise.tally_mode:
@@ -273,24 +286,33 @@ def create_workout(
 
             # Create sets for this exercise
             for set_num in range(1, target_sets + 1):
-                workout_set = Set(
-                    workout_id=workout.id,
-                    exercise_id=template_exercise.exercise_id,
-                    exercise_name_snapshot=template_exercise.exercise.name,
-                    set_number=set_num,
-                    set_type='normal',
-                    weight=target_weight if target_weight > 0 else None,
-                    reps=target_reps,
-                    rpe=None,
-                    is_completed=False,
-                    completed_at=None
-                )
-                db.add(workout_set)
-
+                rows.append({
+                    "workout_id": workout.id,
+                    "exercise_id": template_exercise.exercise_id,
+                    "exercise_name_snapshot": template_exercise.exercise.name,
+                    "set_number": set_num,
+                    "set_type": 'normal',
+                    "weight": target_weight if target_weight > 0 else None,
+                    "reps": target_reps,
+                    "rpe": None,
+                    "is_completed": False,
+                    "completed_at": None,
+                    # Sets are ordered by created_at, so keep template order explicit
+                    "created_at": now + timedelta(microseconds=len(rows)),
+                })
+        if rows:
+            sets = db.scalars(
+                insert(Set).returning(Set, sort_by_parameter_order=True), rows
+            ).all()
+
+    # Hand the new sets to the relationship so the response needs no reload
+    set_committed_value(workout, "sets", list(sets))
+    response = WorkoutResponse.model_validate(workout)
+
+    platform_metrics.record_activity(db, current_user.id)
     db.commit()
-    db.refresh(workout)
 
-    return workout
+    return response
 
 
 @router.get("", response_model=List[WorkoutListResponse])
@@ -328,7 +350,7 @@ def get_workouts(
 def get_weekly_stats(
     end_date: date = Query(..., description="End date for 7-day window"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get 7-day workout statistics: count, volume, avg sets, avg duration."""
     start_date_val = end_date - timedelta(days=6)
@@ -453,81 +475,61 @@ def get_recent_prs(
     db: Session = Depends(get_db)
 ):
     """Get personal records achieved in the last 30 days."""
-    today = date.today()
-    thirty_days_ago = today - timedelta(days=30)
-
-    # Subquery: completed workout IDs for this user
-    all_completed = db.query(Workout.id).filter(
-        Workout.user_id == current_user.id,
-        Workout.deleted_at.is_(None),
-        Workout.completed_at.isnot(None),
-    ).subquery()
-
-    recent_completed = db.query(Workout.id).filter(
-        Workout.user_id == current_user.id,
-        Workout.deleted_at.is_(None),
-        Workout.completed_at.isnot(None),
-        Workout.workout_date >= thirty_days_ago,
-    ).subquery()
-
-    older_completed = db.query(Workout.id).filter(
-        Workout.user_id == current_user.id,
-        Workout.deleted_at.is_(None),
-        Workout.completed_at.isnot(None),
-        Workout.workout_date < thirty_days_ago,
-    ).subquery()
-
-    # For each exercise, get the max weight in last 30 days
-    recent_maxes = db.query(
-        Set.exercise_name_snapshot,
-        func.max(Set.weight).label('max_weight'),
-    ).filter(
-        Set.workout_id.in_(recent_completed),
-        Set.is_completed == True,
-        Set.weight.isnot(None),
-    ).group_by(Set.exercise_name_snapshot).all()
+    thirty_days_ago = date.today() - timedelta(days=30)
+
+    records = db.query(PersonalRecord).filter(
+        PersonalRecord.user_id == current_user.id,
+        PersonalRecord.achieved_date >= thirty_days_ago,
+    ).order_by(PersonalRecord.achieved_date.desc()).limit(5).all()
+
+    return [
+        RecentPRResponse(
+            exercise_name=record.exercise_name_snapshot,
+            weight=record.best_weight,
+            date_achieved=record.achieved_date,
+            previous_best=record.previous_best,
+        )
+        for record in records
+    ]
 
-    prs = []
-    for ex_name, recent_max in recent_maxes:
-        if recent_max is None:
-            continue
 
-        # Get all-time max prior to 30 days ago
-        older_max = db.query(func.max(Set.weight)).filter(
-            Set.workout_id.in_(older_completed),
-            Set.exercise_name_snapshot == ex_name,
-            Set.is_completed == True,
-            Set.weight.isnot(None),
-        ).scalar()
+@router.get("/analytics/exercises/{exercise_id}", response_model=ExerciseProgressionResponse)
+def get_exercise_progression(
+    exercise_id: UUID,
+    weeks: int = Query(52, ge=1, le=520, description="How many weeks of history to return"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get an exercise's weekly progression: top weight, estimated 1RM
+    (Epley and Brzycki), sets, reps and tonnage.
 
-        # It's a PR if recent max >= older max (or no older data exists meaning first time)
-        is_pr = older_max is None or recent_max >= older_max
-        if not is_pr:
-            continue
+    Served from the weekly rollup, which is kept current as sets change.
+    """
+    exercise = db.query(Exercise).filter(
+        Exercise.id == exercise_id,
+        or_(
+            Exercise.is_custom == False,
+            Exercise.user_id == current_user.id
+        )
+    ).first()
 
-        # Find the date the PR was achieved
-        pr_workout = db.query(Workout.workout_date).join(Set).filter(
-            Workout.id.in_(db.query(Workout.id).filter(
-                Workout.user_id == current_user.id,
-                Workout.deleted_at.is_(None),
-                Workout.completed_at.isnot(None),
-                Workout.workout_date >= thirty_days_ago,
-            )),
-            Set.exercise_name_snapshot == ex_name,
-            Set.weight == recent_max,
-            Set.is_completed == True,
-        ).order_by(Workout.workout_date.desc()).first()
+    if not exercise:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exercise not found"
+        )
 
-        prs.append(RecentPRResponse(
-            exercise_name=ex_name,
-            weight=recent_max,
-            date_achieved=pr_workout[0] if pr_workout else today,
-            previous_best=older_max,
-        ))
+    since = date.today() - timedelta(weeks=weeks - 1)
+    stats = exercise_progression.get_progression(db, current_user.id, exercise_id, since)
+    estimates = [stat.e1rm_epley for stat in stats if stat.e1rm_epley is not None]
 
-    # Sort by date descending and limit to 5
-    prs.sort(key=lambda x: x.date_achieved, reverse=True)
-    return prs[:5]
+    return ExerciseProgressionResponse(
+        exercise_id=exercise.id,
+        exercise_name=exercise.name,
+        best_e1rm=max(estimates) if estimates else None,
+        weeks=[ExerciseWeekStats.model_validate(stat) for stat in stats],
+    )
 
 
 @router.get("/{workout_id}", response_model=WorkoutResponse)
@@ -574,8 +576,17 @@ def complete_workout(
             detail="Workout not found"
         )
 
+    if workout.completed_at is None:
+        platform_metrics.increment(db, platform_metrics.WORKOUTS_COMPLETED)
+        platform_metrics.increment_if_first(
+            db, platform_metrics.USERS_WITH_COMPLETED_WORKOUTS,
+            Workout.user_id == current_user.id,
+            Workout.completed_at.isnot(None),
+            Workout.deleted_at.is_(None),
+        )
     workout.completed_at = complete_data.completed_at
     workout.updated_at = datetime.now(timezone.utc)
+    last_performance.record_workout(db, current_user.id, workout)
 
     db.commit()
     db.refresh(workout)
@@ -635,6 +646,17 @@ def swap_exercise(
         set_obj.exercise_id = swap_data.new_exercise_id
         set_obj.exercise_name_snapshot = new_exercise.name
 
+    # Both exercises' records may have moved with the swapped sets
+    personal_records.recompute_personal_records(
+        db, current_user.id, [swap_data.old_exercise_id, swap_data.new_exercise_id]
+    )
+    exercise_progression.refresh_weeks(
+        db, current_user.id,
+        exercise_progression.weeks_for(workout, [swap_data.old_exercise_id, swap_data.new_exercise_id]),
+    )
+    if workout.completed_at is not None:
+        last_performance.refresh(db, current_user.id, [swap_data.old_exercise_id, swap_data.new_exercise_id])
+
     workout.updated_at = datetime.now(timezone.utc)
     db.commit()
 
@@ -665,7 +687,12 @@ def delete_workout(
             detail="Workout not found"
         )
 
+    if workout.completed_at is not None:
+        platform_metrics.increment(db, platform_metrics.WORKOUTS_COMPLETED, -1)
     workout.deleted_at = datetime.now(timezone.utc)
+    personal_records.forget_workout(db, current_user.id, workout.id)
+    exercise_progression.forget_workout(db, current_user.id, workout)
+    last_performance.forget_workout(db, current_user.id, workout)
     db.commit()
     return None
 
@@ -698,6 +725,11 @@ def save_workout_as_template(
         workout_type=workout.workout_type,
         user_id=current_user.id
     )
+    platform_metrics.increment_if_first(
+        db, platform_metrics.USERS_WITH_TEMPLATES,
+        WorkoutTemplate.user_id == current_user.id,
+        WorkoutTemplate.deleted_at.is_(None),
+    )
     db.add(template)
     db.flush()
 
@@ -731,6 +763,72 @@ def save_workout_as_template(
     return template
 
 
+def _previous_performance_response(exercise_id: UUID, found) -> PreviousPerformanceResponse:
+    if found is None:
+        return PreviousPerformanceResponse(
+            exercise_id=exercise_id,
+            has_previous=False,
+            previous_workout_date=None,
+            previous_sets=[]
+        )
+
+    previous_date, previous_sets = found
+    return PreviousPerformanceResponse(
+        exercise_id=exercise_id,
+        has_previous=True,
+        previous_workout_date=previous_date,
+        previous_sets=[
+            PreviousSetData(
+                set_number=s.set_number,
+                weight=s.weight,
+                reps=s.reps,
+                rpe=s.rpe
+            )
+            for s in previous_sets
+        ],
+        previous_total_reps=sum(s.reps or 0 for s in previous_sets)
+    )
+
+
+@router.get("/{workout_id}/previous-performance", response_model=List[PreviousPerformanceResponse])
+def get_workout_previous_performance(
+    workout_id: UUID,
+    exercise_ids: Optional[List[UUID]] = Query(None, alias="exercise_id"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get previous performance for every exercise in a workout.
+
+    Covers each exercise with sets in the workout, plus any passed as
+    ``exercise_id`` query parameters (e.g. tally exercises with no sets
+    yet). Each entry holds the sets from the most recent completed
+    workout before this one that logged the exercise.
+    """
+    # Verify current workout belongs to user
+    current_workout = db.query(Workout).filter(
+        Workout.id == workout_id,
+        Workout.user_id == current_user.id,
+        Workout.deleted_at.is_(None)
+    ).first()
+
+    if not current_workout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workout not found"
+        )
+
+    wanted = [
+        exercise_id for (exercise_id,) in db.query(Set.exercise_id).filter(
+            Set.workout_id == workout_id
+        ).distinct().all()
+    ]
+    wanted += [exercise_id for exercise_id in exercise_ids or [] if exercise_id not in wanted]
+
+    found = last_performance.previous_performances(db, current_user.id, current_workout, wanted)
+    return [_previous_performance_response(exercise_id, found.get(exercise_id)) for exercise_id in wanted]
+
+
 @router.get("/{workout_id}/exercises/{exercise_id}/previous", response_model=PreviousPerformanceResponse)
 def get_previous_performance(
     workout_id: UUID,
@@ -757,52 +855,8 @@ def get_previous_performance(
             detail="Workout not found"
         )
 
-    # Find the most recent completed workout with this exercise (before current workout)
-    previous_workout = db.query(Workout).join(
-        Set, Set.workout_id == Workout.id
-    ).filter(
-        Workout.user_id == current_user.id,
-        Workout.deleted_at.is_(None),
-        Workout.completed_at.isnot(None),  # Only completed workouts
-        Workout.workout_date < current_workout.workout_date,
-        Set.exercise_id == exercise_id
-    ).order_by(Workout.workout_date.desc()).first()
-
-    if not previous_workout:
-        # No previous performance found
-        return PreviousPerformanceResponse(
-            exercise_id=exercise_id,
-            has_previous=False,
-            previous_workout_date=None,
-            previous_sets=[]
-        )
-
-    # Get sets from previous workout for this exercise (limit to 10)
-    previous_sets = db.query(Set).filter(
-        Set.workout_id == previous_workout.id,
-        Set.exercise_id == exercise_id
-    ).order_by(Set.set_number).limit(10).all()
-
-    # Convert to response format
-    set_data = [
-        PreviousSetData(
-            set_number=s.set_number,
-            weight=s.weight,
-            reps=s.reps,
-            rpe=s.rpe
-        )
-        for s in previous_sets
-    ]
-
-    total_reps = sum(s.reps or 0 for s in previous_sets)
-
-    return PreviousPerformanceResponse(
-        exercise_id=exercise_id,
-        has_previous=True,
-        previous_workout_date=previous_workout.workout_date,
-        previous_sets=set_data,
-        previous_total_reps=total_reps
-    )
+    found = last_performance.previous_performances(db, current_user.id, current_workout, [exercise_id])
+    return _previous_performance_response(exercise_id, found.get(exercise_id))
 
 
 # ===== SETS =====
@@ -847,6 +901,16 @@ def add_set(
         exercise_name_snapshot=exercise.name  # Snapshot exercise name
     )
     db.add(set_obj)
+    db.flush()
+
+    # Keep the personal record index and progression rollup current
+    personal_records.sync_set(db, current_user.id, workout, set_obj)
+    if set_obj.is_completed:
+        exercise_progression.refresh_weeks(
+            db, current_user.id, exercise_progression.weeks_for(workout, [set_obj.exercise_id])
+        )
+    if workout.completed_at is not None:
+        last_performance.refresh(db, current_user.id, [set_obj.exercise_id])
 
     # Update workout timestamp
     workout.updated_at = datetime.now(timezone.utc)
@@ -893,6 +957,7 @@ def update_set(
 
     # Update fields
     update_data = set_data.model_dump(exclude_unset=True)
+    was_completed = bool(set_obj.is_completed)
     for field, value in update_data.items():
         setattr(set_obj, field, value)
 
@@ -901,6 +966,16 @@ def update_set(
         set_obj.completed_at = datetime.now(timezone.utc)
     elif 'is_completed' in update_data and not update_data['is_completed']:
         set_obj.completed_at = None
+    platform_metrics.increment(
+        db, platform_metrics.SETS_COMPLETED, int(bool(set_obj.is_completed)) - int(was_completed)
+    )
+
+    # Keep the personal record index and progression rollup current
+    personal_records.sync_set(db, current_user.id, workout, set_obj)
+    if was_completed or set_obj.is_completed:
+        exercise_progression.refresh_weeks(
+            db, current_user.id, exercise_progression.weeks_for(workout, [set_obj.exercise_id])
+        )
 
     # Update workout timestamp
     workout.updated_at = datetime.now(timezone.utc)
@@ -945,9 +1020,148 @@ def delete_set(
         )
 
     db.delete(set_obj)
+    if set_obj.is_completed:
+        platform_metrics.increment(db, platform_metrics.SETS_COMPLETED, -1)
+
+    # Recompute the record if this set was holding it
+    record = db.query(PersonalRecord).filter(
+        PersonalRecord.user_id == current_user.id,
+        PersonalRecord.exercise_id == set_obj.exercise_id,
+        PersonalRecord.set_id == set_obj.id,
+    ).first()
+    if record:
+        personal_records.recompute_personal_record(db, current_user.id, set_obj.exercise_id)
+    if set_obj.is_completed:
+        exercise_progression.refresh_weeks(
+            db, current_user.id, exercise_progression.weeks_for(workout, [set_obj.exercise_id])
+        )
+    if workout.completed_at is not None:
+        last_performance.refresh(db, current_user.id, [set_obj.exercise_id])
 
     # Update workout timestamp
     workout.updated_at = datetime.now(timezone.utc)
 
     db.commit()
     return None
+
+
+@router.post("/{workout_id}/sets/batch", response_model=WorkoutResponse)
+def batch_sets(
+    workout_id: UUID,
+    batch: SetBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply set creates, updates and deletes to a workout in one transaction.
+
+    Deletes run first, then updates, then creates. Any unknown set or
+    inaccessible exercise rejects the whole batch. Returns the workout
+    with its sets.
+    """
+    # Verify workout exists and belongs to user
+    workout = db.query(Workout).filter(
+        Workout.id == workout_id,
+        Workout.user_id == current_user.id,
+        Workout.deleted_at.is_(None)
+    ).first()
+
+    if not workout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workout not found"
+        )
+
+    # Validate every referenced exercise with one query (system or user's own)
+    exercise_ids = {set_data.exercise_id for set_data in batch.create}
+    exercises = {}
+    if exercise_ids:
+        exercises = {
+            exercise.id: exercise for exercise in db.query(Exercise).filter(
+                Exercise.id.in_(exercise_ids),
+                Exercise.deleted_at.is_(None),
+                or_(
+                    Exercise.is_custom == False,
+                    Exercise.user_id == current_user.id
+                )
+            ).all()
+        }
+    missing_exercises = exercise_ids - exercises.keys()
+    if missing_exercises:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise {sorted(map(str, missing_exercises))[0]} not found"
+        )
+
+    # Load every targeted set with one query
+    set_ids = {update.id for update in batch.update} | set(batch.delete)
+    existing_sets = {}
+    if set_ids:
+        existing_sets = {
+            set_obj.id: set_obj for set_obj in db.query(Set).filter(
+                Set.id.in_(set_ids),
+                Set.workout_id == workout_id
+            ).all()
+        }
+    missing_sets = set_ids - existing_sets.keys()
+    if missing_sets:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Set {sorted(map(str, missing_sets))[0]} not found"
+        )
+
+    # Every exercise touched by the batch gets its record recomputed once
+    affected_exercises = set(exercise_ids)
+    now = datetime.now(timezone.utc)
+    completed_delta = 0
+
+    deleted = set(batch.delete)
+    for set_id in deleted:
+        set_obj = existing_sets[set_id]
+        affected_exercises.add(set_obj.exercise_id)
+        completed_delta -= int(bool(set_obj.is_completed))
+        db.delete(set_obj)
+
+    for update in batch.update:
+        if update.id in deleted:
+            continue
+        set_obj = existing_sets[update.id]
+        update_data = update.model_dump(exclude_unset=True, exclude={"id"})
+        completed_delta -= int(bool(set_obj.is_completed))
+        for field, value in update_data.items():
+            setattr(set_obj, field, value)
+
+        # If marking as completed, set timestamp
+        if 'is_completed' in update_data and update_data['is_completed']:
+            set_obj.completed_at = now
+        elif 'is_completed' in update_data and not update_data['is_completed']:
+            set_obj.completed_at = None
+        completed_delta += int(bool(set_obj.is_completed))
+        affected_exercises.add(set_obj.exercise_id)
+
+    for set_data in batch.create:
+        db.add(Set(
+            workout_id=workout_id,
+            **set_data.model_dump(),
+            exercise_name_snapshot=exercises[set_data.exercise_id].name
+        ))
+
+    platform_metrics.increment(db, platform_metrics.SETS_COMPLETED, completed_delta)
+
+    # Keep the personal record index and progression rollup current
+    personal_records.recompute_personal_records(db, current_user.id, affected_exercises)
+    exercise_progression.refresh_weeks(
+        db, current_user.id, exercise_progression.weeks_for(workout, affected_exercises)
+    )
+    if workout.completed_at is not None:
+        last_performance.refresh(db, current_user.id, affected_exercises)
+
+    workout.updated_at = now
+    db.commit()
+
+    # Reload workout with sets
+    workout = db.query(Workout).options(
+        joinedload(Workout.sets)
+    ).filter(Workout.id == workout_id).first()
+
+    return workout
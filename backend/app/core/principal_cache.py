@@ -0,0 +1,129 @@
+"""In-process cache of authenticated principals.
+
+Resolving a token's ``sub`` to a user used to cost a SELECT on every
+request. The cache keeps a small, detached ``Principal`` per user id with
+an LRU bound and a TTL. Entries are dropped as soon as a session commits a
+change to a user's password, admin flag or email, or deletes the user; the
+TTL bounds staleness for changes made from other processes (e.g.
+``scripts/set_admin.py``).
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The fields of an authenticated user that routes actually use."""
+    id: UUID
+    email: str
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, is_admin=user.is_admin)
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of user id to Principal."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id: str, principal: Principal) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# Changes to these columns must never be served from a stale principal
+_SECURITY_ATTRIBUTES = ("hashed_password", "is_admin", "email")
+_PENDING_KEY = "principal_cache_invalidations"
+
+
+def _mark_stale(session: Session, user: User) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).add(str(user.id))
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _SECURITY_ATTRIBUTES):
+        _mark_stale(state.session, target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _mark_stale(inspect(target).session, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session):
+    # Invalidate only once the change is visible to other sessions
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
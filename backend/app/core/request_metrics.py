@@ -0,0 +1,248 @@
+"""Per-request latency and database instrumentation.
+
+``RequestMetricsMiddleware`` opens a ``RequestStats`` for every HTTP
+request; cursor events on the engines (``instrument_engine``, hooked up in
+``app/database.py``) add each statement's time and row count to whichever
+request issued it, and ``timed_pool`` pools add the time spent waiting for
+a connection. When the response starts, the middleware adds a
+``Server-Timing`` header; when it ends, the totals are recorded in
+histograms labelled by method, route template and status, rendered in the
+Prometheus text format at ``/metrics`` along with each pool's occupancy.
+Statements slower than SLOW_QUERY_MS are logged with the route that issued
+them.
+
+Histograms are per process, so /metrics is only served in single mode;
+under SERVER_MODE=multi a scrape would land on an arbitrary worker and the
+counters would jump between scrapes.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from ..config import settings
+
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+LABELS = ("method", "route", "status")
+
+
+class Histogram:
+    """Thread-safe cumulative histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], labels: Sequence[str] = LABELS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            # One counter per bucket, then +Inf, sum
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.labels, labels))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{_format(bound)}"}} {_format(count)}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {_format(series[-2])}')
+            lines.append(f"{self.name}_count{{{label_text}}} {_format(series[-2])}")
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format(series[-1])}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request latency.", LATENCY_BUCKETS)
+DB_QUERIES = Histogram("http_request_db_queries", "Database statements per request.", QUERY_BUCKETS)
+DB_SECONDS = Histogram("http_request_db_seconds", "Database time per request.", LATENCY_BUCKETS)
+DB_ROWS = Histogram("http_request_db_rows", "Rows returned or affected per request.", ROW_BUCKETS)
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", WAIT_BUCKETS, labels=("pool",)
+)
+
+HISTOGRAMS = (REQUEST_SECONDS, DB_QUERIES, DB_SECONDS, DB_ROWS, POOL_WAIT_SECONDS)
+
+# Pool name -> engine, read at render time (dispose() swaps in a new pool)
+_pooled_engines: Dict[str, object] = {}
+
+POOL_GAUGES = (
+    ("db_pool_size", "Configured pool size.", "size"),
+    ("db_pool_checked_out", "Connections currently checked out.", "checkedout"),
+    ("db_pool_overflow", "Connections open beyond the pool size (negative while the pool is filling).", "overflow"),
+)
+
+
+def _render_pool_gauges() -> List[str]:
+    lines = []
+    for name, help_text, method in POOL_GAUGES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for pool_name, engine in sorted(_pooled_engines.items()):
+            read = getattr(engine.pool, method, None)
+            if read is not None:
+                lines.append(f'{name}{{pool="{_escape(pool_name)}"}} {_format(read())}')
+    return lines
+
+
+def render_metrics() -> str:
+    """All histograms and pool gauges in the Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(_render_pool_gauges())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Totals for one request; shared by reference with the threads and greenlets it spawns."""
+
+    __slots__ = ("scope", "started", "queries", "db_seconds", "rows", "pool_seconds")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.pool_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the scope once routing is done
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def record_query(self, seconds: float, rows: int) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if rows > 0:
+            self.rows += rows
+
+    def server_timing(self) -> bytes:
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'app;dur={elapsed_ms:.1f}, '
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows} rows", '
+            f'pool;dur={self.pool_seconds * 1000:.1f}'
+        ).encode("latin-1")
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+# ===== ENGINE HOOKS =====
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record_query(elapsed, getattr(cursor, "rowcount", -1) or 0)
+
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        origin = f"{stats.scope.get('method')} {stats.route}" if stats is not None else "background"
+        slow_query_logger.warning(f"Slow query ({elapsed * 1000:.0f} ms) from {origin}: {statement}")
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on a sync Engine (for async engines pass ``.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def timed_pool(base: type, name: str) -> type:
+    """
+    Subclass of pool class ``base`` that records checkout waits as pool ``name``.
+
+    The wait covers blocking on a full pool and opening a new connection.
+    Pass the result as ``poolclass`` and register the engine with
+    ``register_pool`` so /metrics reports its occupancy.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        finally:
+            waited = time.perf_counter() - started
+            POOL_WAIT_SECONDS.observe((name,), waited)
+            stats = _current.get()
+            if stats is not None:
+                stats.pool_seconds += waited
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def register_pool(name: str, engine) -> None:
+    """Report a sync Engine's pool (for async engines pass ``.sync_engine``) at /metrics."""
+    _pooled_engines[name] = engine
+
+
+# ===== MIDDLEWARE =====
+
+class RequestMetricsMiddleware:
+    """ASGI middleware that measures each HTTP request (works with streaming responses)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status_code = "500"
+
+        async def send_with_metrics(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = str(message["status"])
+                message["headers"] = [*message.get("headers", []), (b"server-timing", stats.server_timing())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.reset(token)
+            labels = (scope["method"], stats.route, status_code)
+            REQUEST_SECONDS.observe(labels, time.perf_counter() - stats.started)
+            DB_QUERIES.observe(labels, stats.queries)
+            DB_SECONDS.observe(labels, stats.db_seconds)
+            DB_ROWS.observe(labels, stats.rows)
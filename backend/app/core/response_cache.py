@@ -0,0 +1,130 @@
+"""In-memory async response cache for upstream API calls.
+
+An LRU map with a per-entry TTL, plus two behaviours that matter for slow
+upstreams:
+
+- stale-while-revalidate: past its TTL, an entry is still served for
+  ``stale_seconds`` while one background task refreshes it;
+- request coalescing: concurrent misses for the same key share one
+  in-flight fetch instead of each calling upstream.
+
+The cache lives on one event loop, so no locking is needed.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResponseCache:
+    """TTL + LRU cache with stale-while-revalidate and request coalescing."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float, stale_seconds: float = 0):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_failures = 0
+
+    def get(self, key: Hashable) -> tuple:
+        """Return (value, state) where state is 'fresh', 'stale' or 'miss'."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, "miss"
+        value, fresh_until, stale_until = entry
+        now = time.monotonic()
+        if now >= stale_until:
+            del self._entries[key]
+            return None, "miss"
+        self._entries.move_to_end(key)
+        return value, "fresh" if now < fresh_until else "stale"
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.monotonic()
+        self._entries[key] = (value, now + ttl, now + ttl + self.stale_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl_for: Optional[Callable[[Any], Optional[float]]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, fetching it on a miss.
+
+        ``ttl_for`` may pick a TTL from the fetched value (e.g. a shorter one
+        for negative results). Fetch errors propagate to every waiter and
+        nothing is cached.
+        """
+        value, state = self.get(key)
+        if state == "fresh":
+            self.hits += 1
+            return value
+        if state == "stale":
+            self.stale_hits += 1
+            if key not in self._inflight:
+                task = self._start(key, fetch, ttl_for)
+                task.add_done_callback(self._log_refresh_failure)
+            return value
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, fetch, ttl_for)
+        else:
+            self.coalesced += 1
+        # Shield so a cancelled caller does not cancel the fetch other callers wait on
+        return await asyncio.shield(task)
+
+    def _start(self, key, fetch, ttl_for) -> asyncio.Task:
+        async def run():
+            try:
+                value = await fetch()
+                self.put(key, value, ttl_for(value) if ttl_for else None)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return task
+
+    def _log_refresh_failure(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self.refresh_failures += 1
+        logger.warning(f"{self.name} cache refresh failed: {type(task.exception()).__name__}: {task.exception()}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "refresh_failures": self.refresh_failures,
+        }
@@ -1,19 +1,84 @@
 """Database configuration and session management."""
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .core.request_metrics import instrument_engine, register_pool, timed_pool
+
+
+def _engine_options(pool_class: type, name: str) -> dict:
+    """Pool settings shared by every engine; pools report checkout waits when metrics are on."""
+    return dict(
+        poolclass=timed_pool(pool_class, name) if settings.METRICS_ENABLED else pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Verify connections before using
+        echo=settings.DEBUG,  # Log SQL queries in debug mode
+    )
+
+
+def _async_url(url: str, override: Optional[str]):
+    """Async URL: the override if set, else the sync URL with the asyncpg driver."""
+    return override or make_url(url).set(drivername="postgresql+asyncpg")
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(QueuePool, "primary"))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for routes that must not block the event loop.
+# Shares DATABASE_URL, swapping in the asyncpg driver unless ASYNC_DATABASE_URL is set.
+async_engine = create_async_engine(
+    _async_url(settings.DATABASE_URL, settings.ASYNC_DATABASE_URL),
+    **_engine_options(AsyncAdaptedQueuePool, "primary_async"),
+)
+
+# Async session factory (expire_on_commit=False so responses can read attributes after commit)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica for read-only analytics. Without READ_REPLICA_URL the read
+# factories share the primary engines, so callers never need to check.
+# Replica reads may lag the primary: don't use them to read back a write.
+if settings.READ_REPLICA_URL:
+    read_engine = create_engine(settings.READ_REPLICA_URL, **_engine_options(QueuePool, "replica"))
+    async_read_engine = create_async_engine(
+        _async_url(settings.READ_REPLICA_URL, settings.ASYNC_READ_REPLICA_URL),
+        **_engine_options(AsyncAdaptedQueuePool, "replica_async"),
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Per-request query counts, DB time, pool waits and slow-query logging
+if settings.METRICS_ENABLED:
+    pooled = {"primary": engine, "primary_async": async_engine.sync_engine}
+    if settings.READ_REPLICA_URL:
+        pooled.update(replica=read_engine, replica_async=async_read_engine.sync_engine)
+    for name, sync_engine in pooled.items():
+        instrument_engine(sync_engine)
+        register_pool(name, sync_engine)
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -28,3 +93,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency function for read-only routes: a session on the read replica
+    (or the primary when none is configured). Never write through it.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function for FastAPI to get an async database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Async counterpart of get_read_db."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,15 +1,60 @@
 """FastAPI application entry point."""
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .config import settings
-from .api.v1 import auth, exercises, workouts, nutrition, settings as settings_router, openfoodfacts, coaching, measurements, supplements, admin
+from .api.v1 import auth, exercises, workouts, nutrition, settings as settings_router, openfoodfacts, coaching, measurements, supplements, admin, sync
+from .core.request_metrics import RequestMetricsMiddleware, render_metrics
 from .database import SessionLocal
-from scripts.seed_exercises import seed_exercises
+from .services import llm, seeding
+
+
+@contextmanager
+def _startup_step(timings: dict, name: str):
+    """Record how long a startup step takes (reported by scripts/profile_startup.py)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run on application startup and shutdown."""
+    timings = app.state.startup_timings = {}
+    if settings.SEED_ON_STARTUP:
+        with _startup_step(timings, "seed_reference_data"):
+            db = SessionLocal()
+            try:
+                seeding.seed_all(db)
+            except Exception as e:
+                print(f"Error during startup: {e}")
+            finally:
+                db.close()
+
+    # App-lifetime AI coach client (the Gemini SDK itself loads on the first call)
+    with _startup_step(timings, "llm_client"):
+        llm.start_client()
+    try:
+        yield
+    finally:
+        llm.stop_client()
+        # The Open Food Facts client opens on first use, with its module
+        open_food_facts = sys.modules.get(f"{__package__}.services.open_food_facts")
+        if open_food_facts is not None:
+            await open_food_facts.close_client()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -21,6 +66,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it wraps CORS too and times the whole request
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(exercises.router, prefix="/api/v1/exercises", tags=["Exercises"])
@@ -32,6 +81,7 @@ app.include_router(coaching.router, prefix="/api/v1", tags=["AI Coaching"])
 app.include_router(measurements.router, prefix="/api/v1", tags=["Body Measurements"])
 app.include_router(supplements.router, prefix="/api/v1", tags=["Supplements"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["Sync"])
 
 
 @app.get("/")
@@ -46,13 +96,10 @@ def health_check():
     return {"status": "healthy"}
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    db = SessionLocal()
-    try:
-        seed_exercises(db)
-    except Exception as e:
-        print(f"Error during startup: {e}")
-    finally:
-        db.close()
+# Histograms are per process, so multi mode would answer each scrape from
+# whichever worker took it; only Server-Timing and the slow-query log remain there.
+if settings.METRICS_ENABLED and settings.SERVER_MODE != "multi":
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Request latency and database histograms in Prometheus text format."""
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,78 @@
+"""Add personal_records table for the per-exercise PR index.
+
+Revision ID: 20261016_0001
+Revises: 20260307_0001
+Create Date: 2026-10-16
+
+Records are populated from existing workout history during the upgrade,
+with the same rules as ``personal_records._fold_history``.
+``python scripts/backfill_personal_records.py`` rebuilds them afterwards.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0001'
+down_revision = '20260307_0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'personal_records',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('exercise_id', UUID(as_uuid=True), sa.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('exercise_name_snapshot', sa.String(255), nullable=False),
+        sa.Column('best_weight', sa.Float(), nullable=False),
+        sa.Column('previous_best', sa.Float(), nullable=True),
+        sa.Column('achieved_date', sa.Date(), nullable=False),
+        sa.Column('workout_id', UUID(as_uuid=True), sa.ForeignKey('workouts.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('set_id', UUID(as_uuid=True), sa.ForeignKey('sets.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('user_id', 'exercise_id', name='uq_personal_records_user_exercise'),
+    )
+    op.create_index('ix_personal_records_user_achieved', 'personal_records', ['user_id', 'achieved_date'])
+
+    # The record is the latest set at the best weight; previous_best is the best
+    # before that weight was first reached
+    op.execute("""
+        WITH history AS (
+            SELECT
+                w.user_id, s.exercise_id, s.exercise_name_snapshot, s.weight,
+                s.id AS set_id, w.id AS workout_id, w.workout_date,
+                row_number() OVER chronological AS seq,
+                max(s.weight) OVER (PARTITION BY w.user_id, s.exercise_id) AS best_weight,
+                max(s.weight) OVER (chronological ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS prior_best
+            FROM sets s
+            JOIN workouts w ON w.id = s.workout_id
+            WHERE w.deleted_at IS NULL AND s.is_completed AND s.weight IS NOT NULL
+            WINDOW chronological AS (PARTITION BY w.user_id, s.exercise_id ORDER BY w.workout_date, s.completed_at)
+        ),
+        first_best AS (
+            SELECT DISTINCT ON (user_id, exercise_id) user_id, exercise_id, prior_best
+            FROM history WHERE weight = best_weight
+            ORDER BY user_id, exercise_id, seq
+        ),
+        last_best AS (
+            SELECT DISTINCT ON (user_id, exercise_id) *
+            FROM history WHERE weight = best_weight
+            ORDER BY user_id, exercise_id, seq DESC
+        )
+        INSERT INTO personal_records
+            (id, user_id, exercise_id, exercise_name_snapshot, best_weight, previous_best,
+             achieved_date, workout_id, set_id, updated_at)
+        SELECT
+            gen_random_uuid(), l.user_id, l.exercise_id, l.exercise_name_snapshot, l.best_weight, f.prior_best,
+            l.workout_date, l.workout_id, l.set_id, now()
+        FROM last_best l
+        JOIN first_best f ON f.user_id = l.user_id AND f.exercise_id = l.exercise_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_personal_records_user_achieved', table_name='personal_records')
+    op.drop_table('personal_records')
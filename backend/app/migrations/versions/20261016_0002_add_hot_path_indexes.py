@@ -0,0 +1,56 @@
+"""Add composite and partial indexes for hot query paths.
+
+Revision ID: 20261016_0002
+Revises: 20261016_0001
+Create Date: 2026-10-16
+
+Indexes are built CONCURRENTLY so the upgrade does not block writes on
+the sets and meal_items tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '20261016_0002'
+down_revision = '20261016_0001'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    # Per-workout set loads, previous performance, set lookups by (workout, exercise)
+    ('ix_sets_workout_exercise', 'sets', ['workout_id', 'exercise_id'], None),
+    # PR, coaching and progression scans over completed sets of one exercise
+    ('ix_sets_exercise_workout_completed', 'sets', ['exercise_id', 'workout_id'], 'is_completed'),
+    # Meal detail loads and summary joins
+    ('ix_meal_items_meal_id', 'meal_items', ['meal_id'], None),
+    # Template detail loads ordered by position
+    ('ix_template_exercises_template_order', 'template_exercises', ['template_id', 'order_index'], None),
+    # Daily/weekly nutrition lookups
+    ('ix_meals_user_date_active', 'meals', ['user_id', 'meal_date'], 'deleted_at IS NULL'),
+    # Workout history and date-range stats
+    ('ix_workouts_user_date_active', 'workouts', ['user_id', 'workout_date'], 'deleted_at IS NULL'),
+    ('ix_workouts_user_date_completed', 'workouts', ['user_id', 'workout_date'],
+     'deleted_at IS NULL AND completed_at IS NOT NULL'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
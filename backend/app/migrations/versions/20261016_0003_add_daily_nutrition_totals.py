@@ -0,0 +1,58 @@
+"""Add daily_nutrition_totals rollup table.
+
+Revision ID: 20261016_0003
+Revises: 20261016_0002
+Create Date: 2026-10-16
+
+The table is populated from existing meals during the upgrade.
+``python scripts/rebuild_nutrition_totals.py --verify`` reconciles it
+against raw rows afterwards.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0003'
+down_revision = '20261016_0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_nutrition_totals',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('total_date', sa.Date(), nullable=False),
+        sa.Column('calories', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('protein', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('carbs', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('fat', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('meal_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('user_id', 'total_date', name='uq_daily_nutrition_totals_user_date'),
+    )
+
+    op.execute("""
+        INSERT INTO daily_nutrition_totals
+            (id, user_id, total_date, calories, protein, carbs, fat, meal_count, item_count)
+        SELECT
+            gen_random_uuid(), m.user_id, m.meal_date,
+            COALESCE(SUM(mi.calories_snapshot * mi.servings), 0),
+            COALESCE(SUM(mi.protein_snapshot * mi.servings), 0),
+            COALESCE(SUM(mi.carbs_snapshot * mi.servings), 0),
+            COALESCE(SUM(mi.fat_snapshot * mi.servings), 0),
+            COUNT(DISTINCT m.id),
+            COUNT(mi.id)
+        FROM meals m
+        LEFT JOIN meal_items mi ON mi.meal_id = m.id
+        WHERE m.deleted_at IS NULL
+        GROUP BY m.user_id, m.meal_date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_nutrition_totals')
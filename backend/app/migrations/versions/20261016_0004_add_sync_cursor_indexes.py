@@ -0,0 +1,48 @@
+"""Add (user_id, updated_at, id) indexes for the delta sync feed.
+
+Revision ID: 20261016_0004
+Revises: 20261016_0003
+Create Date: 2026-10-16
+
+Each synced table is read in (updated_at, id) order from a cursor
+position per user. Indexes are built CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '20261016_0004'
+down_revision = '20261016_0003'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    ('ix_exercises_sync', 'exercises', ['updated_at', 'id'], None),
+    ('ix_foods_custom_user_sync', 'foods', ['user_id', 'updated_at', 'id'], 'is_custom'),
+    ('ix_meal_categories_user_sync', 'meal_categories', ['user_id', 'updated_at', 'id'], None),
+    ('ix_workout_templates_user_sync', 'workout_templates', ['user_id', 'updated_at', 'id'], None),
+    ('ix_workouts_user_sync', 'workouts', ['user_id', 'updated_at', 'id'], None),
+    ('ix_meals_user_sync', 'meals', ['user_id', 'updated_at', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+"""Add pg_trgm and prefix indexes for ranked food search.
+
+Revision ID: 20261016_0005
+Revises: 20261016_0004
+Create Date: 2026-10-16
+
+Enables the pg_trgm extension, then builds a trigram GIN index for
+substring/fuzzy matches and a lower(name) text_pattern_ops index for
+type-ahead prefixes, both CONCURRENTLY and limited to non-deleted foods.
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = '20261016_0005'
+down_revision = '20261016_0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_foods_name_trgm "
+            "ON foods USING gin (name gin_trgm_ops) WHERE deleted_at IS NULL"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_foods_name_prefix "
+            "ON foods (lower(name) text_pattern_ops) WHERE deleted_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_foods_name_prefix")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_foods_name_trgm")
@@ -0,0 +1,29 @@
+"""Add food_product_cache for Open Food Facts barcode lookups.
+
+Revision ID: 20261016_0006
+Revises: 20261016_0005
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers
+revision = '20261016_0006'
+down_revision = '20261016_0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'food_product_cache',
+        sa.Column('barcode', sa.String(64), primary_key=True),
+        sa.Column('product', JSONB(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('food_product_cache')
@@ -0,0 +1,80 @@
+"""Add platform_counters and user_activity_days for the admin dashboard.
+
+Revision ID: 20261016_0007
+Revises: 20261016_0006
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0007'
+down_revision = '20261016_0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'platform_counters',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('shard', sa.Integer(), primary_key=True, server_default='0'),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        'user_activity_days',
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('activity_date', sa.Date(), primary_key=True),
+    )
+    op.create_index('ix_user_activity_days_date', 'user_activity_days', ['activity_date'])
+
+    # Seed from existing data; scripts/compact_platform_metrics.py does the same on a schedule
+    op.execute("""
+        INSERT INTO platform_counters (name, shard, value)
+        SELECT 'users_total', 0, count(*) FROM users
+        UNION ALL
+        SELECT 'workouts_completed', 0, count(*) FROM workouts
+            WHERE completed_at IS NOT NULL AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'meals_logged', 0, count(*) FROM meals WHERE deleted_at IS NULL
+        UNION ALL
+        SELECT 'sets_completed', 0, count(*) FROM sets WHERE is_completed
+        UNION ALL
+        SELECT 'users_with_completed_workouts', 0, count(DISTINCT user_id) FROM workouts
+            WHERE completed_at IS NOT NULL AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'users_with_templates', 0, count(DISTINCT user_id) FROM workout_templates
+            WHERE deleted_at IS NULL
+        UNION ALL
+        SELECT 'users_with_custom_exercises', 0, count(DISTINCT user_id) FROM exercises
+            WHERE is_custom AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'users_with_meals', 0, count(DISTINCT user_id) FROM meals WHERE deleted_at IS NULL
+        UNION ALL
+        SELECT 'users_with_macro_targets', 0, count(*) FROM user_settings
+            WHERE macro_target_calories IS NOT NULL
+        UNION ALL
+        SELECT 'users_with_supplements', 0, count(DISTINCT user_id) FROM supplements
+        UNION ALL
+        SELECT 'users_with_measurements', 0, count(DISTINCT user_id) FROM body_measurements
+        UNION ALL
+        SELECT 'coach_type:' || coach_type, 0, count(*) FROM user_settings
+            WHERE coach_type IS NOT NULL AND coach_type <> '' GROUP BY coach_type
+    """)
+    op.execute("""
+        INSERT INTO user_activity_days (user_id, activity_date)
+        SELECT user_id, started_at::date FROM workouts
+            WHERE started_at >= current_date - 31 AND deleted_at IS NULL
+        UNION
+        SELECT user_id, created_at::date FROM meals
+            WHERE created_at >= current_date - 31 AND deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_activity_days_date', table_name='user_activity_days')
+    op.drop_table('user_activity_days')
+    op.drop_table('platform_counters')
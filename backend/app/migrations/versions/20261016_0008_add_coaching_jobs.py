@@ -0,0 +1,49 @@
+"""Add coaching_jobs queue and user_settings.timezone.
+
+Revision ID: 20261016_0008
+Revises: 20261016_0007
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0008'
+down_revision = '20261016_0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'user_settings',
+        sa.Column('timezone', sa.String(64), nullable=False, server_default='UTC'),
+    )
+
+    op.create_table(
+        'coaching_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('section', sa.String(30), nullable=False),
+        sa.Column('insight_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('user_id', 'insight_date', 'section', name='uq_coaching_jobs_user_date_section'),
+    )
+    op.create_index(
+        'ix_coaching_jobs_pending', 'coaching_jobs', ['run_after'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_coaching_jobs_pending', table_name='coaching_jobs')
+    op.drop_table('coaching_jobs')
+    op.drop_column('user_settings', 'timezone')
@@ -0,0 +1,64 @@
+"""Add exercise_weekly_stats progression rollup.
+
+Revision ID: 20261016_0009
+Revises: 20261016_0008
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0009'
+down_revision = '20261016_0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exercise_weekly_stats',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('exercise_id', UUID(as_uuid=True), sa.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('set_count', sa.Integer(), nullable=False),
+        sa.Column('total_reps', sa.Integer(), nullable=False),
+        sa.Column('tonnage', sa.Float(), nullable=False),
+        sa.Column('top_weight', sa.Float(), nullable=True),
+        sa.Column('e1rm_epley', sa.Float(), nullable=True),
+        sa.Column('e1rm_brzycki', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('user_id', 'exercise_id', 'week_start', name='uq_exercise_weekly_stats_user_exercise_week'),
+    )
+
+    # Seed from existing history; scripts/rebuild_exercise_progression.py does the same
+    op.execute("""
+        INSERT INTO exercise_weekly_stats (
+            id, user_id, exercise_id, week_start, set_count, total_reps, tonnage,
+            top_weight, e1rm_epley, e1rm_brzycki, updated_at
+        )
+        SELECT
+            gen_random_uuid(),
+            w.user_id,
+            s.exercise_id,
+            date_trunc('week', w.workout_date)::date,
+            count(s.id),
+            coalesce(sum(s.reps), 0),
+            coalesce(sum(s.weight * s.reps), 0),
+            max(s.weight),
+            max(CASE WHEN s.reps BETWEEN 1 AND 12 AND s.weight > 0 THEN
+                CASE WHEN s.reps = 1 THEN s.weight ELSE s.weight * (1 + s.reps / 30.0) END
+            END),
+            max(CASE WHEN s.reps BETWEEN 1 AND 12 AND s.weight > 0 THEN s.weight * 36.0 / (37 - s.reps) END),
+            now()
+        FROM sets s
+        JOIN workouts w ON w.id = s.workout_id
+        WHERE w.deleted_at IS NULL AND s.is_completed AND s.set_type <> 'warmup'
+        GROUP BY w.user_id, s.exercise_id, date_trunc('week', w.workout_date)::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('exercise_weekly_stats')
@@ -0,0 +1,47 @@
+"""Add last_exercise_performances cache.
+
+Revision ID: 20261016_0010
+Revises: 20261016_0009
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = '20261016_0010'
+down_revision = '20261016_0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'last_exercise_performances',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('exercise_id', UUID(as_uuid=True), sa.ForeignKey('exercises.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('workout_id', UUID(as_uuid=True), sa.ForeignKey('workouts.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('workout_date', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('user_id', 'exercise_id', name='uq_last_exercise_performances_user_exercise'),
+    )
+
+    # Seed with each user's latest completed workout per exercise
+    op.execute("""
+        INSERT INTO last_exercise_performances (id, user_id, exercise_id, workout_id, workout_date, updated_at)
+        SELECT gen_random_uuid(), user_id, exercise_id, workout_id, workout_date, now()
+        FROM (
+            SELECT DISTINCT ON (w.user_id, s.exercise_id)
+                w.user_id, s.exercise_id, w.id AS workout_id, w.workout_date
+            FROM sets s
+            JOIN workouts w ON w.id = s.workout_id
+            WHERE w.deleted_at IS NULL AND w.completed_at IS NOT NULL
+            ORDER BY w.user_id, s.exercise_id, w.workout_date DESC, w.completed_at DESC
+        ) latest
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('last_exercise_performances')
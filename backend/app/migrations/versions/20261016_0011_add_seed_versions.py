@@ -0,0 +1,50 @@
+"""Add seed_versions and natural-key indexes for system exercises and foods.
+
+Revision ID: 20261016_0011
+Revises: 20261016_0010
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '20261016_0011'
+down_revision = '20261016_0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seed_versions',
+        sa.Column('dataset', sa.String(100), primary_key=True),
+        sa.Column('checksum', sa.String(64), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+    for table in ('exercises', 'foods'):
+        # Older seeding could add a system row twice; keep the oldest and soft-delete the rest
+        # (still referenced by templates and meals, just hidden)
+        op.execute(f"""
+            UPDATE {table} SET deleted_at = now(), updated_at = now()
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (PARTITION BY name ORDER BY created_at, id) AS n
+                    FROM {table}
+                    WHERE NOT is_custom AND deleted_at IS NULL
+                ) ranked
+                WHERE n > 1
+            )
+        """)
+        op.create_index(
+            f'uq_{table}_system_name', table, ['name'], unique=True,
+            postgresql_where=sa.text('NOT is_custom AND deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_foods_system_name', table_name='foods')
+    op.drop_index('uq_exercises_system_name', table_name='exercises')
+    op.drop_table('seed_versions')
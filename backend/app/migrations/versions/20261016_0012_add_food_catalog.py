@@ -0,0 +1,35 @@
+"""Add food_catalog for Open Food Facts products imported from a dump.
+
+Revision ID: 20261016_0012
+Revises: 20261016_0011
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '20261016_0012'
+down_revision = '20261016_0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'food_catalog',
+        sa.Column('barcode', sa.String(64), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('brands', sa.Text(), nullable=True),
+        sa.Column('serving_size', sa.String(100), nullable=False),
+        sa.Column('calories', sa.Integer(), nullable=False),
+        sa.Column('protein', sa.Integer(), nullable=False),
+        sa.Column('carbs', sa.Integer(), nullable=False),
+        sa.Column('fat', sa.Integer(), nullable=False),
+        sa.Column('image_url', sa.Text(), nullable=True),
+        sa.Column('imported_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('food_catalog')
@@ -0,0 +1,26 @@
+"""Add coaching_jobs.source so workers know which jobs came from a request.
+
+Revision ID: 20261016_0013
+Revises: 20261016_0012
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '20261016_0013'
+down_revision = '20261016_0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'coaching_jobs',
+        sa.Column('source', sa.String(20), nullable=False, server_default='request'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('coaching_jobs', 'source')
@@ -1,9 +1,11 @@
 """SQLAlchemy ORM models."""
 from .user import User, UserSettings
 from .exercise import Exercise, WorkoutTemplate, TemplateExercise
-from .workout import Workout, Set
-from .nutrition import MealCategory, Food, Meal, MealItem, CheatDay
+from .workout import Workout, Set, PersonalRecord, ExerciseWeeklyStat, LastExercisePerformance
+from .nutrition import MealCategory, Food, Meal, MealItem, CheatDay, DailyNutritionTotal, FoodProductCache, FoodCatalogItem
 from .supplement import Supplement, SupplementLog
+from .metrics import PlatformCounter, UserActivityDay
+from .seed import SeedVersion
 
 __all__ = [
     "User",
@@ -13,11 +15,20 @@ __all__ = [
     "TemplateExercise",
     "Workout",
     "Set",
+    "PersonalRecord",
+    "ExerciseWeeklyStat",
+    "LastExercisePerformance",
     "MealCategory",
     "Food",
     "Meal",
     "MealItem",
     "CheatDay",
+    "DailyNutritionTotal",
+    "FoodProductCache",
+    "FoodCatalogItem",
     "Supplement",
     "SupplementLog",
+    "PlatformCounter",
+    "UserActivityDay",
+    "SeedVersion",
 ]
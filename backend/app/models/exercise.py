@@ -1,7 +1,7 @@
 """Exercise and workout template models."""
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -11,6 +11,11 @@ class Exercise(Base):
     """Exercise database (system and custom)."""
 
     __tablename__ = "exercises"
+    __table_args__ = (
+        Index("ix_exercises_sync", "updated_at", "id"),
+        # Natural key for seeding (services/seeding.py)
+        Index("uq_exercises_system_name", "name", unique=True, postgresql_where=text("NOT is_custom AND deleted_at IS NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
@@ -33,6 +38,9 @@ class WorkoutTemplate(Base):
     """User-created workout plans."""
 
     __tablename__ = "workout_templates"
+    __table_args__ = (
+        Index("ix_workout_templates_user_sync", "user_id", "updated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -53,6 +61,9 @@ class TemplateExercise(Base):
     """Exercises within a workout template."""
 
     __tablename__ = "template_exercises"
+    __table_args__ = (
+        Index("ix_template_exercises_template_order", "template_id", "order_index"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     template_id = Column(UUID(as_uuid=True), ForeignKey("workout_templates.id", ondelete="CASCADE"), nullable=False)
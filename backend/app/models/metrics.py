@@ -0,0 +1,34 @@
+"""Platform metric models for the admin dashboard."""
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, BigInteger, Date, Index
+from sqlalchemy.dialects.postgresql import UUID
+from ..database import Base
+
+
+class PlatformCounter(Base):
+    """
+    Sharded platform-wide counter.
+
+    Writers add to a random shard so concurrent transactions do not queue
+    on one hot row; readers sum the shards.
+    """
+
+    __tablename__ = "platform_counters"
+
+    name = Column(String(100), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class UserActivityDay(Base):
+    """One row per user per day with a logged workout or meal — kept for the active-user windows only."""
+
+    __tablename__ = "user_activity_days"
+    __table_args__ = (
+        Index("ix_user_activity_days_date", "activity_date"),
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    activity_date = Column(Date, primary_key=True)
@@ -1,8 +1,8 @@
 """Nutrition tracking models."""
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Date, Text, Boolean, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Date, Text, Boolean, UniqueConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -11,6 +11,9 @@ class MealCategory(Base):
     """User-defined meal categories (e.g., Breakfast, Lunch, Snack)."""
 
     __tablename__ = "meal_categories"
+    __table_args__ = (
+        Index("ix_meal_categories_user_sync", "user_id", "updated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -30,6 +33,18 @@ class Food(Base):
     """Food database (system and custom)."""
 
     __tablename__ = "foods"
+    __table_args__ = (
+        Index("ix_foods_custom_user_sync", "user_id", "updated_at", "id", postgresql_where=text("is_custom")),
+        # Ranked search (see services/food_search.py)
+        Index(
+            "ix_foods_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_foods_name_prefix", text("lower(name) text_pattern_ops"), postgresql_where=text("deleted_at IS NULL")),
+        # Natural key for seeding (services/seeding.py)
+        Index("uq_foods_system_name", "name", unique=True, postgresql_where=text("NOT is_custom AND deleted_at IS NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
@@ -57,6 +72,10 @@ class Meal(Base):
     """Meal logging session."""
 
     __tablename__ = "meals"
+    __table_args__ = (
+        Index("ix_meals_user_date_active", "user_id", "meal_date", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_meals_user_sync", "user_id", "updated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -84,7 +103,7 @@ class MealItem(Base):
     __tablename__ = "meal_items"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    meal_id = Column(UUID(as_uuid=True), ForeignKey("meals.id", ondelete="CASCADE"), nullable=False)
+    meal_id = Column(UUID(as_uuid=True), ForeignKey("meals.id", ondelete="CASCADE"), nullable=False, index=True)
     food_id = Column(UUID(as_uuid=True), ForeignKey("foods.id", ondelete="CASCADE"), nullable=False)
 
     # Snapshots (preserve historical accuracy if food macros change)
@@ -118,3 +137,57 @@ class CheatDay(Base):
 
     # Relationships
     user = relationship("User", back_populates="cheat_days")
+
+
+class DailyNutritionTotal(Base):
+    """Per-user daily macro totals — maintained as meals and meal items change."""
+
+    __tablename__ = "daily_nutrition_totals"
+    __table_args__ = (
+        UniqueConstraint("user_id", "total_date", name="uq_daily_nutrition_totals_user_date"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    total_date = Column(Date, nullable=False)
+
+    # Sums of snapshot * servings over the day's non-deleted meals
+    calories = Column(Float, nullable=False, default=0)
+    protein = Column(Float, nullable=False, default=0)
+    carbs = Column(Float, nullable=False, default=0)
+    fat = Column(Float, nullable=False, default=0)
+
+    meal_count = Column(Integer, nullable=False, default=0)
+    item_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class FoodProductCache(Base):
+    """Normalized Open Food Facts barcode lookups, shared across app workers."""
+
+    __tablename__ = "food_product_cache"
+
+    barcode = Column(String(64), primary_key=True)
+    product = Column(JSONB, nullable=True)  # Null when Open Food Facts has no such product
+    fetched_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class FoodCatalogItem(Base):
+    """Open Food Facts product imported from a dump, normalized per serving (scripts/import_off_dump.py)."""
+
+    __tablename__ = "food_catalog"
+
+    barcode = Column(String(64), primary_key=True)
+    name = Column(String(255), nullable=False)  # "Brand - Product", as the live proxy builds it
+    brands = Column(Text, nullable=True)
+    serving_size = Column(String(100), nullable=False)
+
+    # Macros per serving
+    calories = Column(Integer, nullable=False)
+    protein = Column(Integer, nullable=False)  # grams
+    carbs = Column(Integer, nullable=False)  # grams
+    fat = Column(Integer, nullable=False)  # grams
+
+    image_url = Column(Text, nullable=True)
+    imported_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,15 @@
+"""Reference data seeding state."""
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, Integer
+from ..database import Base
+
+
+class SeedVersion(Base):
+    """Checksum of the seed file last loaded per dataset, so unchanged data is skipped."""
+
+    __tablename__ = "seed_versions"
+
+    dataset = Column(String(100), primary_key=True)  # e.g. "exercises", "foods"
+    checksum = Column(String(64), nullable=False)  # sha256 of the seed file
+    row_count = Column(Integer, nullable=False)  # Rows in the file when it was loaded
+    applied_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
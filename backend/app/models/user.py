@@ -1,7 +1,7 @@
 """User models."""
 import uuid
 from datetime import datetime, timezone, date as date_type
-from sqlalchemy import Column, String, DateTime, Date, Text, ForeignKey, Integer, Float, Boolean, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Date, Text, ForeignKey, Integer, Float, Boolean, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -59,6 +59,7 @@ class UserSettings(Base):
 
     # AI Coach
     coach_type = Column(String(50), default="old_school", nullable=False)
+    timezone = Column(String(64), default="UTC", nullable=False)  # IANA name; sets the user's coaching day
 
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
@@ -84,6 +85,34 @@ class CoachInsight(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class CoachingJob(Base):
+    """
+    Queued coaching generation — one per user per day per section.
+
+    Workers claim pending rows with FOR UPDATE SKIP LOCKED; the unique key
+    makes concurrent requests for the same report share one job.
+    """
+
+    __tablename__ = "coaching_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "insight_date", "section", name="uq_coaching_jobs_user_date_section"),
+        Index("ix_coaching_jobs_pending", "run_after", postgresql_where=text("status = 'pending'")),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    section = Column(String(30), nullable=False)  # 'insight' or 'daily_coaching'
+    insight_date = Column(Date, nullable=False)
+    status = Column(String(20), default="pending", nullable=False)  # 'pending', 'running', 'done', 'failed'
+    source = Column(String(20), default="request", nullable=False)  # 'request' or 'pregenerate'
+    attempts = Column(Integer, default=0, nullable=False)
+    run_after = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
 class BodyMeasurement(Base):
     """Body measurements — one entry per user per day, extensible for future measurement types."""
 
@@ -1,7 +1,7 @@
 """Workout session and set tracking models."""
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Date, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Date, Boolean, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -11,6 +11,14 @@ class Workout(Base):
     """Actual workout session."""
 
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_user_date_active", "user_id", "workout_date", postgresql_where=text("deleted_at IS NULL")),
+        Index(
+            "ix_workouts_user_date_completed", "user_id", "workout_date",
+            postgresql_where=text("deleted_at IS NULL AND completed_at IS NOT NULL"),
+        ),
+        Index("ix_workouts_user_sync", "user_id", "updated_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -38,6 +46,10 @@ class Set(Base):
     """Individual exercise set within a workout."""
 
     __tablename__ = "sets"
+    __table_args__ = (
+        Index("ix_sets_workout_exercise", "workout_id", "exercise_id"),
+        Index("ix_sets_exercise_workout_completed", "exercise_id", "workout_id", postgresql_where=text("is_completed")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workout_id = Column(UUID(as_uuid=True), ForeignKey("workouts.id", ondelete="CASCADE"), nullable=False)
@@ -61,3 +73,68 @@ class Set(Base):
     # Relationships
     workout = relationship("Workout", back_populates="sets")
     exercise = relationship("Exercise", back_populates="sets")
+
+
+class PersonalRecord(Base):
+    """Best completed weight per user per exercise — maintained as sets are logged."""
+
+    __tablename__ = "personal_records"
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise_id", name="uq_personal_records_user_exercise"),
+        Index("ix_personal_records_user_achieved", "user_id", "achieved_date"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+
+    # Snapshot of the exercise name on the record-setting set
+    exercise_name_snapshot = Column(String(255), nullable=False)
+
+    best_weight = Column(Float, nullable=False)
+    previous_best = Column(Float, nullable=True)  # Best weight before this record was set
+    achieved_date = Column(Date, nullable=False)  # workout_date of the record-setting set
+    workout_id = Column(UUID(as_uuid=True), ForeignKey("workouts.id", ondelete="SET NULL"), nullable=True)
+    set_id = Column(UUID(as_uuid=True), ForeignKey("sets.id", ondelete="SET NULL"), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class ExerciseWeeklyStat(Base):
+    """Per-user, per-exercise weekly progression rollup — refreshed for the weeks a set change touches."""
+
+    __tablename__ = "exercise_weekly_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise_id", "week_start", name="uq_exercise_weekly_stats_user_exercise_week"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    week_start = Column(Date, nullable=False)  # Monday of the ISO week
+
+    set_count = Column(Integer, nullable=False)  # Completed working sets
+    total_reps = Column(Integer, nullable=False)
+    tonnage = Column(Float, nullable=False)  # Sum of weight * reps
+    top_weight = Column(Float, nullable=True)
+    e1rm_epley = Column(Float, nullable=True)  # Best estimated 1RM of the week
+    e1rm_brzycki = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class LastExercisePerformance(Base):
+    """Most recent completed workout per user per exercise — updated when a workout is completed."""
+
+    __tablename__ = "last_exercise_performances"
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise_id", name="uq_last_exercise_performances_user_exercise"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(UUID(as_uuid=True), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    workout_id = Column(UUID(as_uuid=True), ForeignKey("workouts.id", ondelete="CASCADE"), nullable=False)
+    workout_date = Column(Date, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
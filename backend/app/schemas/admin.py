@@ -39,9 +39,10 @@ class UserDetailRow(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """List of all users with activity summaries."""
+    """One page of users with activity summaries."""
     users: List[UserDetailRow]
     total: int
+    next_cursor: Optional[str] = None  # Null on the last page
 
 
 class FeatureAdoptionResponse(BaseModel):
@@ -53,3 +54,13 @@ class FeatureAdoptionResponse(BaseModel):
     users_with_supplements: int
     users_with_measurements: int
     coach_type_breakdown: Dict[str, int]
+
+
+class PrincipalCacheStatsResponse(BaseModel):
+    """Counters for the in-process principal cache (this worker only)."""
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
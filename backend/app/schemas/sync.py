@@ -0,0 +1,35 @@
+"""Delta sync schemas."""
+from pydantic import BaseModel
+from typing import List, Literal
+from uuid import UUID
+
+from .exercise import ExerciseResponse, WorkoutTemplateResponse
+from .nutrition import FoodResponse, MealCategoryResponse, MealResponse
+from .workout import WorkoutResponse
+
+# Type alias
+SyncEntity = Literal['exercises', 'foods', 'meal_categories', 'templates', 'workouts', 'meals']
+
+
+class SyncTombstone(BaseModel):
+    """A soft-deleted row the client should drop (with its children)."""
+    entity: SyncEntity
+    id: UUID
+
+
+class SyncChangesResponse(BaseModel):
+    """
+    One page of changes since a cursor.
+
+    Workouts, meals and templates carry their full set, item and exercise
+    lists; clients replace the stored children wholesale.
+    """
+    exercises: List[ExerciseResponse] = []
+    foods: List[FoodResponse] = []
+    meal_categories: List[MealCategoryResponse] = []
+    templates: List[WorkoutTemplateResponse] = []
+    workouts: List[WorkoutResponse] = []
+    meals: List[MealResponse] = []
+    deleted: List[SyncTombstone] = []
+    next_cursor: str
+    has_more: bool
@@ -33,6 +33,18 @@ class SetUpdate(BaseModel):
     is_completed: Optional[bool] = None
 
 
+class SetBatchUpdate(SetUpdate):
+    """Update for one set within a batch request."""
+    id: UUID
+
+
+class SetBatchRequest(BaseModel):
+    """Set creates, updates and deletes applied to one workout in one transaction."""
+    create: List[SetCreate] = []
+    update: List[SetBatchUpdate] = []
+    delete: List[UUID] = []
+
+
 class SetResponse(SetBase):
     """Set response."""
     id: UUID
@@ -155,3 +167,25 @@ class RecentPRResponse(BaseModel):
     weight: float
     date_achieved: date
     previous_best: Optional[float] = None
+
+
+class ExerciseWeekStats(BaseModel):
+    """One ISO week of an exercise's completed working sets."""
+    week_start: date
+    set_count: int
+    total_reps: int
+    tonnage: float
+    top_weight: Optional[float] = None
+    e1rm_epley: Optional[float] = None
+    e1rm_brzycki: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ExerciseProgressionResponse(BaseModel):
+    """Weekly progression series for one exercise, oldest week first."""
+    exercise_id: UUID
+    exercise_name: str
+    best_e1rm: Optional[float] = None  # Best Epley estimate over the returned weeks
+    weeks: List[ExerciseWeekStats]
@@ -0,0 +1,503 @@
+"""AI coach prompt building and generation.
+
+Shared by the coaching endpoints and the background coaching worker.
+Generation goes through the process-wide ``llm.LLMClient`` unless a client
+is passed in (test scripts pass one with a fake provider).
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.coach_personas import get_coach
+from ..config import settings as app_settings
+from ..database import AsyncReadSessionLocal
+from ..models.user import UserSettings, CoachInsight
+from .coaching_analytics import CoachingSnapshot, build_coaching_snapshot
+from .llm import LLMClient, LLMError, LLMNotConfigured, get_client
+
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("insight", "daily_coaching")
+
+
+class CoachingUnavailable(Exception):
+    """The LLM could not produce coaching (not configured, quota, or upstream error)."""
+
+
+def user_today(user_settings: Optional[UserSettings], now: Optional[datetime] = None) -> date:
+    """The current date in the user's timezone; coaching is generated once per local day."""
+    now = now or datetime.now(timezone.utc)
+    tz_name = user_settings.timezone if user_settings else "UTC"
+    try:
+        return now.astimezone(ZoneInfo(tz_name)).date()
+    except (ZoneInfoNotFoundError, ValueError):
+        return now.astimezone(timezone.utc).date()
+
+
+def format_user_data(snapshot: CoachingSnapshot) -> str:
+    """Render a coaching snapshot as the data block of the coaching prompt."""
+    today = snapshot.today
+    units = snapshot.units
+
+    lines = []
+    lines.append(f"User's preferred units: {units}")
+
+    # ================================================================
+    # ALL-TIME OVERVIEW
+    # ================================================================
+    lines.append(f"\n--- ALL-TIME OVERVIEW ---")
+    if snapshot.first_workout_date:
+        total_days_active = (today - snapshot.first_workout_date).days + 1
+        weeks_active = max(total_days_active / 7, 1)
+        avg_per_week = snapshot.total_workouts / weeks_active
+
+        lines.append(f"Member since: {snapshot.first_workout_date} ({total_days_active} days)")
+        lines.append(f"Total workouts completed: {snapshot.total_workouts}")
+        lines.append(f"Average workouts per week: {avg_per_week:.1f}")
+        lines.append(f"Total volume lifted (all time): {snapshot.all_time_volume:,.0f} {units}")
+    else:
+        lines.append("No workouts completed yet.")
+
+    # ================================================================
+    # MONTHLY COMPARISON (last 30 days vs previous 30 days)
+    # ================================================================
+    this_month_count = snapshot.this_month_workouts
+    last_month_count = snapshot.last_month_workouts
+
+    lines.append(f"\n--- MONTHLY COMPARISON (last 30 days vs previous 30 days) ---")
+
+    if this_month_count > 0 or last_month_count > 0:
+        this_month_vol = snapshot.this_month_volume
+        last_month_vol = snapshot.last_month_volume
+
+        lines.append(f"This month: {this_month_count} workouts, {this_month_vol:,.0f} {units} volume")
+        lines.append(f"Last month: {last_month_count} workouts, {last_month_vol:,.0f} {units} volume")
+
+        if last_month_count > 0:
+            freq_change = ((this_month_count - last_month_count) / last_month_count) * 100
+            lines.append(f"Workout frequency change: {freq_change:+.0f}%")
+        if last_month_vol > 0:
+            vol_change = ((this_month_vol - last_month_vol) / last_month_vol) * 100
+            lines.append(f"Volume change: {vol_change:+.0f}%")
+    else:
+        lines.append("Not enough data for monthly comparison.")
+
+    # ================================================================
+    # EXERCISE PROGRESSION (top 5 exercises by frequency)
+    # ================================================================
+    lines.append(f"\n--- EXERCISE PROGRESSION (top exercises) ---")
+
+    if snapshot.top_exercises:
+        for ex in snapshot.top_exercises:
+            all_time_pr = ex.all_time_best
+            best_this_month = ex.best_this_month
+            best_last_month = ex.best_last_month
+
+            parts = [f"{ex.name}: All-time PR {all_time_pr} {units}"]
+            if best_this_month is not None:
+                parts.append(f"This month best: {best_this_month} {units}")
+            if best_last_month is not None and best_this_month is not None:
+                diff = best_this_month - best_last_month
+                direction = "+" if diff > 0 else ""
+                tag = " [REGRESSION]" if diff < 0 else (" [PR]" if best_this_month >= all_time_pr and diff > 0 else "")
+                parts.append(f"Last month best: {best_last_month} {units} ({direction}{diff} {units}){tag}")
+            elif best_last_month is not None:
+                parts.append(f"Last month best: {best_last_month} {units}")
+
+            lines.append(f"  - {' | '.join(parts)}")
+    else:
+        lines.append("No weighted exercise data yet.")
+
+    # ================================================================
+    # CONSISTENCY (last 8 weeks)
+    # ================================================================
+    lines.append(f"\n--- CONSISTENCY (last 8 weeks) ---")
+
+    weekly_workout_counts = snapshot.weekly_workout_counts
+    weekly_nutrition_days = snapshot.weekly_nutrition_days
+
+    lines.append(f"Workout frequency (newest first): {', '.join(str(c) for c in weekly_workout_counts)} workouts/week")
+    if weekly_workout_counts:
+        avg_freq = sum(weekly_workout_counts) / len(weekly_workout_counts)
+        lines.append(f"Average: {avg_freq:.1f}/week")
+
+    lines.append(f"Nutrition logging (newest first): {', '.join(str(d) for d in weekly_nutrition_days)} days/week")
+    if weekly_nutrition_days:
+        avg_nutr = sum(weekly_nutrition_days) / len(weekly_nutrition_days)
+        lines.append(f"Average: {avg_nutr:.1f} days/week")
+
+    # ================================================================
+    # THIS WEEK WORKOUT DETAIL (existing, kept for immediate context)
+    # ================================================================
+    workouts_completed = snapshot.week_workouts
+
+    lines.append(f"\n--- THIS WEEK WORKOUT DETAIL (last 7 days) ---")
+    lines.append(f"Workouts completed: {workouts_completed}")
+
+    if workouts_completed > 0:
+        lines.append(f"Total volume: {snapshot.week_volume:.0f} {units}")
+        lines.append(f"Total sets: {snapshot.week_sets}")
+        lines.append(f"Avg sets per workout: {snapshot.week_sets / workouts_completed:.1f}")
+
+        if snapshot.week_avg_duration_minutes is not None:
+            lines.append(f"Avg workout duration: {snapshot.week_avg_duration_minutes:.0f} minutes")
+
+        if snapshot.week_exercises:
+            lines.append("\nExercises performed this week:")
+            for ex in snapshot.week_exercises:
+                weight_str = f", max weight: {ex.max_weight} {units}" if ex.max_weight else ""
+                lines.append(f"  - {ex.name}: {ex.set_count} sets{weight_str}")
+    else:
+        lines.append("No workouts logged this week.")
+
+    # ================================================================
+    # NUTRITION TRENDS (last 4 weeks)
+    # ================================================================
+    lines.append(f"\n--- NUTRITION TRENDS (last 4 weeks, excluding cheat days) ---")
+
+    for week_offset, week in enumerate(snapshot.nutrition_weeks):
+        label = "This week" if week_offset == 0 else f"Week -{week_offset}"
+        if week.days_logged:
+            lines.append(f"{label}: avg {week.avg_calories} cal | {week.avg_protein}g protein | {week.avg_carbs}g carbs | {week.avg_fat}g fat ({week.days_logged} days logged)")
+        else:
+            lines.append(f"{label}: No nutrition data logged")
+
+    # ================================================================
+    # THIS WEEK CHEAT DAYS & NUTRITION DETAIL
+    # ================================================================
+    cheat_dates = snapshot.week_cheat_dates
+
+    lines.append(f"\n--- THIS WEEK CHEAT DAYS ---")
+    if cheat_dates:
+        cheat_count = len(cheat_dates)
+        cheat_dates_str = ", ".join(str(cd) for cd in cheat_dates)
+        lines.append(f"Cheat days this week: {cheat_count} ({cheat_dates_str})")
+
+        if cheat_count >= 3:
+            max_streak = 1
+            current_streak = 1
+            for i in range(1, len(cheat_dates)):
+                if (cheat_dates[i] - cheat_dates[i - 1]).days == 1:
+                    current_streak += 1
+                    max_streak = max(max_streak, current_streak)
+                else:
+                    current_streak = 1
+            if max_streak >= 3:
+                lines.append(f"WARNING: {max_streak} consecutive cheat days detected")
+    else:
+        lines.append("Cheat days this week: 0")
+
+    # Macro targets
+    targets = []
+    if snapshot.target_calories:
+        targets.append(f"Calories: {snapshot.target_calories}")
+    if snapshot.target_protein:
+        targets.append(f"Protein: {snapshot.target_protein}g")
+    if snapshot.target_carbs:
+        targets.append(f"Carbs: {snapshot.target_carbs}g")
+    if snapshot.target_fat:
+        targets.append(f"Fat: {snapshot.target_fat}g")
+    if targets:
+        lines.append(f"\nUser's daily macro targets: {', '.join(targets)}")
+
+    # ================================================================
+    # BODY MEASUREMENTS
+    # ================================================================
+    lines.append(f"\n--- BODY MEASUREMENTS ---")
+
+    latest = snapshot.latest_weight
+    if latest:
+        lines.append(f"Current weight: {latest.weight} {units} (logged {latest.measurement_date})")
+
+        baseline = snapshot.baseline_weight
+        if baseline:
+            change = latest.weight - baseline.weight
+            direction = "+" if change > 0 else ""
+            lines.append(f"Weight {baseline.measurement_date}: {baseline.weight} {units}")
+            lines.append(f"Weight change (30 days): {direction}{change:.1f} {units}")
+    else:
+        lines.append("No body weight data logged yet.")
+
+    # ================================================================
+    # SUPPLEMENTS
+    # ================================================================
+    lines.append(f"\n--- SUPPLEMENTS ---")
+
+    if snapshot.supplements:
+        supp_list = []
+        for s in snapshot.supplements:
+            dosage_str = f" ({s.dosage})" if s.dosage else ""
+            supp_list.append(f"{s.name}{dosage_str}")
+        lines.append(f"Active supplements: {', '.join(supp_list)}")
+
+        today_status = []
+        for s in snapshot.supplements:
+            status = "taken" if s.taken_today else "not taken"
+            today_status.append(f"{s.name}: {status}")
+        lines.append(f"Today's supplement intake: {', '.join(today_status)}")
+
+        week_total_possible = len(snapshot.supplements) * 7
+        week_logs = snapshot.week_supplement_doses
+        adherence_pct = (week_logs / week_total_possible) * 100
+        lines.append(f"Weekly supplement adherence: {adherence_pct:.0f}% ({week_logs}/{week_total_possible} doses)")
+    else:
+        lines.append("No supplements configured.")
+
+    return "\n".join(lines)
+
+
+async def gather_user_data(
+    user_id: UUID,
+    user_settings: Optional[UserSettings],
+    today: Optional[date] = None,
+    db: Optional[AsyncSession] = None,
+) -> str:
+    """
+    Gather workout, nutrition, and historical trend data for the coaching prompt.
+
+    Reads on ``db`` when given. Without it, opens a session on the read
+    replica, which may lag the primary: pass the caller's session when the
+    data must include a write the user just made.
+    """
+    def build(session):
+        return build_coaching_snapshot(user_id, user_settings, session, today)
+
+    if db is not None:
+        snapshot = await db.run_sync(build)
+    else:
+        async with AsyncReadSessionLocal() as read_db:
+            snapshot = await read_db.run_sync(build)
+    return format_user_data(snapshot)
+
+
+def _unavailable(e: LLMError) -> CoachingUnavailable:
+    """Map an LLM failure to the message shown to the user."""
+    if isinstance(e, LLMNotConfigured):
+        return CoachingUnavailable("AI coaching is not configured. GEMINI_API_KEY is missing.")
+    logger.error(f"LLM error: {e}")
+    if e.status == 429:
+        return CoachingUnavailable("AI coaching quota exceeded. Please check your Gemini API billing.")
+    return CoachingUnavailable(f"Failed to generate coaching insight: {str(e)}")
+
+
+async def _complete(
+    coach_type: str,
+    section: str,
+    system_prompt: str,
+    user_prompt: str,
+    llm: Optional[LLMClient],
+) -> str:
+    """Run a coaching prompt, mapping LLM failures to CoachingUnavailable."""
+    try:
+        return await (llm or get_client()).generate(system_prompt, user_prompt, scope=(coach_type, section))
+    except LLMError as e:
+        raise _unavailable(e)
+
+
+async def generate_insight(coach_type: str, user_data: str, llm: Optional[LLMClient] = None) -> str:
+    """Generate a single short coaching insight."""
+    coach = get_coach(coach_type)
+    user_prompt = (
+        f"Here is the user's fitness data, including both recent activity and historical trends. "
+        f"Based on this data, give them one personalized coaching insight with a specific, "
+        f"actionable suggestion to improve their diet or workout routine:\n\n{user_data}"
+    )
+    return await _complete(coach_type, "insight", coach["system_prompt"], user_prompt, llm)
+
+
+def parse_coaching_sections(text: str) -> dict:
+    """Parse structured coaching output into 3 sections."""
+    sections = {"summary": "", "workout_tips": "", "nutrition_tips": ""}
+
+    # Try to split by markers
+    summary_match = re.search(r'\[SUMMARY\](.*?)(?=\[WORKOUT_TIPS\]|$)', text, re.DOTALL)
+    workout_match = re.search(r'\[WORKOUT_TIPS\](.*?)(?=\[NUTRITION_TIPS\]|$)', text, re.DOTALL)
+    nutrition_match = re.search(r'\[NUTRITION_TIPS\](.*?)$', text, re.DOTALL)
+
+    if summary_match:
+        sections["summary"] = summary_match.group(1).strip()
+    if workout_match:
+        sections["workout_tips"] = workout_match.group(1).strip()
+    if nutrition_match:
+        sections["nutrition_tips"] = nutrition_match.group(1).strip()
+
+    # Fallback: if parsing failed, put everything in summary
+    if not sections["summary"] and not sections["workout_tips"]:
+        sections["summary"] = text
+        sections["workout_tips"] = "No specific workout tips available today."
+        sections["nutrition_tips"] = "No specific nutrition tips available today."
+
+    return sections
+
+
+def _daily_coaching_prompt(user_data: str) -> str:
+    return (
+        "Here is the user's fitness data, including both recent activity and historical trends.\n\n"
+        f"{user_data}\n\n"
+        "Based on this data, provide a comprehensive daily coaching report with THREE sections. "
+        "Use EXACTLY these section markers on their own line:\n\n"
+        "[SUMMARY]\n"
+        "Write a detailed daily summary (2-3 paragraphs). Review their recent performance, "
+        "what's going well, what needs improvement, progress toward their goals, and a motivational closing. "
+        "Reference specific numbers from their data.\n\n"
+        "[WORKOUT_TIPS]\n"
+        "Write 3-5 specific, actionable workout coaching tips. Include: exercise suggestions or swaps, "
+        "when to increase weight based on their progression data, deload timing recommendations, "
+        "training split adjustments, and form or technique cues for their top exercises. "
+        "Each tip should be a bullet point starting with a dash (-).\n\n"
+        "[NUTRITION_TIPS]\n"
+        "Write 3-5 specific, actionable nutrition and supplement recommendations. Include: "
+        "macro adjustments based on their trends vs targets, meal timing suggestions, "
+        "supplement recommendations or adherence feedback, and specific food suggestions to hit their targets. "
+        "Each tip should be a bullet point starting with a dash (-)."
+    )
+
+
+async def generate_daily_coaching(coach_type: str, user_data: str, llm: Optional[LLMClient] = None) -> dict:
+    """Generate full daily coaching with 3 structured sections."""
+    coach = get_coach(coach_type)
+    text = await _complete(coach_type, "daily_coaching", coach["system_prompt"], _daily_coaching_prompt(user_data), llm)
+    return parse_coaching_sections(text)
+
+
+SECTION_MARKERS = {
+    "[SUMMARY]": "summary",
+    "[WORKOUT_TIPS]": "workout_tips",
+    "[NUTRITION_TIPS]": "nutrition_tips",
+}
+
+
+class SectionStreamParser:
+    """
+    Split streamed coaching text into per-section deltas as markers arrive.
+
+    A marker may be split across chunks, so a trailing ``[...`` that could
+    still become one is held back until the next chunk. Text before the
+    first marker counts as summary, as in ``parse_coaching_sections``.
+    """
+
+    def __init__(self):
+        self.section = "summary"
+        self.text = ""
+        self._pending = ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        self.text += chunk
+        buffer = self._pending + chunk
+        events = []
+        while True:
+            found = [(buffer.find(marker), marker) for marker in SECTION_MARKERS if marker in buffer]
+            if not found:
+                break
+            index, marker = min(found)
+            if index:
+                events.append((self.section, buffer[:index]))
+            self.section = SECTION_MARKERS[marker]
+            buffer = buffer[index + len(marker):]
+
+        cut = buffer.rfind("[")
+        if cut != -1 and any(marker.startswith(buffer[cut:]) for marker in SECTION_MARKERS):
+            buffer, self._pending = buffer[:cut], buffer[cut:]
+        else:
+            self._pending = ""
+        if buffer:
+            events.append((self.section, buffer))
+        return events
+
+    def close(self) -> List[Tuple[str, str]]:
+        events = [(self.section, self._pending)] if self._pending else []
+        self._pending = ""
+        return events
+
+
+async def stream_daily_coaching(
+    coach_type: str,
+    user_data: str,
+    parser: SectionStreamParser,
+    llm: Optional[LLMClient] = None,
+) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Yield (section, text delta) pairs while the daily coaching generates.
+
+    The full raw text accumulates in ``parser.text``; parse it with
+    ``parse_coaching_sections`` once the stream ends.
+    """
+    coach = get_coach(coach_type)
+    try:
+        async for chunk in (llm or get_client()).stream(
+            coach["system_prompt"], _daily_coaching_prompt(user_data), scope=(coach_type, "daily_coaching")
+        ):
+            for event in parser.feed(chunk):
+                yield event
+    except LLMError as e:
+        raise _unavailable(e)
+    for event in parser.close():
+        yield event
+
+
+def sections_to_text(sections: dict) -> str:
+    """Store the raw text with markers for re-parsing on cache hit."""
+    return (
+        f"[SUMMARY]\n{sections['summary']}\n\n"
+        f"[WORKOUT_TIPS]\n{sections['workout_tips']}\n\n"
+        f"[NUTRITION_TIPS]\n{sections['nutrition_tips']}"
+    )
+
+
+async def generate_section(
+    section: str,
+    user_id: UUID,
+    user_settings: Optional[UserSettings],
+    db: AsyncSession,
+    today: date,
+    llm: Optional[LLMClient] = None,
+    replica: bool = False,
+) -> CoachInsight:
+    """
+    Generate one coaching section and store it as today's CoachInsight.
+
+    Replaces any row for the same day and section (e.g. from a different
+    coach). The user's data is read on ``db`` unless ``replica`` is set and
+    a read replica is configured (overnight pre-generation). The caller commits.
+    """
+    coach_type = user_settings.coach_type if user_settings else "old_school"
+    read_db = None if replica and app_settings.READ_REPLICA_URL else db
+    user_data = await gather_user_data(user_id, user_settings, today, read_db)
+    if section == "insight":
+        text = await generate_insight(coach_type, user_data, llm)
+    else:
+        text = sections_to_text(await generate_daily_coaching(coach_type, user_data, llm))
+    return await store_section(db, user_id, coach_type, section, text, today)
+
+
+async def store_section(
+    db: AsyncSession,
+    user_id: UUID,
+    coach_type: str,
+    section: str,
+    text: str,
+    today: date,
+) -> CoachInsight:
+    """Save a generated section as today's CoachInsight, replacing any earlier one. The caller commits."""
+    await db.execute(delete(CoachInsight).where(
+        CoachInsight.user_id == user_id,
+        CoachInsight.insight_date == today,
+        CoachInsight.section == section,
+    ))
+    insight = CoachInsight(
+        user_id=user_id,
+        coach_type=coach_type,
+        section=section,
+        insight=text,
+        insight_date=today,
+    )
+    db.add(insight)
+    await db.flush()
+    return insight
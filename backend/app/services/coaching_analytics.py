@@ -0,0 +1,343 @@
+"""Batched analytics snapshot for the AI coach.
+
+Computes every fact the coaching prompt needs with a handful of grouped,
+conditionally aggregated queries instead of one query per week, per
+exercise and per window.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from ..models.user import UserSettings, BodyMeasurement
+from ..models.workout import Workout, Set
+from ..models.nutrition import CheatDay, DailyNutritionTotal
+from ..models.supplement import Supplement, SupplementLog
+
+
+CONSISTENCY_WEEKS = 8
+NUTRITION_TREND_WEEKS = 4
+TOP_EXERCISE_COUNT = 5
+
+
+@dataclass
+class ExerciseProgress:
+    """Best weights for one of the user's most-trained exercises."""
+    name: str
+    all_time_best: Optional[float]
+    best_this_month: Optional[float]
+    best_last_month: Optional[float]
+
+
+@dataclass
+class ExerciseWeekSummary:
+    """An exercise performed in the last 7 days."""
+    name: str
+    set_count: int
+    max_weight: Optional[float]
+
+
+@dataclass
+class NutritionWeek:
+    """Average daily macros for one 7-day window, excluding cheat days."""
+    days_logged: int
+    avg_calories: int = 0
+    avg_protein: int = 0
+    avg_carbs: int = 0
+    avg_fat: int = 0
+
+
+@dataclass
+class WeightReading:
+    """A logged body weight."""
+    weight: float
+    measurement_date: date
+
+
+@dataclass
+class SupplementStatus:
+    """An active supplement and whether it was taken today."""
+    name: str
+    dosage: Optional[str]
+    taken_today: bool
+
+
+@dataclass
+class CoachingSnapshot:
+    """Everything the coaching prompt reports about a user, as of ``today``."""
+    today: date
+    units: str
+
+    # All time
+    total_workouts: int = 0
+    first_workout_date: Optional[date] = None
+    all_time_volume: float = 0
+
+    # Last 30 days vs the 30 before
+    this_month_workouts: int = 0
+    this_month_volume: float = 0
+    last_month_workouts: int = 0
+    last_month_volume: float = 0
+
+    top_exercises: List[ExerciseProgress] = field(default_factory=list)
+
+    # Newest week first
+    weekly_workout_counts: List[int] = field(default_factory=list)
+    weekly_nutrition_days: List[int] = field(default_factory=list)
+
+    # Last 7 days
+    week_workouts: int = 0
+    week_volume: float = 0
+    week_sets: int = 0
+    week_avg_duration_minutes: Optional[float] = None
+    week_exercises: List[ExerciseWeekSummary] = field(default_factory=list)
+    week_cheat_dates: List[date] = field(default_factory=list)
+
+    # Newest week first
+    nutrition_weeks: List[NutritionWeek] = field(default_factory=list)
+
+    target_calories: Optional[int] = None
+    target_protein: Optional[int] = None
+    target_carbs: Optional[int] = None
+    target_fat: Optional[int] = None
+
+    latest_weight: Optional[WeightReading] = None
+    baseline_weight: Optional[WeightReading] = None  # Latest reading at least 30 days old
+
+    supplements: List[SupplementStatus] = field(default_factory=list)
+    week_supplement_doses: int = 0
+
+
+def _between(column, start: date, end: date):
+    return and_(column >= start, column <= end)
+
+
+def _week_range(today: date, week_offset: int):
+    """Inclusive (start, end) for the 7-day window ``week_offset`` weeks back."""
+    end = today - timedelta(days=week_offset * 7)
+    return end - timedelta(days=6), end
+
+
+def _load_workout_totals(snapshot: CoachingSnapshot, user_id: UUID, db: Session) -> None:
+    """Counts, volumes and durations across every window in one aggregate."""
+    today = snapshot.today
+    month_start = today - timedelta(days=29)
+    last_month_start = today - timedelta(days=59)
+    week_start = today - timedelta(days=6)
+
+    set_totals = db.query(
+        Set.workout_id.label("workout_id"),
+        func.sum(func.coalesce(Set.weight, 0) * func.coalesce(Set.reps, 0)).label("volume"),
+        func.count(Set.id).label("set_count"),
+    ).join(Workout, Set.workout_id == Workout.id).filter(
+        Workout.user_id == user_id,
+        Workout.deleted_at.is_(None),
+        Workout.completed_at.isnot(None),
+        Set.is_completed == True,
+    ).group_by(Set.workout_id).subquery()
+
+    volume = func.coalesce(set_totals.c.volume, 0)
+    set_count = func.coalesce(set_totals.c.set_count, 0)
+    this_month = _between(Workout.workout_date, month_start, today)
+    last_month = _between(Workout.workout_date, last_month_start, month_start - timedelta(days=1))
+    this_week = _between(Workout.workout_date, week_start, today)
+    minutes = func.extract("epoch", Workout.completed_at - Workout.started_at) / 60
+
+    columns = [
+        func.count(Workout.id).label("total"),
+        func.min(Workout.workout_date).label("first_date"),
+        func.sum(volume).label("volume"),
+        func.count(case((this_month, 1))).label("this_month"),
+        func.sum(case((this_month, volume), else_=0)).label("this_month_volume"),
+        func.count(case((last_month, 1))).label("last_month"),
+        func.sum(case((last_month, volume), else_=0)).label("last_month_volume"),
+        func.count(case((this_week, 1))).label("week"),
+        func.sum(case((this_week, volume), else_=0)).label("week_volume"),
+        func.sum(case((this_week, set_count), else_=0)).label("week_sets"),
+        func.avg(case((and_(this_week, minutes > 0, minutes < 480), minutes))).label("week_minutes"),
+    ]
+    for week_offset in range(CONSISTENCY_WEEKS):
+        w_start, w_end = _week_range(today, week_offset)
+        columns.append(func.count(case((_between(Workout.workout_date, w_start, w_end), 1))))
+
+    row = db.query(*columns).outerjoin(
+        set_totals, set_totals.c.workout_id == Workout.id
+    ).filter(
+        Workout.user_id == user_id,
+        Workout.deleted_at.is_(None),
+        Workout.completed_at.isnot(None),
+    ).one()
+
+    snapshot.total_workouts = row.total or 0
+    snapshot.first_workout_date = row.first_date
+    snapshot.all_time_volume = float(row.volume or 0)
+    snapshot.this_month_workouts = row.this_month or 0
+    snapshot.this_month_volume = float(row.this_month_volume or 0)
+    snapshot.last_month_workouts = row.last_month or 0
+    snapshot.last_month_volume = float(row.last_month_volume or 0)
+    snapshot.week_workouts = row.week or 0
+    snapshot.week_volume = float(row.week_volume or 0)
+    snapshot.week_sets = int(row.week_sets or 0)
+    snapshot.week_avg_duration_minutes = float(row.week_minutes) if row.week_minutes is not None else None
+    snapshot.weekly_workout_counts = [count or 0 for count in row[-CONSISTENCY_WEEKS:]]
+
+
+def _load_exercises(snapshot: CoachingSnapshot, user_id: UUID, db: Session) -> None:
+    """Per-exercise bests for every window from one GROUP BY."""
+    today = snapshot.today
+    month_start = today - timedelta(days=29)
+    last_month_start = today - timedelta(days=59)
+    this_month = _between(Workout.workout_date, month_start, today)
+    last_month = _between(Workout.workout_date, last_month_start, month_start - timedelta(days=1))
+    this_week = _between(Workout.workout_date, today - timedelta(days=6), today)
+
+    rows = db.query(
+        Set.exercise_name_snapshot.label("name"),
+        func.count(Set.weight).label("weighted_sets"),
+        func.max(Set.weight).label("all_time_best"),
+        func.max(case((this_month, Set.weight))).label("best_this_month"),
+        func.max(case((last_month, Set.weight))).label("best_last_month"),
+        func.count(case((this_week, Set.id))).label("week_sets"),
+        func.max(case((this_week, Set.weight))).label("week_max_weight"),
+    ).join(Workout, Set.workout_id == Workout.id).filter(
+        Workout.user_id == user_id,
+        Workout.deleted_at.is_(None),
+        Workout.completed_at.isnot(None),
+        Set.is_completed == True,
+    ).group_by(Set.exercise_name_snapshot).all()
+
+    ranked = sorted((r for r in rows if r.weighted_sets > 0), key=lambda r: (-r.weighted_sets, r.name))
+    snapshot.top_exercises = [
+        ExerciseProgress(
+            name=r.name,
+            all_time_best=r.all_time_best,
+            best_this_month=r.best_this_month,
+            best_last_month=r.best_last_month,
+        )
+        for r in ranked[:TOP_EXERCISE_COUNT]
+    ]
+    snapshot.week_exercises = [
+        ExerciseWeekSummary(name=r.name, set_count=r.week_sets, max_weight=r.week_max_weight)
+        for r in sorted(rows, key=lambda r: r.name)
+        if r.week_sets > 0
+    ]
+
+
+def _load_nutrition(snapshot: CoachingSnapshot, user_id: UUID, db: Session) -> None:
+    """Daily rollup rows and cheat days, bucketed into weeks in Python."""
+    today = snapshot.today
+    history_start = today - timedelta(days=CONSISTENCY_WEEKS * 7 - 1)
+    trend_start = today - timedelta(days=NUTRITION_TREND_WEEKS * 7 - 1)
+
+    daily = db.query(DailyNutritionTotal).filter(
+        DailyNutritionTotal.user_id == user_id,
+        DailyNutritionTotal.total_date >= history_start,
+        DailyNutritionTotal.total_date <= today,
+    ).all()
+
+    cheat_dates = {cd for (cd,) in db.query(CheatDay.cheat_date).filter(
+        CheatDay.user_id == user_id,
+        CheatDay.cheat_date >= trend_start,
+        CheatDay.cheat_date <= today,
+    ).all()}
+
+    snapshot.weekly_nutrition_days = []
+    for week_offset in range(CONSISTENCY_WEEKS):
+        w_start, w_end = _week_range(today, week_offset)
+        snapshot.weekly_nutrition_days.append(sum(1 for d in daily if w_start <= d.total_date <= w_end))
+
+    snapshot.nutrition_weeks = []
+    for week_offset in range(NUTRITION_TREND_WEEKS):
+        w_start, w_end = _week_range(today, week_offset)
+        week_cheats = {cd for cd in cheat_dates if w_start <= cd <= w_end}
+        non_cheat = [
+            d for d in daily
+            if w_start <= d.total_date <= w_end and d.item_count > 0 and d.total_date not in week_cheats
+        ]
+        week = NutritionWeek(days_logged=len(non_cheat))
+        if non_cheat:
+            denominator = max(7 - len(week_cheats), 1)
+            week.avg_calories = int(sum(d.calories for d in non_cheat)) // denominator
+            week.avg_protein = int(sum(d.protein for d in non_cheat)) // denominator
+            week.avg_carbs = int(sum(d.carbs for d in non_cheat)) // denominator
+            week.avg_fat = int(sum(d.fat for d in non_cheat)) // denominator
+        snapshot.nutrition_weeks.append(week)
+
+    week_start = today - timedelta(days=6)
+    snapshot.week_cheat_dates = sorted(cd for cd in cheat_dates if cd >= week_start)
+
+
+def _load_body_weight(snapshot: CoachingSnapshot, user_id: UUID, db: Session) -> None:
+    """Latest weight plus the latest reading from at least 30 days ago."""
+    latest = db.query(BodyMeasurement.weight, BodyMeasurement.measurement_date).filter(
+        BodyMeasurement.user_id == user_id,
+        BodyMeasurement.weight.isnot(None),
+    ).order_by(BodyMeasurement.measurement_date.desc()).first()
+    if not latest:
+        return
+    snapshot.latest_weight = WeightReading(weight=latest.weight, measurement_date=latest.measurement_date)
+
+    baseline = db.query(BodyMeasurement.weight, BodyMeasurement.measurement_date).filter(
+        BodyMeasurement.user_id == user_id,
+        BodyMeasurement.weight.isnot(None),
+        BodyMeasurement.measurement_date <= snapshot.today - timedelta(days=30),
+    ).order_by(BodyMeasurement.measurement_date.desc()).first()
+    if baseline:
+        snapshot.baseline_weight = WeightReading(weight=baseline.weight, measurement_date=baseline.measurement_date)
+
+
+def _load_supplements(snapshot: CoachingSnapshot, user_id: UUID, db: Session) -> None:
+    """Active supplements with today's status and the week's dose count."""
+    active = db.query(Supplement.id, Supplement.name, Supplement.dosage).filter(
+        Supplement.user_id == user_id,
+        Supplement.is_active == True,
+    ).all()
+    if not active:
+        return
+
+    today = snapshot.today
+    logs = db.query(
+        SupplementLog.supplement_id,
+        func.count(SupplementLog.id).label("doses"),
+        func.max(case((SupplementLog.log_date == today, 1), else_=0)).label("taken_today"),
+    ).filter(
+        SupplementLog.user_id == user_id,
+        SupplementLog.log_date >= today - timedelta(days=6),
+        SupplementLog.log_date <= today,
+        SupplementLog.taken == True,
+    ).group_by(SupplementLog.supplement_id).all()
+    taken_today = {log.supplement_id for log in logs if log.taken_today}
+
+    snapshot.supplements = [
+        SupplementStatus(name=s.name, dosage=s.dosage, taken_today=s.id in taken_today)
+        for s in active
+    ]
+    snapshot.week_supplement_doses = sum(log.doses for log in logs)
+
+
+def build_coaching_snapshot(
+    user_id: UUID,
+    user_settings: Optional[UserSettings],
+    db: Session,
+    today: Optional[date] = None,
+) -> CoachingSnapshot:
+    """Collect the coaching facts for a user."""
+    snapshot = CoachingSnapshot(
+        today=today or date.today(),
+        units=user_settings.units if user_settings else "lbs",
+    )
+    if user_settings:
+        snapshot.target_calories = user_settings.macro_target_calories
+        snapshot.target_protein = user_settings.macro_target_protein
+        snapshot.target_carbs = user_settings.macro_target_carbs
+        snapshot.target_fat = user_settings.macro_target_fat
+
+    _load_workout_totals(snapshot, user_id, db)
+    _load_exercises(snapshot, user_id, db)
+    _load_nutrition(snapshot, user_id, db)
+    _load_body_weight(snapshot, user_id, db)
+    _load_supplements(snapshot, user_id, db)
+    return snapshot
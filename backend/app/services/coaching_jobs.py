@@ -0,0 +1,317 @@
+"""Postgres-backed queue for coaching generation.
+
+Requests enqueue a ``coaching_jobs`` row instead of calling the LLM inline;
+the unique (user, date, section) key makes concurrent requests share one
+job. A request only generates inline when no worker claims its new job
+within COACHING_INLINE_AFTER_SECONDS (e.g. no worker is running). Workers
+(``scripts/coaching_worker.py``) claim due rows with ``FOR UPDATE SKIP
+LOCKED``, so several workers never pick the same job, and also pre-generate
+each active user's coaching overnight in their timezone. Only pre-generated
+jobs read the user's data on the read replica; a request's job may follow a
+write the replica has not replayed yet.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings as app_settings
+from ..database import AsyncSessionLocal
+from ..models.metrics import UserActivityDay
+from ..models.user import UserSettings, CoachInsight, CoachingJob
+from . import coaching
+from .llm import LLMClient
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# CoachingJob.source
+REQUEST = "request"
+PREGENERATE = "pregenerate"
+
+CLAIM_POLL_SECONDS = 0.2
+
+
+async def enqueue(db: AsyncSession, user_id: UUID, section: str, insight_date) -> CoachingJob:
+    """
+    Queue a section for generation, or return the job already queued for it.
+
+    A finished or failed job is reset to pending: the caller only enqueues
+    when no insight matches the user's current coach. The caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = insert(CoachingJob).values(
+        user_id=user_id,
+        section=section,
+        insight_date=insight_date,
+        status=PENDING,
+        attempts=0,
+        run_after=now,
+        source=REQUEST,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_coaching_jobs_user_date_section",
+        set_={
+            "status": PENDING,
+            "attempts": 0,
+            "run_after": now,
+            "locked_at": None,
+            "last_error": None,
+            "source": REQUEST,
+            "updated_at": now,
+        },
+        where=CoachingJob.status.in_([DONE, FAILED]),
+    )
+    await db.execute(stmt)
+    job = (await db.execute(select(CoachingJob).where(
+        CoachingJob.user_id == user_id,
+        CoachingJob.insight_date == insight_date,
+        CoachingJob.section == section,
+    ).execution_options(populate_existing=True))).scalars().one()
+    # A request now waits on a pre-generated job: read its data on the primary
+    job.source = REQUEST
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: UUID, user_id: UUID) -> Optional[CoachingJob]:
+    return (await db.execute(select(CoachingJob).where(
+        CoachingJob.id == job_id,
+        CoachingJob.user_id == user_id,
+    ))).scalars().first()
+
+
+async def claim_for_request(db: AsyncSession, user_id: UUID, section: str, insight_date) -> Optional[UUID]:
+    """
+    Take a section's job so a request can generate it inline (streaming).
+
+    Returns the job id, or None while a worker or another request is
+    already running it. Commits.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=app_settings.COACHING_JOB_LOCK_SECONDS)
+    stmt = insert(CoachingJob).values(
+        user_id=user_id,
+        section=section,
+        insight_date=insight_date,
+        status=RUNNING,
+        attempts=1,
+        run_after=now,
+        locked_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_coaching_jobs_user_date_section",
+        set_={"status": RUNNING, "attempts": 1, "locked_at": now, "last_error": None, "updated_at": now},
+        where=(CoachingJob.status != RUNNING) | (CoachingJob.locked_at < stale),
+    ).returning(CoachingJob.id)
+    job_id = (await db.execute(stmt)).scalar()
+    await db.commit()
+    return job_id
+
+
+async def wait_for_claim(db: AsyncSession, job_id: UUID, timeout: float) -> bool:
+    """Poll a pending job until something claims it; returns False if it is still pending after ``timeout``."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job_status = (await db.execute(select(CoachingJob.status).where(CoachingJob.id == job_id))).scalar()
+        await db.commit()
+        if job_status != PENDING:
+            return True
+        if asyncio.get_running_loop().time() >= deadline:
+            return False
+        await asyncio.sleep(CLAIM_POLL_SECONDS)
+
+
+async def wait_for_job(db: AsyncSession, user_id: UUID, section: str, insight_date, timeout: float) -> Optional[str]:
+    """Poll a section's job until it leaves pending/running; returns its final status, or None on timeout."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job_status = (await db.execute(select(CoachingJob.status).where(
+            CoachingJob.user_id == user_id,
+            CoachingJob.insight_date == insight_date,
+            CoachingJob.section == section,
+        ))).scalar()
+        await db.commit()
+        if job_status not in (PENDING, RUNNING):
+            return job_status
+        if asyncio.get_running_loop().time() >= deadline:
+            return None
+        await asyncio.sleep(app_settings.COACHING_WORKER_POLL_SECONDS)
+
+
+async def mark_done(db: AsyncSession, job_id: UUID) -> None:
+    """Mark a job finished inside the caller's transaction."""
+    await db.execute(
+        update(CoachingJob).where(CoachingJob.id == job_id).values(
+            status=DONE, locked_at=None, last_error=None, updated_at=datetime.now(timezone.utc)
+        )
+    )
+
+
+async def release(job_id: UUID, error: Optional[str] = None) -> None:
+    """Hand an unfinished job back to the queue so a worker completes it."""
+    await _finish(job_id, status=PENDING, last_error=error)
+
+
+# ===== WORKER =====
+
+async def claim_jobs(db: AsyncSession, limit: int) -> List[CoachingJob]:
+    """Mark up to ``limit`` due jobs as running and return them."""
+    due = select(CoachingJob.id).where(
+        CoachingJob.status == PENDING,
+        CoachingJob.run_after <= datetime.now(timezone.utc),
+    ).order_by(CoachingJob.run_after).limit(limit).with_for_update(skip_locked=True)
+    claimed = (await db.execute(
+        update(CoachingJob)
+        .where(CoachingJob.id.in_(due.scalar_subquery()))
+        .values(
+            status=RUNNING,
+            locked_at=datetime.now(timezone.utc),
+            attempts=CoachingJob.attempts + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(CoachingJob)
+        .execution_options(synchronize_session=False)
+    )).scalars().all()
+    await db.commit()
+    return list(claimed)
+
+
+async def requeue_stale(db: AsyncSession) -> int:
+    """Return jobs whose worker died mid-run to the queue."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=app_settings.COACHING_JOB_LOCK_SECONDS)
+    result = await db.execute(
+        update(CoachingJob)
+        .where(CoachingJob.status == RUNNING, CoachingJob.locked_at < cutoff)
+        .values(status=PENDING, locked_at=None, updated_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def _finish(job_id: UUID, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(CoachingJob).where(CoachingJob.id == job_id).values(
+                locked_at=None, updated_at=datetime.now(timezone.utc), **values
+            )
+        )
+        await db.commit()
+
+
+async def run_job(job: CoachingJob, llm: Optional[LLMClient] = None) -> bool:
+    """
+    Generate the coaching for one claimed job in its own session.
+
+    Failures are retried with exponential backoff up to
+    COACHING_JOB_MAX_ATTEMPTS, then the job is marked failed. Returns
+    whether the job finished.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            user_settings = (await db.execute(select(UserSettings).where(
+                UserSettings.user_id == job.user_id
+            ))).scalars().first()
+            coach_type = user_settings.coach_type if user_settings else "old_school"
+
+            # A request may have generated it already (or the coach changed since queueing)
+            existing = (await db.execute(select(CoachInsight.id).where(
+                CoachInsight.user_id == job.user_id,
+                CoachInsight.insight_date == job.insight_date,
+                CoachInsight.section == job.section,
+                CoachInsight.coach_type == coach_type,
+            ))).first()
+            if not existing:
+                await coaching.generate_section(
+                    job.section, job.user_id, user_settings, db, job.insight_date, llm,
+                    replica=job.source == PREGENERATE,
+                )
+            await mark_done(db, job.id)
+            await db.commit()
+        return True
+    except Exception as e:
+        logger.warning(f"Coaching job {job.id} failed (attempt {job.attempts}): {type(e).__name__}: {e}")
+        if job.attempts >= app_settings.COACHING_JOB_MAX_ATTEMPTS:
+            await _finish(job.id, status=FAILED, last_error=str(e))
+        else:
+            backoff = app_settings.COACHING_JOB_RETRY_SECONDS * 2 ** (job.attempts - 1)
+            await _finish(
+                job.id,
+                status=PENDING,
+                last_error=str(e),
+                run_after=datetime.now(timezone.utc) + timedelta(seconds=backoff),
+            )
+        return False
+
+
+async def run_due_jobs(limit: int, llm: Optional[LLMClient] = None) -> int:
+    """Claim and run up to ``limit`` due jobs concurrently. Returns how many were claimed."""
+    async with AsyncSessionLocal() as db:
+        jobs = await claim_jobs(db, limit)
+    if jobs:
+        await asyncio.gather(*(run_job(job, llm) for job in jobs))
+    return len(jobs)
+
+
+async def schedule_pregeneration(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    """
+    Queue today's coaching for recently active users whose local time is
+    past COACHING_PREGENERATE_HOUR.
+
+    Safe to call repeatedly: existing jobs for the day are left alone.
+    Returns the number of jobs queued.
+    """
+    now = now or datetime.now(timezone.utc)
+    active_since = now.date() - timedelta(days=app_settings.COACHING_PREGENERATE_ACTIVE_DAYS)
+    timezones = (await db.execute(select(UserSettings.timezone).distinct())).scalars().all()
+
+    queued = 0
+    for tz_name in timezones:
+        try:
+            local_now = now.astimezone(ZoneInfo(tz_name))
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+        if local_now.hour < app_settings.COACHING_PREGENERATE_HOUR:
+            continue
+
+        active_users = select(UserActivityDay.user_id).where(
+            UserActivityDay.activity_date >= active_since,
+        ).distinct().subquery()
+        for section in coaching.SECTIONS:
+            # Column defaults are Python-side, so the SELECT supplies every value
+            users = select(
+                func.gen_random_uuid(),
+                UserSettings.user_id,
+                literal(section),
+                literal(local_now.date()),
+                literal(PENDING),
+                literal(PREGENERATE),
+                literal(0),
+                literal(now),
+                literal(now),
+                literal(now),
+            ).join(active_users, active_users.c.user_id == UserSettings.user_id).where(
+                UserSettings.timezone == tz_name,
+            )
+            result = await db.execute(
+                insert(CoachingJob).from_select(
+                    [
+                        "id", "user_id", "section", "insight_date", "status", "source", "attempts",
+                        "run_after", "created_at", "updated_at",
+                    ],
+                    users,
+                ).on_conflict_do_nothing(constraint="uq_coaching_jobs_user_date_section")
+            )
+            queued += result.rowcount
+    await db.commit()
+    return queued
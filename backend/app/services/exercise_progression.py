@@ -0,0 +1,158 @@
+"""Weekly per-exercise progression rollup.
+
+Keeps one ``ExerciseWeeklyStat`` row per user, exercise and ISO week with
+the top weight, best estimated 1RM (Epley and Brzycki), set count, reps
+and tonnage, so progress charts read one row per week instead of
+rescanning the set history. Rows are computed by a single grouped SQL
+aggregate; writers refresh only the (exercise, week) pairs their change
+touched. Warmup sets are left out.
+"""
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Set as SetType, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, and_, case, cast, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.workout import Workout, Set, ExerciseWeeklyStat
+
+
+# Rep-max formulas drift badly past this many reps
+E1RM_MAX_REPS = 12
+
+STAT_FIELDS = ("set_count", "total_reps", "tonnage", "top_weight", "e1rm_epley", "e1rm_brzycki")
+
+WeekKey = Tuple[UUID, date]  # (exercise_id, week_start)
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def _week_column():
+    return cast(func.date_trunc("week", Workout.workout_date), Date)
+
+
+def _stat_columns():
+    """Aggregate columns in ``STAT_FIELDS`` order."""
+    estimable = and_(Set.reps.between(1, E1RM_MAX_REPS), Set.weight > 0)
+    epley = case((Set.reps == 1, Set.weight), else_=Set.weight * (1 + Set.reps / 30.0))
+    brzycki = Set.weight * 36.0 / (37 - Set.reps)
+    return (
+        func.count(Set.id).label("set_count"),
+        func.coalesce(func.sum(Set.reps), 0).label("total_reps"),
+        func.coalesce(func.sum(Set.weight * Set.reps), 0.0).label("tonnage"),
+        func.max(Set.weight).label("top_weight"),
+        func.max(case((estimable, epley))).label("e1rm_epley"),
+        func.max(case((estimable, brzycki))).label("e1rm_brzycki"),
+    )
+
+
+def _weekly_stats_select(leading_columns, user_id: Optional[UUID] = None, weeks: Optional[Iterable[WeekKey]] = None):
+    """Completed working sets from non-deleted workouts, grouped by user, exercise and week."""
+    week = _week_column()
+    stmt = select(
+        *leading_columns,
+        Workout.user_id,
+        Set.exercise_id,
+        week.label("week_start"),
+        *_stat_columns(),
+    ).join(Workout, Set.workout_id == Workout.id).where(
+        Workout.deleted_at.is_(None),
+        Set.is_completed == True,
+        Set.set_type != "warmup",
+    ).group_by(Workout.user_id, Set.exercise_id, week)
+    if user_id is not None:
+        stmt = stmt.where(Workout.user_id == user_id)
+    if weeks is not None:
+        stmt = stmt.where(tuple_(Set.exercise_id, week).in_(list(weeks)))
+    return stmt
+
+
+def refresh_weeks(db: Session, user_id: UUID, weeks: Iterable[WeekKey]) -> None:
+    """
+    Recompute the given (exercise, week) rows from the set history.
+
+    Weeks left without any qualifying set lose their row. Runs inside the
+    caller's transaction.
+    """
+    weeks = set(weeks)
+    if not weeks:
+        return
+
+    db.flush()
+    computed = {
+        (row.exercise_id, row.week_start): row
+        for row in db.execute(_weekly_stats_select((), user_id, weeks)).all()
+    }
+    existing = {
+        (stat.exercise_id, stat.week_start): stat for stat in db.query(ExerciseWeeklyStat).filter(
+            ExerciseWeeklyStat.user_id == user_id,
+            tuple_(ExerciseWeeklyStat.exercise_id, ExerciseWeeklyStat.week_start).in_(list(weeks)),
+        ).all()
+    }
+
+    for key in weeks:
+        row = computed.get(key)
+        stat = existing.get(key)
+        if row is None:
+            if stat is not None:
+                db.delete(stat)
+            continue
+        if stat is None:
+            stat = ExerciseWeeklyStat(user_id=user_id, exercise_id=key[0], week_start=key[1])
+            db.add(stat)
+        for field in STAT_FIELDS:
+            setattr(stat, field, getattr(row, field))
+
+
+def weeks_for(workout: Workout, exercise_ids: Iterable[UUID]) -> SetType[WeekKey]:
+    """The rollup rows a change to these exercises in this workout touches."""
+    week = week_start(workout.workout_date)
+    return {(exercise_id, week) for exercise_id in exercise_ids}
+
+
+def forget_workout(db: Session, user_id: UUID, workout: Workout) -> None:
+    """Refresh every week a workout that is going away contributed to."""
+    exercise_ids = [
+        exercise_id for (exercise_id,) in db.query(Set.exercise_id).filter(
+            Set.workout_id == workout.id,
+            Set.is_completed == True,
+        ).distinct().all()
+    ]
+    refresh_weeks(db, user_id, weeks_for(workout, exercise_ids))
+
+
+def get_progression(
+    db: Session, user_id: UUID, exercise_id: UUID, since: Optional[date] = None
+) -> List[ExerciseWeeklyStat]:
+    """One exercise's weekly rows, oldest first."""
+    q = db.query(ExerciseWeeklyStat).filter(
+        ExerciseWeeklyStat.user_id == user_id,
+        ExerciseWeeklyStat.exercise_id == exercise_id,
+    )
+    if since is not None:
+        q = q.filter(ExerciseWeeklyStat.week_start >= week_start(since))
+    return q.order_by(ExerciseWeeklyStat.week_start).all()
+
+
+def rebuild_exercise_progression(db: Session, user_id: Optional[UUID] = None) -> int:
+    """
+    Rebuild the rollup from the full set history with one INSERT ... SELECT.
+
+    Returns the number of rows written.
+    """
+    delete_stmt = delete(ExerciseWeeklyStat)
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(ExerciseWeeklyStat.user_id == user_id)
+    db.execute(delete_stmt)
+
+    # Column defaults are Python-side, so the SELECT supplies id and updated_at
+    rows = _weekly_stats_select((func.gen_random_uuid(), func.now()), user_id)
+    result = db.execute(insert(ExerciseWeeklyStat).from_select(
+        ["id", "updated_at", "user_id", "exercise_id", "week_start", *STAT_FIELDS],
+        rows,
+    ))
+    return result.rowcount
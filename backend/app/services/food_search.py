@@ -0,0 +1,93 @@
+"""Ranked food search.
+
+Backed by two indexes on non-deleted foods: a pg_trgm GIN index on
+``name`` for substring and fuzzy matches, and a ``lower(name)
+text_pattern_ops`` btree for short type-ahead prefixes that are too short
+to produce trigrams. Results favour foods the user logged recently.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, literal, or_
+from sqlalchemy.orm import Session
+
+from ..models.nutrition import Food, Meal, MealItem
+
+
+# Terms shorter than this have no full trigram and use the prefix index
+MIN_TRIGRAM_LENGTH = 3
+RECENT_DAYS = 90
+RECENT_BOOST = 0.5
+PREFIX_BOOST = 0.3
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _recent_foods(db: Session, user_id: UUID, today: date):
+    """Subquery of the user's recently logged food ids with their use counts."""
+    return db.query(
+        MealItem.food_id,
+        func.count(MealItem.id).label("uses"),
+    ).join(Meal, MealItem.meal_id == Meal.id).filter(
+        Meal.user_id == user_id,
+        Meal.deleted_at.is_(None),
+        Meal.meal_date >= today - timedelta(days=RECENT_DAYS),
+    ).group_by(MealItem.food_id).subquery()
+
+
+def search_foods(
+    db: Session,
+    user_id: UUID,
+    term: str,
+    skip: int = 0,
+    limit: int = 100,
+    today: Optional[date] = None,
+) -> List[Food]:
+    """
+    Search system foods and the user's custom foods by name.
+
+    Short terms match name prefixes; longer terms match substrings and
+    trigram-similar names, ranked by similarity. Either way, foods the user
+    logged in the last RECENT_DAYS days rank first.
+    """
+    term = term.strip()
+    if not term:
+        return []
+    today = today or date.today()
+
+    recent = _recent_foods(db, user_id, today)
+    lowered = func.lower(Food.name)
+    prefix = lowered.like(f"{_escape_like(term.lower())}%", escape="\\")
+    recent_score = case(
+        (recent.c.uses.isnot(None), RECENT_BOOST + func.least(recent.c.uses, 10) * 0.02),
+        else_=0,
+    )
+
+    query = db.query(Food).outerjoin(recent, recent.c.food_id == Food.id).filter(
+        Food.deleted_at.is_(None),
+        or_(
+            Food.is_custom == False,
+            and_(Food.is_custom == True, Food.user_id == user_id),
+        ),
+    )
+
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        query = query.filter(prefix).order_by(
+            recent_score.desc(),
+            func.length(Food.name),
+            Food.name,
+        )
+    else:
+        similarity = func.similarity(Food.name, term)
+        query = query.filter(or_(
+            Food.name.ilike(f"%{_escape_like(term)}%", escape="\\"),
+            Food.name.op("%")(term),
+        )).order_by(
+            (similarity + case((prefix, PREFIX_BOOST), else_=literal(0)) + recent_score).desc(),
+            Food.name,
+        )
+
+    return query.offset(skip).limit(limit).all()
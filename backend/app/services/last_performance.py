@@ -0,0 +1,157 @@
+"""Previous-performance lookups for the active workout screen.
+
+``LastExercisePerformance`` remembers, per user and exercise, the most
+recent completed workout that logged it. ``complete_workout`` advances it;
+changes that can move it backwards (deleting a workout, swapping or
+removing sets in a completed one) recompute the affected exercises with
+one ``DISTINCT ON (exercise_id)`` query. ``previous_performances`` answers
+for every exercise of a workout at once: cached rows older than the
+workout are used directly, the rest fall back to the same query.
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.workout import Workout, Set, LastExercisePerformance
+
+
+PREVIOUS_SET_LIMIT = 10
+
+Previous = Tuple[UUID, date]  # (workout_id, workout_date)
+
+
+def _latest_workouts(
+    db: Session, user_id: UUID, exercise_ids: Iterable[UUID], before: Optional[date] = None
+) -> Dict[UUID, Previous]:
+    """Most recent completed workout logging each exercise, optionally before a date."""
+    stmt = select(Set.exercise_id, Workout.id, Workout.workout_date).join(
+        Workout, Set.workout_id == Workout.id
+    ).where(
+        Workout.user_id == user_id,
+        Workout.deleted_at.is_(None),
+        Workout.completed_at.isnot(None),
+        Set.exercise_id.in_(list(exercise_ids)),
+    ).distinct(Set.exercise_id).order_by(
+        Set.exercise_id, Workout.workout_date.desc(), Workout.completed_at.desc()
+    )
+    if before is not None:
+        stmt = stmt.where(Workout.workout_date < before)
+    return {exercise_id: (workout_id, day) for exercise_id, workout_id, day in db.execute(stmt).all()}
+
+
+def record_workout(db: Session, user_id: UUID, workout: Workout) -> None:
+    """Advance the cache to a just-completed workout for each exercise it logged."""
+    exercise_ids = [
+        exercise_id for (exercise_id,) in db.query(Set.exercise_id).filter(
+            Set.workout_id == workout.id,
+        ).distinct().all()
+    ]
+    if not exercise_ids:
+        return
+
+    stmt = insert(LastExercisePerformance).values([
+        {
+            "user_id": user_id,
+            "exercise_id": exercise_id,
+            "workout_id": workout.id,
+            "workout_date": workout.workout_date,
+        }
+        for exercise_id in exercise_ids
+    ])
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_last_exercise_performances_user_exercise",
+        set_={
+            "workout_id": stmt.excluded.workout_id,
+            "workout_date": stmt.excluded.workout_date,
+            "updated_at": func.now(),
+        },
+        # Completing a back-dated workout must not replace a newer one
+        where=LastExercisePerformance.workout_date <= stmt.excluded.workout_date,
+    )
+    db.execute(stmt)
+
+
+def refresh(db: Session, user_id: UUID, exercise_ids: Iterable[UUID]) -> None:
+    """Recompute the cache for exercises whose history changed, inside the caller's transaction."""
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return
+
+    db.flush()
+    latest = _latest_workouts(db, user_id, exercise_ids)
+    rows = {
+        row.exercise_id: row for row in db.query(LastExercisePerformance).filter(
+            LastExercisePerformance.user_id == user_id,
+            LastExercisePerformance.exercise_id.in_(exercise_ids),
+        ).all()
+    }
+    for exercise_id in exercise_ids:
+        row = rows.get(exercise_id)
+        if exercise_id not in latest:
+            if row is not None:
+                db.delete(row)
+            continue
+        if row is None:
+            row = LastExercisePerformance(user_id=user_id, exercise_id=exercise_id)
+            db.add(row)
+        row.workout_id, row.workout_date = latest[exercise_id]
+
+
+def forget_workout(db: Session, user_id: UUID, workout: Workout) -> None:
+    """Recompute every exercise whose cached workout is going away."""
+    exercise_ids = [
+        exercise_id for (exercise_id,) in db.query(LastExercisePerformance.exercise_id).filter(
+            LastExercisePerformance.user_id == user_id,
+            LastExercisePerformance.workout_id == workout.id,
+        ).all()
+    ]
+    refresh(db, user_id, exercise_ids)
+
+
+def previous_performances(
+    db: Session, user_id: UUID, workout: Workout, exercise_ids: Iterable[UUID]
+) -> Dict[UUID, Tuple[date, List[Set]]]:
+    """
+    Sets from the latest completed workout before ``workout`` for each exercise.
+
+    Returns {exercise_id: (workout_date, sets)} for exercises that have
+    one, with up to PREVIOUS_SET_LIMIT sets each ordered by set number.
+    Uses at most three queries however many exercises are asked for.
+    """
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return {}
+
+    previous: Dict[UUID, Previous] = {}
+    for row in db.query(LastExercisePerformance).filter(
+        LastExercisePerformance.user_id == user_id,
+        LastExercisePerformance.exercise_id.in_(exercise_ids),
+    ).all():
+        # The cache holds the latest overall; it only answers when that is older than this workout
+        if row.workout_date < workout.workout_date:
+            previous[row.exercise_id] = (row.workout_id, row.workout_date)
+
+    misses = exercise_ids - previous.keys()
+    if misses:
+        previous.update(_latest_workouts(db, user_id, misses, before=workout.workout_date))
+    if not previous:
+        return {}
+
+    sets_by_exercise: Dict[UUID, List[Set]] = {}
+    for set_obj in db.query(Set).filter(
+        tuple_(Set.exercise_id, Set.workout_id).in_(
+            [(exercise_id, workout_id) for exercise_id, (workout_id, _) in previous.items()]
+        )
+    ).order_by(Set.exercise_id, Set.set_number).all():
+        sets = sets_by_exercise.setdefault(set_obj.exercise_id, [])
+        if len(sets) < PREVIOUS_SET_LIMIT:
+            sets.append(set_obj)
+
+    return {
+        exercise_id: (day, sets_by_exercise.get(exercise_id, []))
+        for exercise_id, (_, day) in previous.items()
+    }
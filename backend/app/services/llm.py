@@ -0,0 +1,319 @@
+"""Long-lived LLM client for the AI coach.
+
+One ``LLMClient`` per process, started by the app lifespan (or the coaching
+worker). A request passes through, in order:
+
+- a content-addressed cache keyed on (coach_type, section, prompt hash),
+  so regenerating from unchanged data costs nothing; concurrent identical
+  prompts share one upstream call;
+- a semaphore capping in-flight upstream calls;
+- a token bucket capping the request rate;
+- retries with jittered exponential backoff on 429 and 5xx.
+
+``stream`` yields the completion as it is generated; it retries only
+before the first chunk and caches the finished text under the same key.
+
+The provider is pluggable: ``GeminiProvider`` in production,
+``FakeProvider`` for test scripts and local runs without an API key.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from typing import AsyncIterator, Dict, Hashable, Optional, Protocol, Tuple
+
+from ..config import settings
+from ..core.response_cache import AsyncResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """
+    An upstream LLM call failed; ``status`` is the HTTP status when known.
+
+    Retried only on RETRYABLE_STATUSES and on ``transient`` transport
+    failures (timeouts, dropped connections).
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, transient: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.transient = transient
+
+    @property
+    def retryable(self) -> bool:
+        return self.transient or self.status in RETRYABLE_STATUSES
+
+
+class LLMNotConfigured(LLMError):
+    """No provider credentials are configured."""
+
+    @property
+    def retryable(self) -> bool:
+        return False
+
+
+def _transport_errors() -> tuple:
+    """Exception types for a request that never got an answer (the SDK's HTTP stacks)."""
+    import httpx
+    errors = [TimeoutError, ConnectionError, httpx.TransportError]
+    try:
+        import requests
+        errors += [requests.ConnectionError, requests.Timeout]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+class LLMProvider(Protocol):
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        ...
+
+    def stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        ...
+
+
+class GeminiProvider:
+    """Google Gemini via one reused ``genai.Client``, created on the first call (the SDK is slow to import)."""
+
+    def __init__(self, api_key: str, model: str):
+        self.model = model
+        self._api_key = api_key
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not self._api_key:
+                raise LLMNotConfigured("GEMINI_API_KEY is missing")
+            from google import genai
+            self._client = genai.Client(api_key=self._api_key)
+        return self._client
+
+    def _config(self, system_prompt: str):
+        from google.genai import types
+        return types.GenerateContentConfig(system_instruction=system_prompt)
+
+    @staticmethod
+    def _error(e: Exception) -> LLMError:
+        """Wrap an SDK failure; anything that is not an HTTP status or transport error is final."""
+        status = getattr(e, "code", None)
+        if not isinstance(status, int) and "resource_exhausted" in str(e).lower():
+            status = 429
+        return LLMError(
+            f"{type(e).__name__}: {e}",
+            status if isinstance(status, int) else None,
+            transient=isinstance(e, _transport_errors()),
+        )
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        client = self._get_client()
+        try:
+            response = await client.aio.models.generate_content(
+                model=self.model,
+                contents=user_prompt,
+                config=self._config(system_prompt),
+            )
+        except Exception as e:
+            raise self._error(e) from e
+        return (response.text or "").strip()
+
+    async def stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        client = self._get_client()
+        try:
+            chunks = await client.aio.models.generate_content_stream(
+                model=self.model,
+                contents=user_prompt,
+                config=self._config(system_prompt),
+            )
+            async for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise self._error(e) from e
+
+
+class FakeProvider:
+    """Canned replies in the daily coaching format; counts calls."""
+
+    REPLY = (
+        "[SUMMARY]\nSteady week. Keep showing up.\n\n"
+        "[WORKOUT_TIPS]\n- Add one set to your main lift.\n\n"
+        "[NUTRITION_TIPS]\n- Hit your protein target daily."
+    )
+
+    def __init__(self, delay_seconds: float = 0.05):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay_seconds)
+        return self.REPLY
+
+    async def stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        self.calls += 1
+        # Small uneven chunks, so section markers get split across them
+        for start in range(0, len(self.REPLY), 7):
+            await asyncio.sleep(self.delay_seconds / 10)
+            yield self.REPLY[start:start + 7]
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LLMClient:
+    """Rate-limited, retrying, caching front for an ``LLMProvider``."""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int,
+        requests_per_minute: float,
+        max_retries: int,
+        retry_base_seconds: float,
+        cache_max_entries: int,
+        cache_ttl_seconds: float,
+    ):
+        self.provider = provider
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self._semaphore = asyncio.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(requests_per_minute / 60, max(1, min(max_concurrency, requests_per_minute)))
+        self.cache = AsyncResponseCache("llm", max_entries=cache_max_entries, ttl_seconds=cache_ttl_seconds)
+        self.upstream_calls = 0
+        self.retries = 0
+
+    @staticmethod
+    def cache_key(system_prompt: str, user_prompt: str, scope: Tuple[Hashable, ...] = ()) -> tuple:
+        digest = hashlib.sha256(f"{system_prompt}\0{user_prompt}".encode()).hexdigest()
+        return (*scope, digest)
+
+    async def generate(self, system_prompt: str, user_prompt: str, scope: Tuple[Hashable, ...] = ()) -> str:
+        """
+        Completion for the prompts, from cache when the same prompt was seen.
+
+        ``scope`` (e.g. ``(coach_type, section)``) prefixes the cache key.
+        Raises LLMError once retries are exhausted; failures are not cached.
+        """
+        return await self.cache.get_or_fetch(
+            self.cache_key(system_prompt, user_prompt, scope),
+            lambda: self._generate_with_retries(system_prompt, user_prompt),
+        )
+
+    async def _generate_with_retries(self, system_prompt: str, user_prompt: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    await self._bucket.acquire()
+                    self.upstream_calls += 1
+                    return await self.provider.generate(system_prompt, user_prompt)
+            except LLMError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                # Full jitter keeps retries from a burst of failures from realigning
+                delay = random.uniform(0, self.retry_base_seconds * 2 ** attempt)
+                logger.warning(f"LLM call failed ({e.status}), retrying in {delay:.1f}s: {e}")
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def stream(
+        self, system_prompt: str, user_prompt: str, scope: Tuple[Hashable, ...] = ()
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion in chunks as the provider produces them.
+
+        A cached completion is yielded whole. Retries happen only before
+        the first chunk; once text has been sent, a failure propagates.
+        """
+        key = self.cache_key(system_prompt, user_prompt, scope)
+        cached, state = self.cache.get(key)
+        if state != "miss":
+            self.cache.hits += 1
+            yield cached
+            return
+
+        attempt = 0
+        parts = []
+        while True:
+            try:
+                async with self._semaphore:
+                    await self._bucket.acquire()
+                    self.upstream_calls += 1
+                    async for chunk in self.provider.stream(system_prompt, user_prompt):
+                        parts.append(chunk)
+                        yield chunk
+                break
+            except LLMError as e:
+                if parts or not e.retryable or attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, self.retry_base_seconds * 2 ** attempt)
+                logger.warning(f"LLM stream failed ({e.status}), retrying in {delay:.1f}s: {e}")
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+        self.cache.put(key, "".join(parts).strip())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "retries": self.retries,
+            **{f"cache_{name}": value for name, value in self.cache.stats().items()},
+        }
+
+
+# ===== CLIENT LIFECYCLE =====
+
+_client: Optional[LLMClient] = None
+
+
+def start_client(provider: Optional[LLMProvider] = None) -> LLMClient:
+    """Create the process-wide client (Gemini unless a provider is given)."""
+    global _client
+    if _client is None:
+        _client = LLMClient(
+            provider or GeminiProvider(settings.GEMINI_API_KEY, settings.LLM_MODEL),
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+            cache_max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            cache_ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+    return _client
+
+
+def stop_client() -> None:
+    global _client
+    _client = None
+
+
+def get_client() -> LLMClient:
+    if _client is None:
+        raise RuntimeError("LLM client is not started; it is created in the app lifespan")
+    return _client
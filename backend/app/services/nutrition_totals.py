@@ -0,0 +1,186 @@
+"""Daily nutrition rollup.
+
+Keeps one ``DailyNutritionTotal`` row per user per day holding the sums of
+macro snapshot * servings over that day's non-deleted meals, so summary
+and average reads touch a handful of rows instead of re-aggregating meal
+items. Writers apply signed deltas with an atomic upsert; the row is
+dropped once the day has no meals left.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.nutrition import Meal, MealItem, DailyNutritionTotal
+
+
+MACROS = ("calories", "protein", "carbs", "fat")
+
+
+def _item_macros(item: MealItem, servings: Optional[float] = None) -> Dict[str, float]:
+    servings = item.servings if servings is None else servings
+    return {
+        "calories": item.calories_snapshot * servings,
+        "protein": item.protein_snapshot * servings,
+        "carbs": item.carbs_snapshot * servings,
+        "fat": item.fat_snapshot * servings,
+    }
+
+
+def _apply_delta(
+    db: Session,
+    user_id: UUID,
+    day: date,
+    macros: Dict[str, float],
+    meals: int = 0,
+    items: int = 0,
+) -> None:
+    """Add signed macro, meal and item deltas to one day's row."""
+    values = {field: macros.get(field, 0) for field in MACROS}
+    stmt = insert(DailyNutritionTotal).values(
+        user_id=user_id,
+        total_date=day,
+        meal_count=meals,
+        item_count=items,
+        **values,
+    )
+    table = DailyNutritionTotal.__table__
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_daily_nutrition_totals_user_date",
+        set_={
+            **{field: table.c[field] + stmt.excluded[field] for field in MACROS},
+            "meal_count": table.c.meal_count + stmt.excluded.meal_count,
+            "item_count": table.c.item_count + stmt.excluded.item_count,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+    if meals < 0:
+        db.query(DailyNutritionTotal).filter(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.total_date == day,
+            DailyNutritionTotal.meal_count <= 0,
+        ).delete(synchronize_session=False)
+
+
+def _negate(macros: Dict[str, float]) -> Dict[str, float]:
+    return {field: -value for field, value in macros.items()}
+
+
+def add_meal(db: Session, meal: Meal, items: List[MealItem]) -> None:
+    """Count a newly created (or copied) meal and its items."""
+    totals = {field: 0.0 for field in MACROS}
+    for item in items:
+        for field, value in _item_macros(item).items():
+            totals[field] += value
+    _apply_delta(db, meal.user_id, meal.meal_date, totals, meals=1, items=len(items))
+
+
+def remove_meal(db: Session, meal: Meal) -> None:
+    """Subtract a meal that is being deleted, using its stored items."""
+    row = db.query(
+        func.count(MealItem.id).label("items"),
+        *(func.coalesce(func.sum(getattr(MealItem, f"{field}_snapshot") * MealItem.servings), 0).label(field)
+          for field in MACROS),
+    ).filter(MealItem.meal_id == meal.id).one()
+    macros = {field: getattr(row, field) for field in MACROS}
+    _apply_delta(db, meal.user_id, meal.meal_date, _negate(macros), meals=-1, items=-row.items)
+
+
+def add_item(db: Session, meal: Meal, item: MealItem) -> None:
+    _apply_delta(db, meal.user_id, meal.meal_date, _item_macros(item), items=1)
+
+
+def remove_item(db: Session, meal: Meal, item: MealItem) -> None:
+    _apply_delta(db, meal.user_id, meal.meal_date, _negate(_item_macros(item)), items=-1)
+
+
+def change_servings(db: Session, meal: Meal, item: MealItem, old_servings: float) -> None:
+    """Apply the difference between an item's new and previous servings."""
+    new = _item_macros(item)
+    old = _item_macros(item, old_servings)
+    _apply_delta(db, meal.user_id, meal.meal_date, {field: new[field] - old[field] for field in MACROS})
+
+
+def _raw_totals_query(db: Session, user_id: Optional[UUID] = None):
+    """Per-day totals aggregated from the raw meal and item rows."""
+    q = db.query(
+        Meal.user_id,
+        Meal.meal_date,
+        func.count(func.distinct(Meal.id)).label("meal_count"),
+        func.count(MealItem.id).label("item_count"),
+        *(func.coalesce(func.sum(getattr(MealItem, f"{field}_snapshot") * MealItem.servings), 0).label(field)
+          for field in MACROS),
+    ).outerjoin(MealItem, MealItem.meal_id == Meal.id).filter(
+        Meal.deleted_at.is_(None),
+    )
+    if user_id is not None:
+        q = q.filter(Meal.user_id == user_id)
+    return q.group_by(Meal.user_id, Meal.meal_date)
+
+
+def rebuild_daily_totals(db: Session, user_id: Optional[UUID] = None) -> int:
+    """Replace the rollup with totals recomputed from raw rows. Returns rows written."""
+    rows = _raw_totals_query(db, user_id).all()
+
+    delete_q = db.query(DailyNutritionTotal)
+    if user_id is not None:
+        delete_q = delete_q.filter(DailyNutritionTotal.user_id == user_id)
+    delete_q.delete(synchronize_session=False)
+
+    db.bulk_insert_mappings(DailyNutritionTotal, [
+        {
+            "user_id": row.user_id,
+            "total_date": row.meal_date,
+            "meal_count": row.meal_count,
+            "item_count": row.item_count,
+            **{field: float(getattr(row, field)) for field in MACROS},
+        }
+        for row in rows
+    ])
+    return len(rows)
+
+
+def verify_daily_totals(
+    db: Session,
+    user_id: Optional[UUID] = None,
+    tolerance: float = 0.01,
+) -> List[Tuple[UUID, date, str]]:
+    """
+    Compare the rollup with raw rows.
+
+    Returns (user_id, date, description) for every day that is missing,
+    extra, or off by more than ``tolerance`` on any macro.
+    """
+    expected = {(row.user_id, row.meal_date): row for row in _raw_totals_query(db, user_id).all()}
+
+    stored_q = db.query(DailyNutritionTotal)
+    if user_id is not None:
+        stored_q = stored_q.filter(DailyNutritionTotal.user_id == user_id)
+    stored = {(row.user_id, row.total_date): row for row in stored_q.all()}
+
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys(), key=lambda k: (str(k[0]), k[1])):
+        raw, rollup = expected.get(key), stored.get(key)
+        if rollup is None:
+            mismatches.append((*key, "missing from rollup"))
+            continue
+        if raw is None:
+            mismatches.append((*key, "no meals on this day"))
+            continue
+        diffs = [
+            f"{field} {getattr(rollup, field)} != {getattr(raw, field)}"
+            for field in ("meal_count", "item_count")
+            if getattr(rollup, field) != getattr(raw, field)
+        ] + [
+            f"{field} {getattr(rollup, field):.2f} != {float(getattr(raw, field)):.2f}"
+            for field in MACROS
+            if abs(getattr(rollup, field) - float(getattr(raw, field))) > tolerance
+        ]
+        if diffs:
+            mismatches.append((*key, ", ".join(diffs)))
+    return mismatches
@@ -0,0 +1,201 @@
+"""Offline import of an Open Food Facts dump into ``food_catalog``.
+
+The dump (the JSONL product export, or the tab-separated CSV export,
+either optionally gzipped) flows through generators: raw products are
+read one line at a time, normalized per serving with the same
+``normalize_product`` the live proxy uses, and loaded in batches. Each
+batch is COPYed into a temporary staging table and upserted by barcode
+in one statement, then committed. Memory stays constant however large
+the dump is, and an interrupted import can simply be rerun.
+"""
+import csv
+import gzip
+import io
+import json
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .open_food_facts import normalize_product
+
+
+COLUMNS = ("barcode", "name", "brands", "serving_size", "calories", "protein", "carbs", "fat", "image_url")
+NUTRIMENT_FIELDS = ("energy-kcal_100g", "proteins_100g", "carbohydrates_100g", "fat_100g")
+
+# Matches the food_catalog column sizes
+MAX_BARCODE = 64
+MAX_NAME = 255
+MAX_SERVING_SIZE = 100
+MAX_MACRO = 100_000  # Dumps contain typos like 1e9 kcal; anything above this is dropped
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    skipped: int = 0  # Unparseable, unnamed, without calories, or out of range
+    loaded: int = 0  # Rows inserted or refreshed
+
+
+# ===== READING =====
+
+def _open(path: str):
+    return gzip.open(path, "rt", encoding="utf-8", newline="") if path.endswith(".gz") else open(
+        path, encoding="utf-8", newline=""
+    )
+
+
+def read_jsonl(path: str, stats: ImportStats) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(barcode, product) for each line of a JSONL export."""
+    with _open(path) as f:
+        for line in f:
+            stats.read += 1
+            try:
+                product = json.loads(line)
+            except ValueError:
+                stats.skipped += 1
+                continue
+            yield str(product.get("code") or ""), product
+
+
+def read_csv(path: str, stats: ImportStats) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(barcode, product) for each row of a CSV export, reshaped like the JSON API's products."""
+    # Some export fields (ingredients, categories) exceed csv's default 128 KB limit
+    csv.field_size_limit(sys.maxsize)
+    with _open(path) as f:
+        header = f.readline()
+        delimiter = "\t" if "\t" in header else ","
+        fields = next(csv.reader([header], delimiter=delimiter))
+        for row in csv.DictReader(f, fieldnames=fields, delimiter=delimiter, quoting=csv.QUOTE_NONE):
+            stats.read += 1
+            yield row.get("code") or "", {
+                "product_name": row.get("product_name"),
+                "brands": row.get("brands"),
+                "serving_size": row.get("serving_size"),
+                "serving_quantity": row.get("serving_quantity"),
+                "image_url": row.get("image_url"),
+                "nutriments": {field: row.get(field) for field in NUTRIMENT_FIELDS},
+            }
+
+
+def read_dump(path: str, stats: ImportStats) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Pick the reader from the file name (.jsonl/.json vs .csv/.tsv, optionally .gz)."""
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".json")):
+        return read_jsonl(path, stats)
+    if name.endswith((".csv", ".tsv")):
+        return read_csv(path, stats)
+    raise ValueError(f"Unrecognised dump format: {path} (expected .jsonl or .csv, optionally .gz)")
+
+
+# ===== NORMALIZATION =====
+
+def normalized_rows(products: Iterable[Tuple[str, Dict[str, Any]]], stats: ImportStats) -> Iterator[tuple]:
+    """food_catalog rows for the products worth keeping."""
+    for barcode, product in products:
+        barcode = barcode.strip()
+        nutriments = product.get("nutriments") or {}
+        if (
+            not barcode
+            or len(barcode) > MAX_BARCODE
+            or not product.get("product_name")
+            or nutriments.get("energy-kcal_100g") in (None, "")
+        ):
+            stats.skipped += 1
+            continue
+        try:
+            food = normalize_product(product, barcode)
+        except (ValueError, TypeError, OverflowError):  # Non-numeric, NaN or infinite nutriments
+            stats.skipped += 1
+            continue
+        macros = (food["calories"], food["protein"], food["carbs"], food["fat"])
+        if any(value < 0 or value > MAX_MACRO for value in macros):
+            stats.skipped += 1
+            continue
+        yield (
+            barcode,
+            str(food["name"])[:MAX_NAME],
+            food["brands"] or None,
+            str(food["serving_size"])[:MAX_SERVING_SIZE],
+            *macros,
+            food["image_url"] or None,
+        )
+
+
+# ===== LOADING =====
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_rows(
+    conn: Connection,
+    rows: Iterable[tuple],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Upsert rows into food_catalog, committing every ``batch_size`` rows.
+
+    ``conn`` must stay on one database connection (an ``engine.connect()``
+    Connection, not a Session) because the staging table is temporary.
+    ``on_batch`` receives the running total after each commit. Returns the
+    rows inserted or refreshed.
+    """
+    columns = ", ".join(COLUMNS)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+    conn.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS off_import_rows ON COMMIT DELETE ROWS AS "
+        f"SELECT {columns} FROM food_catalog WITH NO DATA"
+    ))
+    conn.commit()
+
+    loaded = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for batch in _batches(rows, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        buffer.seek(0)
+        # psycopg2's COPY needs the DBAPI cursor; it runs in this connection's transaction
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY off_import_rows ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        # A dump can repeat a barcode; DISTINCT ON keeps one per statement, as ON CONFLICT requires
+        loaded += conn.execute(text(f"""
+            INSERT INTO food_catalog ({columns}, imported_at)
+            SELECT DISTINCT ON (barcode) {columns}, now() FROM off_import_rows ORDER BY barcode
+            ON CONFLICT (barcode) DO UPDATE SET {updates}, imported_at = excluded.imported_at
+        """)).rowcount
+        conn.commit()
+        if on_batch is not None:
+            on_batch(loaded)
+    return loaded
+
+
+def import_dump(
+    conn: Connection,
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """Stream a dump file into food_catalog; returns what was read, skipped and loaded."""
+    stats = ImportStats()
+
+    def progress(loaded: int) -> None:
+        stats.loaded = loaded
+        if on_batch is not None:
+            on_batch(stats)
+
+    stats.loaded = load_rows(conn, normalized_rows(read_dump(path, stats), stats), batch_size, progress)
+    return stats
@@ -0,0 +1,283 @@
+"""Open Food Facts client.
+
+One pooled ``httpx.AsyncClient`` per app process, opened on the first
+lookup and closed by the FastAPI lifespan, so lookups reuse kept-alive TLS
+connections. The router imports this module on first use, keeping httpx
+out of cold start. Barcode and
+search results go through in-memory caches with stale-while-revalidate
+and request coalescing. Barcode lookups are also kept in the
+``food_product_cache`` table so other workers and restarts can reuse them.
+When a dump has been imported into ``food_catalog`` (see
+``app/services/off_import.py``), barcodes found there never reach upstream.
+"""
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config import settings
+from ..core.response_cache import AsyncResponseCache
+from ..database import AsyncSessionLocal
+from ..models.nutrition import FoodCatalogItem, FoodProductCache
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = "code,product_name,brands,serving_size,serving_quantity,nutriments,image_url"
+
+# Raised when upstream fails and nothing usable is cached
+UpstreamError = httpx.HTTPError
+
+_client: Optional[httpx.AsyncClient] = None
+
+barcode_cache = AsyncResponseCache(
+    "off-barcode",
+    max_entries=settings.OFF_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.OFF_BARCODE_TTL_SECONDS,
+    stale_seconds=settings.OFF_STALE_SECONDS,
+)
+search_cache = AsyncResponseCache(
+    "off-search",
+    max_entries=settings.OFF_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.OFF_SEARCH_TTL_SECONDS,
+    stale_seconds=settings.OFF_STALE_SECONDS,
+)
+
+
+# ===== CLIENT LIFECYCLE =====
+
+def _get_client() -> httpx.AsyncClient:
+    """The process's client, opened on first use (no await in between, so concurrent callers share it)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.OPEN_FOOD_FACTS_BASE_URL,
+            timeout=settings.OFF_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.OFF_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OFF_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ===== NORMALIZATION =====
+
+# Conversion factors to grams for common weight units
+_UNIT_TO_GRAMS = {
+    "g": 1.0,
+    "mg": 0.001,
+    "kg": 1000.0,
+    "oz": 28.3495,
+    "lb": 453.592,
+    "ml": 1.0,  # approximate (density ≈ 1 for most beverages)
+    "cl": 10.0,
+    "dl": 100.0,
+    "l": 1000.0,
+}
+
+
+def _parse_serving_grams(serving_size: str) -> Optional[float]:
+    """Try to extract grams from a serving_size string like '28g', '1 oz', '250 ml'."""
+    if not serving_size:
+        return None
+    # Match patterns like "28g", "1.5 oz", "250ml", "100 g"
+    match = re.search(r"(\d+(?:[.,]\d+)?)\s*(g|mg|kg|oz|lb|ml|cl|dl|l)\b", serving_size.lower())
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", "."))
+    unit = match.group(2)
+    factor = _UNIT_TO_GRAMS.get(unit)
+    if factor is None or amount <= 0:
+        return None
+    return amount * factor
+
+
+def _scale_to_serving(per_100g: float, serving_grams: Optional[float]) -> int:
+    """Scale a per-100g value to per-serving. Falls back to per-100g if parsing fails."""
+    if serving_grams is None or serving_grams <= 0:
+        return int(per_100g)
+    return int(round(per_100g * serving_grams / 100.0))
+
+
+def normalize_product(product: Dict[str, Any], barcode: str) -> Dict[str, Any]:
+    """Convert a raw Open Food Facts product into per-serving macros."""
+    nutriments = product.get("nutriments", {})
+
+    # Get serving size or default to 100g
+    serving_size = product.get("serving_size", "100g")
+    if not serving_size:
+        serving_size = "100g"
+
+    # Extract per-100g macros, then convert to per-serving
+    cal_100g = float(nutriments.get("energy-kcal_100g", 0) or 0)
+    pro_100g = float(nutriments.get("proteins_100g", 0) or 0)
+    carb_100g = float(nutriments.get("carbohydrates_100g", 0) or 0)
+    fat_100g = float(nutriments.get("fat_100g", 0) or 0)
+
+    # Use serving_quantity (grams) from OFF if available, otherwise parse serving_size string
+    serving_grams = None
+    sq = product.get("serving_quantity")
+    if sq:
+        try:
+            serving_grams = float(sq)
+        except (ValueError, TypeError):
+            pass
+    if serving_grams is None:
+        serving_grams = _parse_serving_grams(serving_size)
+
+    # Build product name
+    name = product.get("product_name", "Unknown Product")
+    brands = product.get("brands", "")
+    if brands:
+        name = f"{brands} - {name}"
+
+    return {
+        "barcode": barcode,
+        "name": name,
+        "brands": brands,
+        "serving_size": serving_size,
+        "calories": _scale_to_serving(cal_100g, serving_grams),
+        "protein": _scale_to_serving(pro_100g, serving_grams),
+        "carbs": _scale_to_serving(carb_100g, serving_grams),
+        "fat": _scale_to_serving(fat_100g, serving_grams),
+        "image_url": product.get("image_url"),
+    }
+
+
+# ===== LOCAL CATALOG =====
+
+async def _read_catalog(barcode: str) -> Optional[Dict[str, Any]]:
+    """The imported product for a barcode, shaped like normalize_product's result."""
+    try:
+        async with AsyncSessionLocal() as db:
+            row = await db.get(FoodCatalogItem, barcode)
+    except SQLAlchemyError as e:
+        logger.warning(f"Reading food_catalog failed: {e}")
+        return None
+    if row is None:
+        return None
+    return {
+        "barcode": row.barcode,
+        "name": row.name,
+        "brands": row.brands or "",
+        "serving_size": row.serving_size,
+        "calories": row.calories,
+        "protein": row.protein,
+        "carbs": row.carbs,
+        "fat": row.fat,
+        "image_url": row.image_url,
+    }
+
+
+# ===== PERSISTENT BARCODE CACHE =====
+
+def _barcode_ttl(product: Optional[Dict[str, Any]]) -> int:
+    return settings.OFF_BARCODE_TTL_SECONDS if product is not None else settings.OFF_NOT_FOUND_TTL_SECONDS
+
+
+async def _read_persisted(barcode: str) -> tuple:
+    """Return (found, product) for a row still within its TTL."""
+    try:
+        async with AsyncSessionLocal() as db:
+            row = await db.get(FoodProductCache, barcode)
+    except SQLAlchemyError as e:
+        logger.warning(f"Reading food_product_cache failed: {e}")
+        return False, None
+    if row is None:
+        return False, None
+    if row.fetched_at + timedelta(seconds=_barcode_ttl(row.product)) < datetime.now(timezone.utc):
+        return False, None
+    return True, row.product
+
+
+async def _persist(barcode: str, product: Optional[Dict[str, Any]]) -> None:
+    stmt = insert(FoodProductCache).values(
+        barcode=barcode, product=product, fetched_at=datetime.now(timezone.utc)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FoodProductCache.barcode],
+        set_={"product": stmt.excluded.product, "fetched_at": stmt.excluded.fetched_at},
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Writing food_product_cache failed: {e}")
+
+
+# ===== LOOKUPS =====
+
+async def _fetch_product(barcode: str) -> Optional[Dict[str, Any]]:
+    response = await _get_client().get(f"/api/v2/product/{barcode}.json")
+    # OFF answers unknown barcodes with 404 and status 0
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != 1:
+        return None
+    return normalize_product(data.get("product", {}), barcode)
+
+
+async def _load_product(barcode: str) -> Optional[Dict[str, Any]]:
+    if settings.OFF_LOCAL_CATALOG:
+        product = await _read_catalog(barcode)
+        if product is not None:
+            return product
+    if settings.OFF_PERSISTENT_CACHE:
+        found, product = await _read_persisted(barcode)
+        if found:
+            return product
+    product = await _fetch_product(barcode)
+    if settings.OFF_PERSISTENT_CACHE:
+        await _persist(barcode, product)
+    return product
+
+
+async def get_product(barcode: str) -> Optional[Dict[str, Any]]:
+    """
+    Normalized product for a barcode, or None if Open Food Facts has none.
+
+    Raises httpx.HTTPError when upstream fails and nothing is cached.
+    """
+    return await barcode_cache.get_or_fetch(barcode, lambda: _load_product(barcode), ttl_for=_barcode_ttl)
+
+
+async def _fetch_search(q: str, page: int, page_size: int) -> Dict[str, Any]:
+    response = await _get_client().get(
+        "/cgi/search.pl",
+        params={
+            "search_terms": q,
+            "page": page,
+            "page_size": page_size,
+            "json": 1,
+            "fields": SEARCH_FIELDS,
+        },
+    )
+    response.raise_for_status()
+    data = response.json()
+    return {
+        "products": [normalize_product(p, p.get("code", "")) for p in data.get("products", [])],
+        "page": page,
+        "page_size": page_size,
+        "total": data.get("count", 0),
+    }
+
+
+async def search_products(q: str, page: int, page_size: int) -> Dict[str, Any]:
+    """Normalized search results page. Raises httpx.HTTPError when upstream fails."""
+    key = (q.strip().lower(), page, page_size)
+    return await search_cache.get_or_fetch(key, lambda: _fetch_search(q, page, page_size))
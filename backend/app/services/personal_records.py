@@ -0,0 +1,211 @@
+"""Per-exercise personal record index.
+
+Keeps one ``PersonalRecord`` row per user per exercise so the dashboard can
+read recent PRs with a single indexed lookup instead of re-aggregating the
+whole set history. A record counts completed, weighted sets from
+non-deleted workouts.
+"""
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..models.workout import Workout, Set, PersonalRecord
+
+
+def _history_query(db: Session, user_id: Optional[UUID] = None, exercise_ids: Optional[Iterable[UUID]] = None):
+    """Completed weighted sets in chronological order, grouped by user and exercise."""
+    q = db.query(
+        Workout.user_id,
+        Set.exercise_id,
+        Set.exercise_name_snapshot,
+        Set.weight,
+        Set.id.label("set_id"),
+        Workout.id.label("workout_id"),
+        Workout.workout_date,
+    ).join(Workout, Set.workout_id == Workout.id).filter(
+        Workout.deleted_at.is_(None),
+        Set.is_completed == True,
+        Set.weight.isnot(None),
+    )
+    if user_id is not None:
+        q = q.filter(Workout.user_id == user_id)
+    if exercise_ids is not None:
+        q = q.filter(Set.exercise_id.in_(list(exercise_ids)))
+    return q.order_by(
+        Workout.user_id,
+        Set.exercise_id,
+        Workout.workout_date,
+        Set.completed_at,
+    )
+
+
+def _fold_history(rows: Iterable) -> dict:
+    """
+    Walk chronological set rows and compute the record for each (user, exercise).
+
+    A heavier set sets a new record and moves the old best into previous_best;
+    matching the current best later on moves the achieved date forward.
+    """
+    records: dict = {}
+    for row in rows:
+        key = (row.user_id, row.exercise_id)
+        current = records.get(key)
+        if current is None:
+            records[key] = {
+                "exercise_name_snapshot": row.exercise_name_snapshot,
+                "best_weight": row.weight,
+                "previous_best": None,
+                "achieved_date": row.workout_date,
+                "workout_id": row.workout_id,
+                "set_id": row.set_id,
+            }
+        elif row.weight > current["best_weight"]:
+            current.update(
+                exercise_name_snapshot=row.exercise_name_snapshot,
+                previous_best=current["best_weight"],
+                best_weight=row.weight,
+                achieved_date=row.workout_date,
+                workout_id=row.workout_id,
+                set_id=row.set_id,
+            )
+        elif row.weight == current["best_weight"]:
+            current.update(
+                exercise_name_snapshot=row.exercise_name_snapshot,
+                achieved_date=row.workout_date,
+                workout_id=row.workout_id,
+                set_id=row.set_id,
+            )
+    return records
+
+
+def recompute_personal_records(
+    db: Session, user_id: UUID, exercise_ids: Iterable[UUID]
+) -> Dict[UUID, PersonalRecord]:
+    """
+    Rebuild several exercises' records from history with one scan.
+
+    Returns the resulting records keyed by exercise id; exercises left
+    without any qualifying set have their record removed.
+    """
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return {}
+
+    db.flush()
+    computed = _fold_history(_history_query(db, user_id, exercise_ids).all())
+    records = {
+        record.exercise_id: record for record in db.query(PersonalRecord).filter(
+            PersonalRecord.user_id == user_id,
+            PersonalRecord.exercise_id.in_(exercise_ids),
+        ).all()
+    }
+
+    result = {}
+    for exercise_id in exercise_ids:
+        values = computed.get((user_id, exercise_id))
+        record = records.get(exercise_id)
+        if values is None:
+            if record is not None:
+                db.delete(record)
+            continue
+        if record is None:
+            record = PersonalRecord(user_id=user_id, exercise_id=exercise_id)
+            db.add(record)
+        for field, value in values.items():
+            setattr(record, field, value)
+        result[exercise_id] = record
+    return result
+
+
+def recompute_personal_record(db: Session, user_id: UUID, exercise_id: UUID) -> Optional[PersonalRecord]:
+    """
+    Rebuild one exercise's record from history.
+
+    Used when the record-holding set is edited, un-completed, deleted or
+    swapped away, where the new best can only be found by rescanning.
+    """
+    return recompute_personal_records(db, user_id, [exercise_id]).get(exercise_id)
+
+
+def sync_set(db: Session, user_id: UUID, workout: Workout, set_obj: Set) -> None:
+    """
+    Bring the index up to date after a set was added or changed.
+
+    A completed set that beats or matches the current best is applied
+    directly; changes to the set currently holding the record fall back
+    to a recompute.
+    """
+    record = db.query(PersonalRecord).filter(
+        PersonalRecord.user_id == user_id,
+        PersonalRecord.exercise_id == set_obj.exercise_id,
+    ).first()
+
+    if record is not None and record.set_id == set_obj.id:
+        recompute_personal_record(db, user_id, set_obj.exercise_id)
+        return
+
+    if not set_obj.is_completed or set_obj.weight is None:
+        return
+
+    if record is None:
+        db.add(PersonalRecord(
+            user_id=user_id,
+            exercise_id=set_obj.exercise_id,
+            exercise_name_snapshot=set_obj.exercise_name_snapshot,
+            best_weight=set_obj.weight,
+            previous_best=None,
+            achieved_date=workout.workout_date,
+            workout_id=workout.id,
+            set_id=set_obj.id,
+        ))
+        return
+
+    if set_obj.weight < record.best_weight:
+        return
+
+    # A back-dated workout can reorder history, so only apply in-order updates directly
+    if workout.workout_date < record.achieved_date:
+        recompute_personal_record(db, user_id, set_obj.exercise_id)
+        return
+
+    if set_obj.weight > record.best_weight:
+        record.previous_best = record.best_weight
+        record.best_weight = set_obj.weight
+    record.exercise_name_snapshot = set_obj.exercise_name_snapshot
+    record.achieved_date = workout.workout_date
+    record.workout_id = workout.id
+    record.set_id = set_obj.id
+
+
+def forget_workout(db: Session, user_id: UUID, workout_id: UUID) -> None:
+    """Recompute every record that was set in a workout that is going away."""
+    exercise_ids = [
+        exercise_id for (exercise_id,) in db.query(PersonalRecord.exercise_id).filter(
+            PersonalRecord.user_id == user_id,
+            PersonalRecord.workout_id == workout_id,
+        ).all()
+    ]
+    recompute_personal_records(db, user_id, exercise_ids)
+
+
+def rebuild_personal_records(db: Session, user_id: Optional[UUID] = None) -> int:
+    """
+    Rebuild the index from the full set history.
+
+    Streams one ordered query and replaces the stored records. Returns the
+    number of records written.
+    """
+    rows = _history_query(db, user_id).yield_per(5000)
+    records = _fold_history(rows)
+
+    delete_q = db.query(PersonalRecord)
+    if user_id is not None:
+        delete_q = delete_q.filter(PersonalRecord.user_id == user_id)
+    delete_q.delete(synchronize_session=False)
+
+    db.bulk_insert_mappings(PersonalRecord, [
+        {"user_id": uid, "exercise_id": exercise_id, **values}
+        for (uid, exercise_id), values in records.items()
+    ])
+    return len(records)
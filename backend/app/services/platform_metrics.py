@@ -0,0 +1,195 @@
+"""Incrementally maintained platform metrics for the admin dashboard.
+
+Totals live in sharded ``platform_counters`` rows that routers bump in the
+same transaction as the write they count. Active users come from
+``user_activity_days``: one row per user per active day, pruned to the
+30-day window, so a windowed distinct count only touches that window.
+Distinct-user adoption figures are bumped when a user writes their first
+row of a kind. Removals are not tracked on write: ``compact_platform_metrics``
+(run on a schedule via ``scripts/compact_platform_metrics.py``) recomputes
+every counter, rebuilds the activity window and prunes older activity rows.
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import exists, func, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.metrics import PlatformCounter, UserActivityDay
+from ..models.user import User, UserSettings, BodyMeasurement
+from ..models.workout import Workout, Set
+from ..models.nutrition import Meal
+from ..models.exercise import Exercise, WorkoutTemplate
+from ..models.supplement import Supplement
+
+
+COUNTER_SHARDS = 16
+ACTIVITY_RETENTION_DAYS = 31
+
+# Maintained on write
+USERS_TOTAL = "users_total"
+WORKOUTS_COMPLETED = "workouts_completed"
+MEALS_LOGGED = "meals_logged"
+SETS_COMPLETED = "sets_completed"
+
+# Bumped on a user's first row of a kind, recomputed by compaction
+USERS_WITH_COMPLETED_WORKOUTS = "users_with_completed_workouts"
+USERS_WITH_TEMPLATES = "users_with_templates"
+USERS_WITH_CUSTOM_EXERCISES = "users_with_custom_exercises"
+USERS_WITH_MEALS = "users_with_meals"
+USERS_WITH_MACRO_TARGETS = "users_with_macro_targets"
+USERS_WITH_SUPPLEMENTS = "users_with_supplements"
+USERS_WITH_MEASUREMENTS = "users_with_measurements"
+COACH_TYPE_PREFIX = "coach_type:"
+
+
+def _increment_stmt(name: str, delta: int):
+    stmt = insert(PlatformCounter).values(name=name, shard=random.randrange(COUNTER_SHARDS), value=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=[PlatformCounter.name, PlatformCounter.shard],
+        set_={"value": PlatformCounter.value + stmt.excluded.value, "updated_at": func.now()},
+    )
+
+
+def increment(db: Session, name: str, delta: int = 1) -> None:
+    """Add delta to a counter inside the caller's transaction."""
+    if delta:
+        db.execute(_increment_stmt(name, delta))
+
+
+async def increment_async(db: AsyncSession, name: str, delta: int = 1) -> None:
+    if delta:
+        await db.execute(_increment_stmt(name, delta))
+
+
+def increment_if_first(db: Session, name: str, *criteria) -> None:
+    """
+    Bump a distinct-user counter unless a row matching ``criteria`` exists.
+
+    Call it before adding the user's new row. Two concurrent first writes
+    can both bump; compaction corrects that.
+    """
+    if not db.execute(select(exists().where(*criteria))).scalar():
+        increment(db, name)
+
+
+async def increment_if_first_async(db: AsyncSession, name: str, *criteria) -> None:
+    if not (await db.execute(select(exists().where(*criteria)))).scalar():
+        await increment_async(db, name)
+
+
+def settings_changed(
+    db: Session,
+    settings: UserSettings,
+    old_coach_type: Optional[str] = None,
+    had_macro_target: bool = False,
+) -> None:
+    """Move the coach-type and macro-target counters for a created or updated settings row."""
+    coach_type = settings.coach_type or UserSettings.__table__.c.coach_type.default.arg
+    if coach_type != old_coach_type:
+        increment(db, f"{COACH_TYPE_PREFIX}{coach_type}")
+        if old_coach_type:
+            increment(db, f"{COACH_TYPE_PREFIX}{old_coach_type}", -1)
+    increment(db, USERS_WITH_MACRO_TARGETS, int(settings.macro_target_calories is not None) - int(had_macro_target))
+
+
+def record_activity(db: Session, user_id: UUID, day: Optional[date] = None) -> None:
+    """Mark the user active on a day (today by default), inside the caller's transaction."""
+    day = day or datetime.now(timezone.utc).date()
+    db.execute(
+        insert(UserActivityDay).values(user_id=user_id, activity_date=day).on_conflict_do_nothing()
+    )
+
+
+def read_counters(db: Session) -> Dict[str, int]:
+    """Every counter summed over its shards."""
+    return {
+        name: int(value) for name, value in db.query(
+            PlatformCounter.name, func.sum(PlatformCounter.value)
+        ).group_by(PlatformCounter.name).all()
+    }
+
+
+def active_users(db: Session, days: int, today: Optional[date] = None) -> int:
+    """Distinct users with activity in the last ``days`` days, today included."""
+    today = today or datetime.now(timezone.utc).date()
+    return db.query(func.count(func.distinct(UserActivityDay.user_id))).filter(
+        UserActivityDay.activity_date > today - timedelta(days=days),
+    ).scalar()
+
+
+def _distinct_users(db: Session, column, *criteria) -> int:
+    return db.query(func.count(func.distinct(column))).filter(*criteria).scalar()
+
+
+def compact_platform_metrics(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Recompute every counter and the activity window from source tables.
+
+    Counters are collapsed to shard 0. Increments committed while this runs
+    may be overwritten; the next run corrects them. Returns the new values.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    window_start = today - timedelta(days=ACTIVITY_RETENTION_DAYS)
+
+    values = {
+        USERS_TOTAL: db.query(func.count(User.id)).scalar(),
+        WORKOUTS_COMPLETED: db.query(func.count(Workout.id)).filter(
+            Workout.completed_at.isnot(None),
+            Workout.deleted_at.is_(None),
+        ).scalar(),
+        MEALS_LOGGED: db.query(func.count(Meal.id)).filter(Meal.deleted_at.is_(None)).scalar(),
+        SETS_COMPLETED: db.query(func.count(Set.id)).filter(Set.is_completed.is_(True)).scalar(),
+        USERS_WITH_COMPLETED_WORKOUTS: _distinct_users(
+            db, Workout.user_id, Workout.completed_at.isnot(None), Workout.deleted_at.is_(None)
+        ),
+        USERS_WITH_TEMPLATES: _distinct_users(db, WorkoutTemplate.user_id, WorkoutTemplate.deleted_at.is_(None)),
+        USERS_WITH_CUSTOM_EXERCISES: _distinct_users(
+            db, Exercise.user_id, Exercise.is_custom.is_(True), Exercise.deleted_at.is_(None)
+        ),
+        USERS_WITH_MEALS: _distinct_users(db, Meal.user_id, Meal.deleted_at.is_(None)),
+        USERS_WITH_MACRO_TARGETS: db.query(func.count(UserSettings.id)).filter(
+            UserSettings.macro_target_calories.isnot(None),
+        ).scalar(),
+        USERS_WITH_SUPPLEMENTS: _distinct_users(db, Supplement.user_id),
+        USERS_WITH_MEASUREMENTS: _distinct_users(db, BodyMeasurement.user_id),
+    }
+    for coach_type, count in db.query(
+        UserSettings.coach_type, func.count(UserSettings.id)
+    ).group_by(UserSettings.coach_type).all():
+        if coach_type:
+            values[f"{COACH_TYPE_PREFIX}{coach_type}"] = count
+
+    db.query(PlatformCounter).delete(synchronize_session=False)
+    db.bulk_insert_mappings(PlatformCounter, [
+        {"name": name, "shard": 0, "value": value} for name, value in values.items()
+    ])
+
+    # Rebuild the activity window from source rows: drops days whose workouts or
+    # meals were since deleted, and covers rolled-back marks and backfill
+    db.query(UserActivityDay).filter(
+        UserActivityDay.activity_date >= window_start,
+    ).delete(synchronize_session=False)
+    window_start_at = datetime.combine(window_start, datetime.min.time(), tzinfo=timezone.utc)
+    activity = union(
+        select(Workout.user_id, func.date(Workout.started_at)).where(
+            Workout.started_at >= window_start_at,
+            Workout.deleted_at.is_(None),
+        ),
+        select(Meal.user_id, func.date(Meal.created_at)).where(
+            Meal.created_at >= window_start_at,
+            Meal.deleted_at.is_(None),
+        ),
+    )
+    db.execute(
+        insert(UserActivityDay).from_select(["user_id", "activity_date"], activity).on_conflict_do_nothing()
+    )
+    db.query(UserActivityDay).filter(
+        UserActivityDay.activity_date < window_start,
+    ).delete(synchronize_session=False)
+
+    return values
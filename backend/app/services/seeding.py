@@ -0,0 +1,124 @@
+"""Idempotent loading of reference data (system exercises and foods).
+
+Each dataset is a versioned CSV in ``app/seed_data`` (optionally gzipped)
+whose header names the table columns it fills. ``seed`` hashes the file
+and compares it with the checksum recorded in ``seed_versions``, so an
+unchanged file costs one primary-key lookup. A changed file is streamed
+with COPY into a temporary table and inserted in one statement with
+``ON CONFLICT DO NOTHING`` on the dataset's natural key (the name of a
+live system row). Rows already present, including ones that templates
+and meals point at, are left alone; reruns add only what is new.
+
+Runs hold a transaction-scoped advisory lock, so processes that start
+together seed once.
+"""
+import csv
+import gzip
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.seed import SeedVersion
+
+
+SEED_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "seed_data")
+
+# Arbitrary app-wide key for the seeding advisory lock
+SEED_LOCK_KEY = 7100422
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """A seed file and the system rows it loads into ``table``."""
+
+    table: str
+    filename: str
+    columns: Tuple[str, ...]  # CSV header, in order
+
+
+DATASETS: Dict[str, Dataset] = {
+    "exercises": Dataset("exercises", "exercises.csv", ("name", "muscle_group", "equipment")),
+    "foods": Dataset("foods", "foods.csv", ("name", "serving_size", "calories", "protein", "carbs", "fat")),
+}
+
+
+def _open(path: str):
+    return gzip.open(path, "rt", newline="") if path.endswith(".gz") else open(path, newline="")
+
+
+def _checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_rows(db: Session, dataset: Dataset, path: str) -> int:
+    """Stream the file into the ``seed_rows`` temp table; returns the rows copied."""
+    columns = ", ".join(dataset.columns)
+    with _open(path) as f:
+        header = next(csv.reader([f.readline()]), [])
+        if tuple(header) != dataset.columns:
+            raise ValueError(f"{path}: expected columns {', '.join(dataset.columns)}, got {', '.join(header)}")
+        # psycopg2's COPY needs the DBAPI cursor; it runs in the session's transaction
+        with db.connection().connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY seed_rows ({columns}) FROM STDIN WITH (FORMAT csv)", f)
+            return cursor.rowcount
+
+
+def seed(db: Session, name: str, path: Optional[str] = None, force: bool = False) -> Optional[int]:
+    """
+    Load one dataset unless its file is unchanged since the last load.
+
+    Returns the number of rows inserted, or None when the checksum matched
+    (``force`` loads anyway). Commits.
+    """
+    dataset = DATASETS[name]
+    path = path or os.path.join(SEED_DATA_DIR, dataset.filename)
+    checksum = _checksum(path)
+    columns = ", ".join(dataset.columns)
+
+    try:
+        db.execute(select(func.pg_advisory_xact_lock(SEED_LOCK_KEY)))
+        loaded = db.execute(select(SeedVersion.checksum).where(SeedVersion.dataset == name)).scalar()
+        if loaded == checksum and not force:
+            db.commit()  # Releases the lock
+            return None
+
+        db.execute(text(
+            f"CREATE TEMP TABLE seed_rows ON COMMIT DROP AS SELECT {columns} FROM {dataset.table} WITH NO DATA"
+        ))
+        row_count = _copy_rows(db, dataset, path)
+        # Column defaults are Python-side, so the SELECT supplies id and timestamps
+        inserted = db.execute(text(f"""
+            INSERT INTO {dataset.table} (id, {columns}, is_custom, created_at, updated_at)
+            SELECT gen_random_uuid(), {columns}, false, now(), now() FROM seed_rows
+            ON CONFLICT (name) WHERE NOT is_custom AND deleted_at IS NULL DO NOTHING
+        """)).rowcount
+
+        now = datetime.now(timezone.utc)
+        db.execute(insert(SeedVersion).values(
+            dataset=name, checksum=checksum, row_count=row_count, applied_at=now,
+        ).on_conflict_do_update(
+            index_elements=[SeedVersion.dataset],
+            set_={"checksum": checksum, "row_count": row_count, "applied_at": now},
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return inserted
+
+
+def seed_all(db: Session) -> Dict[str, Optional[int]]:
+    """Seed every dataset; maps each name to rows inserted (None when unchanged)."""
+    return {name: seed(db, name) for name in DATASETS}
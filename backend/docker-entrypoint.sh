@@ -10,25 +10,10 @@ done
 echo "PostgreSQL is up - running migrations..."
 alembic upgrade head
 
-echo "Checking if exercises are seeded..."
-EXERCISE_COUNT=$(PGPASSWORD=$DATABASE_PASSWORD psql -h "$DATABASE_HOST" -U "$DATABASE_USER" -d "$DATABASE_NAME" -t -c "SELECT COUNT(*) FROM exercises WHERE is_custom = false;" 2>/dev/null | xargs)
-
-if [ "$EXERCISE_COUNT" = "0" ]; then
-  echo "Seeding exercises..."
-  python scripts/seed_exercises.py
-else
-  echo "Exercises already seeded ($EXERCISE_COUNT found)"
-fi
-
-echo "Checking if foods are seeded..."
-FOOD_COUNT=$(PGPASSWORD=$DATABASE_PASSWORD psql -h "$DATABASE_HOST" -U "$DATABASE_USER" -d "$DATABASE_NAME" -t -c "SELECT COUNT(*) FROM foods WHERE is_custom = false;" 2>/dev/null | xargs)
-
-if [ "$FOOD_COUNT" = "0" ]; then
-  echo "Seeding foods..."
-  python scripts/seed_foods.py
-else
-  echo "Foods already seeded ($FOOD_COUNT found)"
-fi
+echo "Seeding reference data..."
+# Skips each dataset whose seed file is unchanged since the last load
+python scripts/seed_exercises.py
+python scripts/seed_foods.py
 
 echo "Starting application..."
 exec "$@"
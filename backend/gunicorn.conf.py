@@ -0,0 +1,54 @@
+"""Gunicorn settings for SERVER_MODE=multi (started by scripts/serve.py).
+
+The master preloads the app, seeds reference data once under an advisory
+lock, then forks WEB_CONCURRENCY uvicorn workers. On SIGTERM each worker
+stops accepting connections and gets GRACEFUL_TIMEOUT_SECONDS to finish
+in-flight requests and run the app's shutdown before it is killed.
+Request histograms are per worker, so /metrics is not served in this mode.
+"""
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Workers skip the lifespan seeding; the master does it in on_starting.
+# Must be set before the app (and its Settings) is imported.
+os.environ["SEED_ON_STARTUP"] = "false"
+
+from app.config import settings  # noqa: E402
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = settings.GRACEFUL_TIMEOUT_SECONDS
+timeout = settings.WORKER_TIMEOUT_SECONDS
+keepalive = settings.KEEPALIVE_SECONDS
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """Seed once in the master, before any worker forks."""
+    from app.database import SessionLocal, engine
+    from app.services import seeding
+
+    db = SessionLocal()
+    try:
+        seeding.seed_all(db)
+    finally:
+        db.close()
+    # Don't let forked workers inherit the master's pooled connections
+    engine.dispose()
+
+
+def post_fork(server, worker):
+    """Drop any pooled connections copied from the master without closing its sockets."""
+    from app.database import async_engine, async_read_engine, engine, read_engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if settings.READ_REPLICA_URL:
+        read_engine.dispose(close=False)
+        async_read_engine.sync_engine.dispose(close=False)
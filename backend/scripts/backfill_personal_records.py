@@ -0,0 +1,45 @@
+"""Rebuild the personal record index from existing workout history.
+
+Usage:
+    python scripts/backfill_personal_records.py [email]
+
+Rebuilds every user's records, or just one user's when an email is given.
+Safe to re-run at any time.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.personal_records import rebuild_personal_records
+
+
+def backfill_personal_records(email: str = None):
+    db = SessionLocal()
+    try:
+        user_id = None
+        if email:
+            user = db.query(User).filter(User.email == email).first()
+            if not user:
+                print(f"User not found: {email}")
+                sys.exit(1)
+            user_id = user.id
+
+        count = rebuild_personal_records(db, user_id)
+        db.commit()
+        print(f"✓ Rebuilt {count} personal records")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Failed to backfill personal records: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python scripts/backfill_personal_records.py [email]")
+        sys.exit(1)
+    backfill_personal_records(sys.argv[1] if len(sys.argv) == 2 else None)
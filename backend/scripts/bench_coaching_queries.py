@@ -0,0 +1,56 @@
+"""Count queries and time the coaching analytics snapshot for a user.
+
+Usage:
+    python scripts/bench_coaching_queries.py <email> [iterations]
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.models.user import User, UserSettings
+from app.services.coaching_analytics import build_coaching_snapshot
+
+
+def bench_coaching_queries(email: str, iterations: int = 10):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            print(f"User not found: {email}")
+            sys.exit(1)
+        user_settings = db.query(UserSettings).filter(UserSettings.user_id == user.id).first()
+
+        statements = []
+
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_query)
+        try:
+            timings = []
+            for _ in range(iterations):
+                statements.clear()
+                started = time.perf_counter()
+                build_coaching_snapshot(user.id, user_settings, db)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_query)
+
+        timings.sort()
+        print(f"Queries per snapshot: {len(statements)}")
+        print(f"Latency over {iterations} runs: "
+              f"min {timings[0]:.1f} ms | median {timings[len(timings) // 2]:.1f} ms | max {timings[-1]:.1f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python scripts/bench_coaching_queries.py <email> [iterations]")
+        sys.exit(1)
+    bench_coaching_queries(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else 10)
@@ -0,0 +1,91 @@
+"""Benchmark time to first healthy response and enforce a budget.
+
+Usage:
+    python scripts/bench_cold_start.py [runs] [budget_ms]
+
+Starts ``uvicorn app.main:app`` on a free port ``runs`` times (default 5),
+polls /health until it answers 200 and stops the server. Reports every
+run and exits non-zero when the median exceeds ``budget_ms`` (default
+COLD_START_BUDGET_MS), so CI fails on a startup regression. The server
+uses the environment's DATABASE_URL for its startup seeding; see
+scripts/profile_startup.py for where the time goes.
+"""
+import sys
+import os
+import socket
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START_BUDGET_MS = 4000
+TIMEOUT_SECONDS = 60
+POLL_SECONDS = 0.01
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _healthy(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return False
+
+
+def _cold_start() -> float:
+    """Seconds from spawning the server to its first 200 from /health."""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while not _healthy(f"http://127.0.0.1:{port}/health"):
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with {server.returncode}:\n{server.stderr.read().decode()[-2000:]}")
+            if time.perf_counter() - started > TIMEOUT_SECONDS:
+                raise RuntimeError(f"Server not healthy after {TIMEOUT_SECONDS}s")
+            time.sleep(POLL_SECONDS)
+        return time.perf_counter() - started
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def bench_cold_start(runs: int, budget_ms: float) -> int:
+    samples = []
+    for run in range(1, runs + 1):
+        samples.append(_cold_start() * 1000)
+        print(f"  run {run}: {samples[-1]:.0f} ms")
+
+    median = statistics.median(samples)
+    print(f"Median time to first healthy response: {median:.0f} ms (min {min(samples):.0f}, max {max(samples):.0f})")
+    if median > budget_ms:
+        print(f"✗ Over the {budget_ms:.0f} ms cold start budget")
+        return 1
+    print(f"✓ Within the {budget_ms:.0f} ms cold start budget")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: python scripts/bench_cold_start.py [runs] [budget_ms]")
+        sys.exit(1)
+    sys.exit(bench_cold_start(
+        int(sys.argv[1]) if len(sys.argv) >= 2 else 5,
+        float(sys.argv[2]) if len(sys.argv) == 3 else COLD_START_BUDGET_MS,
+    ))
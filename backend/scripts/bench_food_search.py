@@ -0,0 +1,122 @@
+"""Benchmark food search on a synthetic foods table.
+
+Usage:
+    python scripts/bench_food_search.py <email> [rows] [iterations]
+
+Builds a throwaway ``food_search_bench.foods`` table (default 500,000
+rows) with the same indexes as ``foods``. With the search_path pointed at
+it, the script times the previous ``ILIKE '%term%'`` query and the ranked
+search service for a mix of type-ahead, substring and misspelled terms,
+then drops the schema. The user's meal history stays in ``public``, so the
+recent-foods boost is exercised as in production.
+"""
+import sys
+import os
+import statistics
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.models.nutrition import Food
+from app.services.food_search import search_foods
+
+
+SCHEMA = "food_search_bench"
+TERMS = ["ch", "chi", "chicken", "greek yog", "peanut butter", "brocoli", "oatmeal"]
+
+WORDS = [
+    "chicken", "beef", "pork", "turkey", "salmon", "tuna", "egg", "rice", "oat", "oatmeal",
+    "bread", "pasta", "potato", "broccoli", "spinach", "apple", "banana", "berry", "yogurt",
+    "greek", "cheese", "milk", "almond", "peanut", "butter", "protein", "bar", "shake",
+    "grilled", "roasted", "baked", "fried", "organic", "whole", "wheat", "low", "fat", "sweet",
+]
+
+
+def _build_table(db, rows: int, user_id) -> None:
+    words = "ARRAY[" + ", ".join(f"'{w}'" for w in WORDS) + "]"
+    conn = db.connection()
+    conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+    conn.exec_driver_sql(f"CREATE TABLE {SCHEMA}.foods (LIKE public.foods INCLUDING ALL)")
+    conn.exec_driver_sql(f"""
+        INSERT INTO {SCHEMA}.foods
+            (id, name, serving_size, calories, protein, carbs, fat, is_custom, user_id, created_at, updated_at)
+        SELECT
+            gen_random_uuid(),
+            initcap(w[1 + mod(i * 7, {len(WORDS)})] || ' ' || w[1 + mod(i * 13, {len(WORDS)})]
+                    || ' ' || w[1 + mod(i * 31, {len(WORDS)})]) || ' #' || i,
+            '100g', 100 + mod(i, 400), mod(i, 40), mod(i, 60), mod(i, 30),
+            mod(i, 50) = 0,
+            CASE WHEN mod(i, 50) = 0 THEN %(user_id)s::uuid END,
+            now(), now()
+        FROM generate_series(1, %(rows)s) AS i, (SELECT {words} AS w) AS words
+    """, {"user_id": str(user_id), "rows": rows})
+    conn.exec_driver_sql(f"ANALYZE {SCHEMA}.foods")
+    db.commit()
+
+
+def _time(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_food_search(email: str, rows: int, iterations: int) -> None:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            print(f"User not found: {email}")
+            sys.exit(1)
+        user_id = user.id
+
+        print(f"Building {rows:,} synthetic foods in {SCHEMA}.foods...")
+        _build_table(db, rows, user_id)
+        conn = db.connection()
+        conn.exec_driver_sql(f"SET LOCAL search_path TO {SCHEMA}, public")
+
+        def legacy(term):
+            # Without the trigram index the old query could only scan the table
+            conn.exec_driver_sql("SET LOCAL enable_bitmapscan = off")
+            try:
+                return _legacy_query(term)
+            finally:
+                conn.exec_driver_sql("SET LOCAL enable_bitmapscan = on")
+
+        def _legacy_query(term):
+            return db.query(Food).filter(
+                Food.deleted_at.is_(None),
+                or_(Food.is_custom == False, Food.user_id == user_id),
+                Food.name.ilike(f"%{term}%"),
+            ).order_by(Food.name).limit(50).all()
+
+        print(f"{'term':<16}{'ILIKE (ms)':>12}{'ranked (ms)':>14}  top result")
+        for term in TERMS:
+            old_ms = _time(lambda: legacy(term), iterations)
+            new_ms = _time(lambda: search_foods(db, user_id, term, limit=50), iterations)
+            top = search_foods(db, user_id, term, limit=1)
+            print(f"{term:<16}{old_ms:>12.1f}{new_ms:>14.1f}  {top[0].name if top else '-'}")
+    finally:
+        # Ends the benchmark transaction, which also reverts the SET LOCALs
+        db.rollback()
+        db.connection().exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3, 4):
+        print("Usage: python scripts/bench_food_search.py <email> [rows] [iterations]")
+        sys.exit(1)
+    bench_food_search(
+        sys.argv[1],
+        int(sys.argv[2]) if len(sys.argv) >= 3 else 500_000,
+        int(sys.argv[3]) if len(sys.argv) == 4 else 5,
+    )
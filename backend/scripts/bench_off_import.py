@@ -0,0 +1,117 @@
+"""Benchmark the Open Food Facts dump importer: throughput and memory.
+
+Usage:
+    python scripts/bench_off_import.py [rows] [batch_size]
+
+Writes a synthetic gzipped JSONL dump of ``rows`` products (default
+200000, with a mix of serving formats, duplicate barcodes and rows the
+importer must skip) to a temporary file, then imports it into a scratch
+schema holding a copy of food_catalog, so the real catalogue is not
+touched. Reports rows/s and the process's peak RSS after the first batch
+and at the end; the two should match however many rows are imported.
+Needs the database in DATABASE_URL with migrations applied.
+"""
+import sys
+import os
+import gzip
+import json
+import random
+import resource
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services import off_import
+
+SCHEMA = "off_import_bench"
+SERVINGS = ["30 g", "1 oz", "250 ml", "2 biscuits (25g)", "1 portion", "", "0,5 l", "100g"]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _product(i: int, rng: random.Random) -> dict:
+    product = {
+        "code": str(3000000000000 + (i if i % 50 else i // 2)),  # Every 50th repeats an earlier barcode
+        "product_name": f"Product {i}",
+        "brands": rng.choice(["Acme", "Bravo Foods", "", None]),
+        "serving_size": rng.choice(SERVINGS),
+        "image_url": f"https://images.example/{i}.jpg",
+        "nutriments": {
+            "energy-kcal_100g": round(rng.uniform(0, 900), 1),
+            "proteins_100g": round(rng.uniform(0, 40), 1),
+            "carbohydrates_100g": round(rng.uniform(0, 90), 1),
+            "fat_100g": round(rng.uniform(0, 60), 1),
+        },
+    }
+    if i % 40 == 0:
+        product["serving_quantity"] = "45"
+    if i % 97 == 0:
+        del product["product_name"]  # Skipped: unnamed
+    if i % 89 == 0:
+        product["nutriments"]["energy-kcal_100g"] = "n/a"  # Skipped: not numeric
+    return product
+
+
+def _write_dump(path: str, rows: int) -> None:
+    rng = random.Random(0)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(1, rows + 1):
+            f.write(json.dumps(_product(i, rng)))
+            f.write("\n")
+        f.write("{not json\n")  # Skipped: malformed
+
+
+def bench_off_import(rows: int, batch_size: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".jsonl.gz")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        _write_dump(path, rows)
+        print(f"Wrote {rows:,} products ({os.path.getsize(path) / 1e6:.1f} MB gzipped) in {time.perf_counter() - started:.1f}s")
+
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.food_catalog (LIKE public.food_catalog INCLUDING ALL)"))
+            conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+            conn.commit()
+            try:
+                first_batch_rss = []
+
+                def progress(stats: off_import.ImportStats) -> None:
+                    if not first_batch_rss:
+                        first_batch_rss.append(_peak_rss_mb())
+
+                started = time.perf_counter()
+                stats = off_import.import_dump(conn, path, batch_size, on_batch=progress)
+                elapsed = time.perf_counter() - started
+                stored = conn.execute(text("SELECT count(*) FROM food_catalog")).scalar()
+            finally:
+                conn.rollback()
+                conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+                conn.commit()
+    finally:
+        os.remove(path)
+
+    print(f"Imported {stats.read:,} rows in {elapsed:.1f}s: {stats.read / elapsed:,.0f} rows/s")
+    print(f"  {stats.loaded:,} upserts, {stored:,} distinct barcodes stored, {stats.skipped:,} skipped")
+    print(f"  Peak RSS {first_batch_rss[0] if first_batch_rss else 0:.0f} MB after the first batch of {batch_size:,}, "
+          f"{_peak_rss_mb():.0f} MB at the end")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: python scripts/bench_off_import.py [rows] [batch_size]")
+        sys.exit(1)
+    bench_off_import(
+        int(sys.argv[1]) if len(sys.argv) >= 2 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) == 3 else off_import.DEFAULT_BATCH_SIZE,
+    )
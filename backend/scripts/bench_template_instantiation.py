@@ -0,0 +1,146 @@
+"""Count queries and time starting a workout from a large template.
+
+Usage:
+    python scripts/bench_template_instantiation.py <email> [iterations]
+
+Builds a temporary 15-exercise x 5-set template for the user, then starts
+a workout from it through the create_workout route, once with the bulk
+INSERT ... RETURNING path and once with the old per-set db.add() loop
+plus refresh and lazy reload for comparison. Everything created is
+removed afterwards.
+"""
+import sys
+import os
+import time
+from datetime import date, datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+
+from app.database import SessionLocal, engine
+from app.models.user import User
+from app.models.exercise import Exercise, WorkoutTemplate, TemplateExercise
+from app.models.workout import Workout, Set
+from app.schemas.workout import WorkoutCreate, WorkoutResponse
+from app.api.v1.workouts import create_workout
+
+
+EXERCISES = 15
+SETS_PER_EXERCISE = 5
+
+
+def _legacy_create_workout(db, user, template_id):
+    """The previous implementation: one ORM add per set, then refresh and lazy-load sets."""
+    template = db.query(WorkoutTemplate).options(
+        joinedload(WorkoutTemplate.exercises).joinedload(TemplateExercise.exercise)
+    ).filter(WorkoutTemplate.id == template_id).first()
+    workout = Workout(
+        user_id=user.id,
+        template_id=template.id,
+        template_name_snapshot=template.name,
+        workout_type='lifting',
+        workout_date=date.today(),
+        started_at=datetime.now(timezone.utc),
+    )
+    db.add(workout)
+    db.flush()
+    for template_exercise in template.exercises:
+        for set_num in range(1, template_exercise.target_sets + 1):
+            db.add(Set(
+                workout_id=workout.id,
+                exercise_id=template_exercise.exercise_id,
+                exercise_name_snapshot=template_exercise.exercise.name,
+                set_number=set_num,
+                set_type='normal',
+                weight=template_exercise.target_weight,
+                reps=template_exercise.target_reps,
+                is_completed=False,
+            ))
+    db.commit()
+    db.refresh(workout)
+    return WorkoutResponse.model_validate(workout)
+
+
+def _measure(label, iterations, run):
+    statements = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    timings, counts = [], []
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        for _ in range(iterations):
+            statements.clear()
+            started = time.perf_counter()
+            response = run()
+            timings.append((time.perf_counter() - started) * 1000)
+            counts.append(len(statements))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+
+    timings.sort()
+    ok = len(response.sets) == EXERCISES * SETS_PER_EXERCISE
+    print(f"{'✓' if ok else '✗'} {label}: {len(response.sets)} sets, {max(counts)} queries | "
+          f"min {timings[0]:.1f} ms | median {timings[len(timings) // 2]:.1f} ms | max {timings[-1]:.1f} ms")
+    return ok
+
+
+def bench_template_instantiation(email: str, iterations: int = 20):
+    db = SessionLocal()
+    template = None
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            print(f"User not found: {email}")
+            sys.exit(1)
+
+        exercises = db.query(Exercise).filter(
+            Exercise.is_custom == False,
+            Exercise.deleted_at.is_(None),
+        ).order_by(Exercise.name).limit(EXERCISES).all()
+        if len(exercises) < EXERCISES:
+            print(f"Need {EXERCISES} system exercises; run scripts/seed_exercises.py first")
+            sys.exit(1)
+
+        template = WorkoutTemplate(user_id=user.id, name="Benchmark template (temporary)")
+        db.add(template)
+        db.flush()
+        for index, exercise in enumerate(exercises):
+            db.add(TemplateExercise(
+                template_id=template.id,
+                exercise_id=exercise.id,
+                order_index=index,
+                target_sets=SETS_PER_EXERCISE,
+                target_reps=8,
+                target_weight=100,
+            ))
+        db.commit()
+        template_id = template.id
+
+        workout_data = WorkoutCreate(
+            template_id=template_id,
+            workout_date=date.today(),
+            started_at=datetime.now(timezone.utc),
+        )
+        print(f"Template: {EXERCISES} exercises x {SETS_PER_EXERCISE} sets, {iterations} runs each")
+        ok = _measure("bulk insert", iterations, lambda: create_workout(workout_data, current_user=user, db=db))
+        ok &= _measure("per-set add", iterations, lambda: _legacy_create_workout(db, user, template_id))
+        sys.exit(0 if ok else 1)
+    finally:
+        db.rollback()
+        if template is not None:
+            # Hard-delete the benchmark workouts (sets cascade) and the template
+            db.query(Workout).filter(Workout.template_id == template.id).delete(synchronize_session=False)
+            db.query(WorkoutTemplate).filter(WorkoutTemplate.id == template.id).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python scripts/bench_template_instantiation.py <email> [iterations]")
+        sys.exit(1)
+    bench_template_instantiation(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else 20)
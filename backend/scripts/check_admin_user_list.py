@@ -0,0 +1,72 @@
+"""Assert the admin user list stays set-based and paginates cleanly.
+
+Usage:
+    python scripts/check_admin_user_list.py [page_size]
+
+Walks every page of GET /admin/users for each sort key and order,
+counting SQL statements per page. Fails if any page issues more than
+MAX_QUERIES_PER_PAGE statements (i.e. the per-user N+1 came back), or if
+the keyset cursors skip or repeat a user.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func
+
+from app.api.v1.admin import USER_SORT_COLUMNS, get_user_list
+from app.database import SessionLocal, engine
+from app.models.user import User
+
+
+# One aggregated page query plus the total count
+MAX_QUERIES_PER_PAGE = 2
+
+
+def check_admin_user_list(page_size: int = 25) -> int:
+    db = SessionLocal()
+    statements = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        total_users = db.query(func.count(User.id)).scalar()
+        failures = 0
+        for sort in USER_SORT_COLUMNS:
+            for order in ("asc", "desc"):
+                seen, cursor, pages, worst = [], None, 0, 0
+                while True:
+                    statements.clear()
+                    page = get_user_list(
+                        sort=sort, order=order, limit=page_size, cursor=cursor, current_user=None, db=db
+                    )
+                    worst = max(worst, len(statements))
+                    pages += 1
+                    seen.extend(row.email for row in page.users)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+
+                label = f"sort={sort} order={order}"
+                if worst > MAX_QUERIES_PER_PAGE:
+                    failures += 1
+                    print(f"✗ {label}: {worst} queries on one page (max {MAX_QUERIES_PER_PAGE})")
+                elif len(seen) != total_users or len(set(seen)) != total_users:
+                    failures += 1
+                    print(f"✗ {label}: paged {len(seen)} rows ({len(set(seen))} distinct), expected {total_users}")
+                else:
+                    print(f"✓ {label}: {total_users} users in {pages} page(s), ≤{worst} queries per page")
+        return 1 if failures else 0
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python scripts/check_admin_user_list.py [page_size]")
+        sys.exit(1)
+    sys.exit(check_admin_user_list(int(sys.argv[1]) if len(sys.argv) == 2 else 25))
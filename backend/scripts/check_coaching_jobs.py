@@ -0,0 +1,166 @@
+"""Exercise the coaching job queue end to end with a fake LLM.
+
+Usage:
+    python scripts/check_coaching_jobs.py <email>
+
+Use a test account: the user's coaching for today is deleted and
+regenerated. Checks that concurrent requests share one job, that competing
+workers never claim the same job, that a finished job stored exactly one
+insight from a single LLM call, that failures are retried with backoff,
+that the overnight scheduler is idempotent, and that streamed sections
+add up to the same coaching as the non-streaming path.
+"""
+import sys
+import os
+import asyncio
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select, update
+
+from app.database import AsyncSessionLocal
+from app.models.user import User, UserSettings, CoachInsight, CoachingJob
+from app.services import coaching, coaching_jobs, llm
+
+
+SECTION = "daily_coaching"
+
+
+class FailingProvider:
+    async def generate(self, system_prompt, user_prompt):
+        raise llm.LLMError("fake upstream failure", status=400)
+
+
+def _client(provider) -> llm.LLMClient:
+    return llm.LLMClient(
+        provider, max_concurrency=2, requests_per_minute=600, max_retries=0,
+        retry_base_seconds=0, cache_max_entries=10, cache_ttl_seconds=60,
+    )
+
+
+def _report(ok: bool, message: str) -> int:
+    print(f"{'✓' if ok else '✗'} {message}")
+    return 0 if ok else 1
+
+
+async def _enqueue(user_id, today):
+    async with AsyncSessionLocal() as db:
+        job = await coaching_jobs.enqueue(db, user_id, SECTION, today)
+        await db.commit()
+        return job.id
+
+
+async def _claim(user_id):
+    """Claim due jobs, handing back any that belong to other users."""
+    async with AsyncSessionLocal() as db:
+        jobs = await coaching_jobs.claim_jobs(db, 10)
+        others = [job.id for job in jobs if job.user_id != user_id]
+        if others:
+            await db.execute(update(CoachingJob).where(CoachingJob.id.in_(others)).values(
+                status=coaching_jobs.PENDING, attempts=CoachingJob.attempts - 1, locked_at=None
+            ))
+            await db.commit()
+        return [job for job in jobs if job.user_id == user_id]
+
+
+async def _reset(user_id, today) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(CoachingJob).where(
+            CoachingJob.user_id == user_id, CoachingJob.insight_date == today
+        ))
+        await db.execute(delete(CoachInsight).where(
+            CoachInsight.user_id == user_id, CoachInsight.insight_date == today
+        ))
+        await db.commit()
+
+
+async def check_coaching_jobs(email: str) -> int:
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        if not user:
+            print(f"User not found: {email}")
+            return 1
+        user_settings = (await db.execute(select(UserSettings).where(
+            UserSettings.user_id == user.id
+        ))).scalars().first()
+    today = coaching.user_today(user_settings)
+    await _reset(user.id, today)
+
+    failures = 0
+    fake = llm.FakeProvider()
+    fake_client = _client(fake)
+    failing_client = _client(FailingProvider())
+
+    try:
+        # Two tabs (or ten) asking at once share one job
+        job_ids = await asyncio.gather(*(_enqueue(user.id, today) for _ in range(10)))
+        failures += _report(len(set(job_ids)) == 1, f"10 concurrent requests queued {len(set(job_ids))} job(s)")
+
+        # Competing workers: SKIP LOCKED hands the job to exactly one of them
+        claims = await asyncio.gather(*(_claim(user.id) for _ in range(4)))
+        ours = [job for batch in claims for job in batch if job.id == job_ids[0]]
+        failures += _report(len(ours) == 1, f"4 competing workers claimed the job {len(ours)} time(s)")
+
+        if ours:
+            finished = await coaching_jobs.run_job(ours[0], fake_client)
+            async with AsyncSessionLocal() as db:
+                job = await db.get(CoachingJob, job_ids[0])
+                insights = (await db.execute(select(func.count(CoachInsight.id)).where(
+                    CoachInsight.user_id == user.id,
+                    CoachInsight.insight_date == today,
+                    CoachInsight.section == SECTION,
+                ))).scalar()
+            failures += _report(
+                finished and job.status == coaching_jobs.DONE and insights == 1 and fake.calls == 1,
+                f"job {job.status}, {insights} insight(s) stored, {fake.calls} LLM call(s)",
+            )
+
+        # Failures go back to the queue with a delay
+        await _reset(user.id, today)
+        await _enqueue(user.id, today)
+        claimed = await _claim(user.id)
+        if claimed:
+            await coaching_jobs.run_job(claimed[0], failing_client)
+            async with AsyncSessionLocal() as db:
+                job = await db.get(CoachingJob, claimed[0].id)
+            failures += _report(
+                job.status == coaching_jobs.PENDING and job.run_after > datetime.now(timezone.utc) and job.last_error,
+                f"failed attempt left the job {job.status}, retry at {job.run_after:%H:%M:%S}",
+            )
+        else:
+            failures += _report(False, "could not claim the job for the failure check")
+
+        # Overnight scheduling never duplicates a day's jobs
+        async with AsyncSessionLocal() as db:
+            await coaching_jobs.schedule_pregeneration(db)
+            again = await coaching_jobs.schedule_pregeneration(db)
+        failures += _report(again == 0, f"re-running the scheduler queued {again} extra job(s)")
+
+        # Streaming: per-section deltas reassemble to the parsed full reply
+        parser = coaching.SectionStreamParser()
+        streamed = {"summary": "", "workout_tips": "", "nutrition_tips": ""}
+        async for section, delta in coaching.stream_daily_coaching(
+            "old_school", "streaming check", parser, _client(llm.FakeProvider(delay_seconds=0))
+        ):
+            streamed[section] += delta
+        expected = coaching.parse_coaching_sections(llm.FakeProvider.REPLY)
+        failures += _report(
+            {name: text.strip() for name, text in streamed.items()} == expected,
+            "streamed sections match the parsed reply",
+        )
+    finally:
+        await _reset(user.id, today)
+
+    if failures:
+        print(f"✗ {failures} check(s) failed")
+        return 1
+    print("✓ Coaching job queue behaves")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/check_coaching_jobs.py <email>")
+        sys.exit(1)
+    sys.exit(asyncio.run(check_coaching_jobs(sys.argv[1])))
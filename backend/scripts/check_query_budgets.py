@@ -0,0 +1,412 @@
+"""Check every route's query count against a checked-in budget.
+
+Usage:
+    python scripts/check_query_budgets.py <scratch_database_url> [--update]
+
+The database must be an EMPTY, disposable Postgres database: it is
+migrated to head, seeded through the API with several users' templates,
+workouts, meals, measurements and supplements, and wiped afterwards.
+Every route in app.main:app is called and its query count is read from
+the Server-Timing header. Exits non-zero when:
+
+- an endpoint issues more queries than scripts/query_budgets.json allows
+  (or has no budget yet),
+- a read endpoint issues more queries after more history is seeded,
+  i.e. it runs a query per row (N+1),
+- a route is neither exercised here nor listed in SKIPPED.
+
+--update rewrites the budget file from this run's counts; commit it
+alongside changes that legitimately add queries.
+"""
+import sys
+import os
+import json
+import re
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+if len(sys.argv) not in (2, 3) or sys.argv[2:] not in ([], ["--update"]):
+    print("Usage: python scripts/check_query_budgets.py <scratch_database_url> [--update]")
+    sys.exit(1)
+
+# Settings are read at import time, so configure the app before importing it
+os.environ["DATABASE_URL"] = sys.argv[1]
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["METRICS_ENABLED"] = "true"
+os.environ["SLOW_QUERY_MS"] = "0"
+os.environ["GEMINI_API_KEY"] = ""  # Coaching answers 503 instead of calling out
+os.environ["REGISTRATION_CODE"] = ""
+os.environ["PRINCIPAL_CACHE_TTL_SECONDS"] = "3600"  # Keep auth lookups out of the counts
+
+from alembic import command
+from alembic.config import Config
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models.user import User
+
+
+BUDGET_FILE = os.path.join(BACKEND_DIR, "scripts", "query_budgets.json")
+
+SKIPPED = {
+    "GET /api/v1/openfoodfacts/barcode/{barcode}": "calls the live Open Food Facts API; see scripts/stub_open_food_facts.py",
+    "GET /api/v1/openfoodfacts/search": "calls the live Open Food Facts API; see scripts/stub_open_food_facts.py",
+}
+
+USERS = 3
+INITIAL_DAYS = 6
+GROWTH_DAYS = 12
+PASSWORD = "budget-check-password"
+
+QUERY_COUNT = re.compile(r'desc="(\d+) queries')
+
+
+class BudgetClient:
+    """TestClient wrapper that checks statuses and records query counts per route."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.counts = {}
+
+    def call(self, method, route, headers=None, expect=None, record=True, ctx=None, **kwargs):
+        response = self.client.request(method, route.format(**(ctx or {})), headers=headers, **kwargs)
+        ok = response.status_code == expect if expect else response.status_code < 300
+        if not ok:
+            raise RuntimeError(f"{method} {route} returned {response.status_code}: {response.text[:200]}")
+        if record:
+            match = QUERY_COUNT.search(response.headers.get("server-timing", ""))
+            if not match:
+                raise RuntimeError(f"{method} {route} sent no Server-Timing query count")
+            self.counts[f"{method} {route}"] = int(match.group(1))
+        if response.content and response.headers.get("content-type", "").startswith("application/json"):
+            return response.json()
+        return None
+
+
+def _register(api: BudgetClient, email: str, record: bool = False) -> dict:
+    tokens = api.call("POST", "/api/v1/auth/register", record=record, json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def _setup_user(api: BudgetClient, index: int) -> dict:
+    """Register a user with a category, foods, templates, supplements and macro targets."""
+    email = f"budget-{index}@example.com"
+    headers = _register(api, email)
+    user = {"email": email, "headers": headers}
+
+    exercises = api.call("GET", "/api/v1/exercises", headers=headers, record=False)
+    user["exercise_ids"] = [exercise["id"] for exercise in exercises[:8]]
+    user["category_id"] = api.call("POST", "/api/v1/nutrition/meal-categories", headers=headers, record=False,
+                                   json={"name": "Lunch", "display_order": 1})["id"]
+    user["food_ids"] = [
+        api.call("POST", "/api/v1/nutrition/foods", headers=headers, record=False, json={
+            "name": f"Food {n}", "serving_size": "100 g", "calories": 200 + n, "protein": 20, "carbs": 10, "fat": 5,
+        })["id"]
+        for n in range(3)
+    ]
+    user["template_ids"] = [
+        api.call("POST", "/api/v1/workouts/templates", headers=headers, record=False, json={
+            "name": f"Day {t}",
+            "exercises": [
+                {"exercise_id": exercise_id, "order_index": n, "target_sets": 3, "target_reps": 8, "target_weight": 100}
+                for n, exercise_id in enumerate(user["exercise_ids"][t * 4:t * 4 + 4])
+            ],
+        })["id"]
+        for t in range(2)
+    ]
+    user["supplement_ids"] = [
+        api.call("POST", "/api/v1/supplements", headers=headers, record=False, json={"name": f"Supplement {n}"})["id"]
+        for n in range(2)
+    ]
+    api.call("PUT", "/api/v1/user/settings", headers=headers, record=False, json={
+        "macro_target_calories": 2500, "macro_target_protein": 180, "macro_target_carbs": 250, "macro_target_fat": 80,
+    })
+    return user
+
+
+def _add_history(api: BudgetClient, user: dict, first_day: int, days: int) -> None:
+    """Log a completed workout, three meals, a measurement and supplements on each past day."""
+    headers = user["headers"]
+    today = date.today()
+    for offset in range(first_day, first_day + days):
+        day = today - timedelta(days=offset)
+        started = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=7)
+
+        workout = api.call("POST", "/api/v1/workouts", headers=headers, record=False, json={
+            "template_id": user["template_ids"][offset % 2],
+            "workout_date": day.isoformat(),
+            "started_at": started.isoformat(),
+        })
+        api.call("POST", "/api/v1/workouts/{workout_id}/sets/batch", headers=headers, record=False,
+                 ctx={"workout_id": workout["id"]}, json={"update": [
+                     {"id": s["id"], "weight": 100 + offset % 5 * 5, "reps": 8, "is_completed": True}
+                     for s in workout["sets"]
+                 ]})
+        api.call("POST", "/api/v1/workouts/{workout_id}/complete", headers=headers, record=False,
+                 ctx={"workout_id": workout["id"]}, json={"completed_at": (started + timedelta(hours=1)).isoformat()})
+
+        for meal in range(3):
+            api.call("POST", "/api/v1/nutrition/meals", headers=headers, record=False, json={
+                "category_id": user["category_id"],
+                "meal_date": day.isoformat(),
+                "meal_time": (started + timedelta(hours=2 + meal * 4)).isoformat(),
+                "items": [{"food_id": food_id, "servings": 1.5} for food_id in user["food_ids"][:2]],
+            })
+
+        api.call("POST", "/api/v1/measurements", headers=headers, record=False,
+                 json={"measurement_date": day.isoformat(), "weight": 180 - offset * 0.1})
+        api.call("POST", "/api/v1/supplements/log", headers=headers, record=False,
+                 json={"supplement_id": user["supplement_ids"][0], "log_date": day.isoformat()})
+        if offset % 7 == 0:
+            api.call("POST", "/api/v1/nutrition/cheat-days", headers=headers, record=False,
+                     json={"cheat_date": day.isoformat()})
+
+
+def _read_calls(ctx: dict) -> list:
+    """(method, route, params, expected status) for every read endpoint."""
+    today = ctx["today"]
+    return [
+        ("GET", "/", None, None),
+        ("GET", "/health", None, None),
+        ("GET", "/metrics", None, None),
+        ("GET", "/api/v1/admin/overview", None, None),
+        ("GET", "/api/v1/admin/user-growth", None, None),
+        ("GET", "/api/v1/admin/users", None, None),
+        ("GET", "/api/v1/admin/feature-adoption", None, None),
+        ("GET", "/api/v1/admin/principal-cache", None, None),
+        ("GET", "/api/v1/coaching/insight", None, 503),
+        ("GET", "/api/v1/coaching/daily-coaching", None, 503),
+        ("GET", "/api/v1/coaching/daily-coaching/stream", None, 503),
+        ("GET", "/api/v1/coaching/jobs/{job_id}", None, 404),
+        ("GET", "/api/v1/exercises", None, None),
+        ("GET", "/api/v1/measurements", None, None),
+        ("GET", "/api/v1/measurements/latest", None, None),
+        ("GET", "/api/v1/nutrition/meal-categories", None, None),
+        ("GET", "/api/v1/nutrition/foods", None, None),
+        ("GET", "/api/v1/nutrition/meals", {"start_date": ctx["month_ago"], "end_date": today}, None),
+        ("GET", "/api/v1/nutrition/meals/{meal_id}", None, None),
+        ("GET", "/api/v1/nutrition/summary", {"summary_date": ctx["yesterday"]}, None),
+        ("GET", "/api/v1/nutrition/weekly-average", {"end_date": today}, None),
+        ("GET", "/api/v1/nutrition/cheat-days/{cheat_date}", None, None),
+        ("GET", "/api/v1/nutrition/cheat-days", {"start_date": ctx["month_ago"], "end_date": today}, None),
+        ("GET", "/api/v1/user/settings", None, None),
+        ("GET", "/api/v1/supplements", None, None),
+        ("GET", "/api/v1/supplements/daily", None, None),
+        ("GET", "/api/v1/sync/changes", None, None),
+        ("GET", "/api/v1/workouts/templates", None, None),
+        ("GET", "/api/v1/workouts/templates/{template_id}", None, None),
+        ("GET", "/api/v1/workouts", {"start_date": ctx["month_ago"], "end_date": today}, None),
+        ("GET", "/api/v1/workouts/weekly-stats", {"end_date": today}, None),
+        ("GET", "/api/v1/workouts/last-completed", None, None),
+        ("GET", "/api/v1/workouts/recent-prs", None, None),
+        ("GET", "/api/v1/workouts/analytics/exercises/{exercise_id}", None, None),
+        ("GET", "/api/v1/workouts/{workout_id}", None, None),
+        ("GET", "/api/v1/workouts/{workout_id}/previous-performance", None, None),
+        ("GET", "/api/v1/workouts/{workout_id}/exercises/{exercise_id}/previous", None, None),
+    ]
+
+
+def _measure_reads(api: BudgetClient, headers: dict, ctx: dict) -> dict:
+    """Call each read endpoint twice and keep the warm count."""
+    counts = {}
+    for method, route, params, expect in _read_calls(ctx):
+        for _ in range(2):
+            api.call(method, route, headers=headers, expect=expect, ctx=ctx, params=params)
+        counts[f"{method} {route}"] = api.counts[f"{method} {route}"]
+    return counts
+
+
+def _measure_writes(api: BudgetClient, user: dict, today: str) -> None:
+    """Exercise every write endpoint once, in an order that supplies each one's ids."""
+    headers = user["headers"]
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+    now = datetime.now(timezone.utc).isoformat()
+    exercise_ids = user["exercise_ids"]
+    ids = {"cheat_date": today, "log_date": today}
+
+    def call(method, route, **kwargs):
+        return api.call(method, route, headers=headers, ctx=ids, **kwargs)
+
+    # Auth and settings
+    _register(api, f"budget-new-{uuid.uuid4().hex[:8]}@example.com", record=True)
+    tokens = api.call("POST", "/api/v1/auth/login", json={"email": user["email"], "password": PASSWORD})
+    api.call("POST", "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    call("PUT", "/api/v1/user/settings", json={"coach_type": "strategic"})
+
+    # Exercises (deleted at the end, once the workout using it is gone)
+    ids["exercise_id"] = call("POST", "/api/v1/exercises", json={"name": "Budget curl", "muscle_group": "arms"})["id"]
+    call("PUT", "/api/v1/exercises/{exercise_id}", json={"equipment": "dumbbell"})
+
+    # Measurements and supplements
+    ids["measurement_id"] = call("POST", "/api/v1/measurements", json={"measurement_date": today, "weight": 179.5})["id"]
+    call("DELETE", "/api/v1/measurements/{measurement_id}")
+    ids["supplement_id"] = call("POST", "/api/v1/supplements", json={"name": "Creatine", "dosage": "5 g"})["id"]
+    call("PUT", "/api/v1/supplements/{supplement_id}", json={"dosage": "3 g"})
+    call("POST", "/api/v1/supplements/log", json={"supplement_id": ids["supplement_id"], "log_date": today})
+    call("DELETE", "/api/v1/supplements/log/{supplement_id}/{log_date}")
+    call("DELETE", "/api/v1/supplements/{supplement_id}")
+
+    # Nutrition
+    ids["category_id"] = call("POST", "/api/v1/nutrition/meal-categories", json={"name": "Snack", "display_order": 4})["id"]
+    call("PUT", "/api/v1/nutrition/meal-categories/{category_id}", json={"display_order": 5})
+    ids["food_id"] = call("POST", "/api/v1/nutrition/foods", json={
+        "name": "Budget oats", "serving_size": "40 g", "calories": 150, "protein": 5, "carbs": 27, "fat": 3,
+    })["id"]
+    call("PUT", "/api/v1/nutrition/foods/{food_id}", json={"calories": 152})
+    meal = call("POST", "/api/v1/nutrition/meals", json={
+        "category_id": user["category_id"], "meal_date": today, "meal_time": now,
+        "items": [{"food_id": food_id, "servings": 1} for food_id in user["food_ids"]],
+    })
+    ids["meal_id"] = meal["id"]
+    ids["item_id"] = meal["items"][0]["id"]
+    call("POST", "/api/v1/nutrition/meals/{meal_id}/items", json={"food_id": ids["food_id"], "servings": 2})
+    call("PATCH", "/api/v1/nutrition/meals/{meal_id}", json={"category_id": ids["category_id"]})
+    call("POST", "/api/v1/nutrition/meals/{meal_id}/copy", json={"meal_date": yesterday, "meal_time": now})
+    call("PATCH", "/api/v1/nutrition/meal-items/{item_id}", json={"servings": 2.5})
+    call("DELETE", "/api/v1/nutrition/meal-items/{item_id}")
+    call("DELETE", "/api/v1/nutrition/meals/{meal_id}")
+    call("DELETE", "/api/v1/nutrition/foods/{food_id}")
+    call("DELETE", "/api/v1/nutrition/meal-categories/{category_id}")
+    call("POST", "/api/v1/nutrition/cheat-days", json={"cheat_date": today})
+    call("DELETE", "/api/v1/nutrition/cheat-days/{cheat_date}")
+
+    # Templates and workouts
+    ids["template_id"] = call("POST", "/api/v1/workouts/templates", json={
+        "name": "Budget day",
+        "exercises": [
+            {"exercise_id": exercise_id, "order_index": n, "target_sets": 3, "target_reps": 10}
+            for n, exercise_id in enumerate(exercise_ids[:6])
+        ],
+    })["id"]
+    call("PUT", "/api/v1/workouts/templates/{template_id}", json={"name": "Budget day A"})
+    workout = call("POST", "/api/v1/workouts", json={
+        "template_id": ids["template_id"], "workout_date": today, "started_at": now,
+    })
+    ids["workout_id"] = workout["id"]
+    ids["set_id"] = workout["sets"][0]["id"]
+    call("POST", "/api/v1/workouts/{workout_id}/sets", json={
+        "exercise_id": ids["exercise_id"], "set_number": 1, "weight": 30, "reps": 12,
+    })
+    call("PUT", "/api/v1/workouts/{workout_id}/sets/{set_id}", json={"weight": 105, "reps": 8, "is_completed": True})
+    call("POST", "/api/v1/workouts/{workout_id}/sets/batch", json={"update": [
+        {"id": s["id"], "weight": 100, "reps": 10, "is_completed": True} for s in workout["sets"][1:]
+    ]})
+    call("DELETE", "/api/v1/workouts/{workout_id}/sets/{set_id}")
+    call("POST", "/api/v1/workouts/{workout_id}/swap-exercise", json={
+        "old_exercise_id": exercise_ids[1], "new_exercise_id": exercise_ids[7],
+    })
+    call("POST", "/api/v1/workouts/{workout_id}/complete", json={"completed_at": now})
+    call("POST", "/api/v1/workouts/{workout_id}/save-as-template", json={"template_name": "Saved budget day"})
+    call("DELETE", "/api/v1/workouts/{workout_id}")
+    call("DELETE", "/api/v1/workouts/templates/{template_id}")
+    call("DELETE", "/api/v1/exercises/{exercise_id}")
+
+
+def _load_budgets() -> dict:
+    if not os.path.exists(BUDGET_FILE):
+        return {}
+    with open(BUDGET_FILE) as f:
+        return json.load(f)
+
+
+def check_query_budgets(update: bool = False) -> int:
+    if inspect(engine).get_table_names():
+        print("✗ Refusing to run: the database is not empty. Point this at a scratch database.")
+        return 1
+
+    alembic_config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    alembic_config.set_main_option("script_location", os.path.join(BACKEND_DIR, "app", "migrations"))
+    command.upgrade(alembic_config, "head")
+
+    failures = 0
+    try:
+        with TestClient(app) as client:
+            api = BudgetClient(client)
+            users = [_setup_user(api, n) for n in range(USERS)]
+            main = users[0]
+            db = SessionLocal()
+            try:
+                db.query(User).filter(User.email == main["email"]).one().is_admin = True
+                db.commit()
+            finally:
+                db.close()
+
+            for user in users:
+                _add_history(api, user, 1, INITIAL_DAYS)
+
+            today = date.today()
+            active = api.call("POST", "/api/v1/workouts", headers=main["headers"], record=False, json={
+                "template_id": main["template_ids"][0],
+                "workout_date": today.isoformat(),
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            })
+            meals = api.call("GET", "/api/v1/nutrition/meals", headers=main["headers"], record=False,
+                             params={"meal_date": (today - timedelta(days=1)).isoformat()})
+            ctx = {
+                "today": today.isoformat(),
+                "yesterday": (today - timedelta(days=1)).isoformat(),
+                "month_ago": (today - timedelta(days=30)).isoformat(),
+                "workout_id": active["id"],
+                "exercise_id": main["exercise_ids"][0],
+                "template_id": main["template_ids"][0],
+                "meal_id": meals[0]["id"],
+                "cheat_date": (today - timedelta(days=7)).isoformat(),
+                "job_id": str(uuid.uuid4()),
+            }
+
+            small = _measure_reads(api, main["headers"], ctx)
+            for user in users:
+                _add_history(api, user, 1 + INITIAL_DAYS, GROWTH_DAYS)
+            large = _measure_reads(api, main["headers"], ctx)
+            _measure_writes(api, main, ctx["today"])
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+
+    for route, count in small.items():
+        if large[route] > count:
+            print(f"✗ {route}: {count} -> {large[route]} queries as history grew (per-row queries?)")
+            failures += 1
+
+    exercised = set(api.counts)
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in route.methods - {"HEAD", "OPTIONS"}:
+            key = f"{method} {route.path}"
+            if key not in exercised and key not in SKIPPED:
+                print(f"✗ {key} is not exercised; add it to this script or to SKIPPED")
+                failures += 1
+
+    if update:
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(dict(sorted(api.counts.items())), f, indent=2)
+            f.write("\n")
+        print(f"✓ Wrote budgets for {len(api.counts)} routes to {os.path.relpath(BUDGET_FILE, BACKEND_DIR)}")
+    else:
+        budgets = _load_budgets()
+        for route, count in sorted(api.counts.items()):
+            budget = budgets.get(route)
+            if budget is None:
+                print(f"✗ {route}: {count} queries, no budget (run with --update)")
+                failures += 1
+            elif count > budget:
+                print(f"✗ {route}: {count} queries, budget {budget}")
+                failures += 1
+
+    if failures:
+        print(f"✗ {failures} query budget check(s) failed")
+        return 1
+    print(f"✓ {len(api.counts)} routes within their query budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(check_query_budgets(update="--update" in sys.argv[2:]))
@@ -0,0 +1,128 @@
+"""Fail if a hot endpoint query can only be served by a sequential scan.
+
+Usage:
+    python scripts/check_query_plans.py <email>
+
+Runs EXPLAIN for the query shapes behind the dashboard, workout and
+nutrition endpoints using the given user's data, with sequential scans
+disabled so the planner must use an index if one fits. Any remaining
+Seq Scan on a checked table means the query shape has no usable index.
+Exits non-zero on a regression.
+"""
+import sys
+import os
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+
+from app.database import SessionLocal, engine
+from app.models.user import User
+from app.models.exercise import WorkoutTemplate, TemplateExercise
+from app.models.workout import Workout, Set, PersonalRecord
+from app.models.nutrition import Meal, MealItem, DailyNutritionTotal
+
+
+CHECKED_TABLES = {"sets", "meal_items", "template_exercises", "meals", "workouts", "personal_records",
+                  "daily_nutrition_totals"}
+
+
+def _endpoint_queries(db, user_id):
+    """(label, statement) pairs mirroring the endpoint queries."""
+    today = date.today()
+    workout = db.query(Workout).filter(Workout.user_id == user_id).order_by(Workout.workout_date.desc()).first()
+    meal = db.query(Meal).filter(Meal.user_id == user_id).order_by(Meal.meal_date.desc()).first()
+    template = db.query(WorkoutTemplate).filter(WorkoutTemplate.user_id == user_id).first()
+    exercise_id = db.query(Set.exercise_id).filter(Set.workout_id == workout.id).scalar() if workout else None
+
+    completed = select(Workout.id).where(
+        Workout.user_id == user_id,
+        Workout.deleted_at.is_(None),
+        Workout.completed_at.isnot(None),
+        Workout.workout_date >= today - timedelta(days=6),
+    )
+    queries = [
+        ("GET /workouts/recent-prs", select(PersonalRecord).where(
+            PersonalRecord.user_id == user_id,
+            PersonalRecord.achieved_date >= today - timedelta(days=30),
+        ).order_by(PersonalRecord.achieved_date.desc()).limit(5)),
+        ("GET /workouts/weekly-stats", select(
+            func.sum(func.coalesce(Set.weight, 0) * func.coalesce(Set.reps, 0)),
+            func.count(Set.id),
+        ).where(Set.workout_id.in_(completed), Set.is_completed == True)),
+        ("GET /workouts (history)", select(Workout).where(
+            Workout.user_id == user_id,
+            Workout.deleted_at.is_(None),
+            Workout.workout_date >= today - timedelta(days=30),
+        ).order_by(Workout.workout_date.desc())),
+        ("GET /nutrition/summary", select(DailyNutritionTotal).where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.total_date == today,
+        )),
+        ("GET /nutrition/weekly-average", select(DailyNutritionTotal).where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.total_date >= today - timedelta(days=6),
+            DailyNutritionTotal.total_date <= today,
+        )),
+    ]
+    if workout:
+        queries.append(("GET /workouts/{id} (sets)", select(Set).where(Set.workout_id == workout.id)))
+    if workout and exercise_id:
+        queries.append(("GET /workouts/{id}/exercises/{id}/previous", select(Workout.id).join(
+            Set, Set.workout_id == Workout.id
+        ).where(
+            Workout.user_id == user_id,
+            Workout.deleted_at.is_(None),
+            Workout.completed_at.isnot(None),
+            Workout.workout_date < workout.workout_date,
+            Set.exercise_id == exercise_id,
+        ).order_by(Workout.workout_date.desc()).limit(1)))
+    if meal:
+        queries.append(("GET /nutrition/meals/{id} (items)", select(MealItem).where(MealItem.meal_id == meal.id)))
+    if template:
+        queries.append(("GET /workouts/templates/{id} (exercises)", select(TemplateExercise).where(
+            TemplateExercise.template_id == template.id
+        ).order_by(TemplateExercise.order_index)))
+    return queries
+
+
+def _seq_scans(plan_node):
+    """Yield relation names of every Seq Scan node in a JSON plan tree."""
+    if plan_node.get("Node Type") == "Seq Scan":
+        yield plan_node.get("Relation Name")
+    for child in plan_node.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def check_query_plans(email: str) -> int:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            print(f"User not found: {email}")
+            return 1
+
+        failures = 0
+        conn = db.connection()
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for label, stmt in _endpoint_queries(db, user.id):
+            compiled = stmt.compile(dialect=engine.dialect)
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+            scanned = sorted(set(_seq_scans(plan[0]["Plan"])) & CHECKED_TABLES)
+            if scanned:
+                failures += 1
+                print(f"✗ {label}: sequential scan on {', '.join(scanned)}")
+            else:
+                print(f"✓ {label}")
+        return 1 if failures else 0
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/check_query_plans.py <email>")
+        sys.exit(1)
+    sys.exit(check_query_plans(sys.argv[1]))
@@ -0,0 +1,77 @@
+"""Check that read sessions reach the replica and writes reach the primary.
+
+Usage:
+    READ_REPLICA_URL=postgresql://... python scripts/check_read_replica.py
+
+Connects through every session factory in app.database and reports which
+server each one lands on. Without READ_REPLICA_URL the read factories
+should share the primary's server. Also reports the pool settings in use.
+"""
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal, SessionLocal
+
+SERVER = text("SELECT inet_server_addr()::text, current_setting('port'), pg_is_in_recovery()")
+
+
+def _sync_server(factory):
+    db = factory()
+    try:
+        return tuple(db.execute(SERVER).one())
+    finally:
+        db.close()
+
+
+async def _async_server(factory):
+    async with factory() as db:
+        return tuple((await db.execute(SERVER)).one())
+
+
+def check_read_replica() -> int:
+    print(
+        f"Pools: size {settings.DB_POOL_SIZE}, overflow {settings.DB_MAX_OVERFLOW}, "
+        f"timeout {settings.DB_POOL_TIMEOUT_SECONDS}s, recycle {settings.DB_POOL_RECYCLE_SECONDS}s, "
+        f"pre-ping {settings.DB_POOL_PRE_PING}"
+    )
+    servers = {
+        "primary": _sync_server(SessionLocal),
+        "primary (async)": asyncio.run(_async_server(AsyncSessionLocal)),
+        "read": _sync_server(ReadSessionLocal),
+        "read (async)": asyncio.run(_async_server(AsyncReadSessionLocal)),
+    }
+    for name, (host, port, in_recovery) in servers.items():
+        print(f"  {name:16} {host or 'local socket'}:{port}{' (standby)' if in_recovery else ''}")
+
+    failures = 0
+    primary = servers["primary"]
+    if servers["primary (async)"] != primary:
+        print("✗ Sync and async primary sessions reach different servers")
+        failures += 1
+    if primary[2]:
+        print("✗ The primary is a standby; writes will fail")
+        failures += 1
+
+    for name in ("read", "read (async)"):
+        if settings.READ_REPLICA_URL and servers[name] == primary:
+            print(f"✗ {name} sessions reach the primary although READ_REPLICA_URL is set")
+            failures += 1
+        elif not settings.READ_REPLICA_URL and servers[name] != primary:
+            print(f"✗ {name} sessions should share the primary without READ_REPLICA_URL")
+            failures += 1
+
+    if failures:
+        return 1
+    target = "the replica" if settings.READ_REPLICA_URL else "the primary (no replica configured)"
+    print(f"✓ Writes go to the primary; reads go to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(check_read_replica())
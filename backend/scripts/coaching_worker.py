@@ -0,0 +1,77 @@
+"""Run the background coaching worker.
+
+Usage:
+    python scripts/coaching_worker.py [--once] [--fake-llm]
+
+Claims queued coaching jobs (FOR UPDATE SKIP LOCKED, so several workers can
+run side by side) and generates them, COACHING_WORKER_CONCURRENCY at a time.
+Once a minute it also requeues jobs abandoned by a dead worker and queues
+the day's coaching for active users whose local time has passed
+COACHING_PREGENERATE_HOUR.
+
+--once drains the due jobs and exits (useful from cron); --fake-llm answers
+with llm.FakeProvider's canned text instead of calling Gemini.
+"""
+import sys
+import os
+import asyncio
+import logging
+import signal
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services import coaching_jobs, llm
+
+
+SCHEDULE_INTERVAL_SECONDS = 60
+
+logger = logging.getLogger("coaching_worker")
+
+
+async def _housekeeping() -> None:
+    async with AsyncSessionLocal() as db:
+        stale = await coaching_jobs.requeue_stale(db)
+        queued = await coaching_jobs.schedule_pregeneration(db)
+    if stale or queued:
+        logger.info(f"Requeued {stale} stale job(s), queued {queued} pre-generation job(s)")
+
+
+async def run_worker(once: bool = False, fake_llm: bool = False) -> None:
+    llm.start_client(llm.FakeProvider() if fake_llm else None)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    last_housekeeping = 0.0
+    while not stop.is_set():
+        if time.monotonic() - last_housekeeping >= SCHEDULE_INTERVAL_SECONDS:
+            await _housekeeping()
+            last_housekeeping = time.monotonic()
+
+        claimed = await coaching_jobs.run_due_jobs(settings.COACHING_WORKER_CONCURRENCY)
+        if claimed:
+            logger.info(f"Ran {claimed} coaching job(s)")
+            continue
+        if once:
+            break
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.COACHING_WORKER_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if any(arg not in ("--once", "--fake-llm") for arg in args):
+        print("Usage: python scripts/coaching_worker.py [--once] [--fake-llm]")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    asyncio.run(run_worker(
+        once="--once" in args,
+        fake_llm="--fake-llm" in args,
+    ))
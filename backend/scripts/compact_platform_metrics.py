@@ -0,0 +1,60 @@
+"""Recompute the admin dashboard's platform metrics from source tables.
+
+Usage:
+    python scripts/compact_platform_metrics.py [--every SECONDS]
+
+Collapses the sharded counters into exact values, refreshes the
+feature-adoption counts, refills the last 31 days of user activity and
+prunes older activity rows. The write paths keep the totals current
+between runs, but removals and activity pruning rely on this job, so run
+it on a schedule: --every 3600 loops forever (the metrics_compactor
+service in docker-compose.prod.yml), or from cron:
+
+    0 * * * * cd /path/to/backend && venv/bin/python scripts/compact_platform_metrics.py
+
+Safe to re-run at any time.
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.platform_metrics import compact_platform_metrics as compact
+
+
+def compact_platform_metrics() -> int:
+    db = SessionLocal()
+    try:
+        values = compact(db)
+        db.commit()
+        for name, value in sorted(values.items()):
+            print(f"  {name:<36}{value:>10}")
+        print(f"✓ Compacted {len(values)} platform counters")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Failed to compact platform metrics: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def compact_every(seconds: float) -> None:
+    while True:
+        try:
+            compact_platform_metrics()
+        except Exception:
+            pass  # Already reported; the next run retries
+        sys.stdout.flush()
+        time.sleep(seconds)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--every":
+        compact_every(float(sys.argv[2]))
+    elif len(sys.argv) != 1:
+        print("Usage: python scripts/compact_platform_metrics.py [--every SECONDS]")
+        sys.exit(1)
+    sys.exit(compact_platform_metrics())
@@ -0,0 +1,44 @@
+"""Import an Open Food Facts dump into the local barcode catalogue.
+
+Usage:
+    python scripts/import_off_dump.py <dump_path> [batch_size]
+
+Accepts the JSONL product export (openfoodfacts-products.jsonl.gz) or the
+tab-separated CSV export (en.openfoodfacts.org.products.csv.gz), gzipped
+or not. Products are normalized per serving like live lookups and upserted
+into food_catalog by barcode, committing every ``batch_size`` rows
+(default 5000), so an interrupted import can be rerun. Barcode lookups
+answer from the catalogue first while OFF_LOCAL_CATALOG is on.
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine
+from app.services import off_import
+
+
+def import_off_dump(path: str, batch_size: int) -> None:
+    started = time.perf_counter()
+
+    def progress(stats: off_import.ImportStats) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"  {stats.read:,} read, {stats.loaded:,} loaded, {stats.skipped:,} skipped ({stats.read / elapsed:,.0f} rows/s)")
+
+    with engine.connect() as conn:
+        stats = off_import.import_dump(conn, path, batch_size, on_batch=progress)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Imported {stats.loaded:,} products from {stats.read:,} rows in {elapsed:.1f}s ({stats.skipped:,} skipped)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python scripts/import_off_dump.py <dump_path> [batch_size]")
+        sys.exit(1)
+    if not os.path.exists(sys.argv[1]):
+        print(f"✗ No such file: {sys.argv[1]}")
+        sys.exit(1)
+    import_off_dump(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else off_import.DEFAULT_BATCH_SIZE)
@@ -0,0 +1,94 @@
+"""Concurrency load test for the async routes.
+
+Usage:
+    python scripts/load_test_async_routes.py <base_url> <email> <password> [concurrency] [requests]
+
+Fires parallel requests at the supplements, measurements and cached
+coaching endpoints while probing /health, and reports p50/p95/p99 latency
+for both. When a route blocks the event loop, /health latency climbs with
+the DB routes; run against a build before and after a change to compare.
+"""
+import asyncio
+import sys
+import time
+from typing import List
+
+import httpx
+
+
+ENDPOINTS = [
+    "/api/v1/supplements",
+    "/api/v1/supplements/daily",
+    "/api/v1/measurements",
+    "/api/v1/measurements/latest",
+]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(label: str, samples: List[float]) -> None:
+    if not samples:
+        print(f"{label}: no samples")
+        return
+    print(
+        f"{label}: n={len(samples)} "
+        f"p50 {_percentile(samples, 50):.1f} ms | "
+        f"p95 {_percentile(samples, 95):.1f} ms | "
+        f"p99 {_percentile(samples, 99):.1f} ms"
+    )
+
+
+async def _timed_get(client: httpx.AsyncClient, path: str, samples: List[float]) -> None:
+    started = time.perf_counter()
+    response = await client.get(path)
+    response.raise_for_status()
+    samples.append((time.perf_counter() - started) * 1000)
+
+
+async def load_test(base_url: str, email: str, password: str, concurrency: int, total: int) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        login = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        route_samples: List[float] = []
+        health_samples: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+
+        async def worker(i: int) -> None:
+            async with semaphore:
+                await _timed_get(client, ENDPOINTS[i % len(ENDPOINTS)], route_samples)
+
+        async def probe_health() -> None:
+            while not done.is_set():
+                await _timed_get(client, "/health", health_samples)
+                await asyncio.sleep(0.01)
+
+        probe = asyncio.create_task(probe_health())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    print(f"{total} requests at concurrency {concurrency} in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    _report("DB routes", route_samples)
+    _report("/health during load", health_samples)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (4, 5, 6):
+        print("Usage: python scripts/load_test_async_routes.py <base_url> <email> <password> [concurrency] [requests]")
+        sys.exit(1)
+    asyncio.run(load_test(
+        sys.argv[1],
+        sys.argv[2],
+        sys.argv[3],
+        int(sys.argv[4]) if len(sys.argv) >= 5 else 50,
+        int(sys.argv[5]) if len(sys.argv) == 6 else 1000,
+    ))
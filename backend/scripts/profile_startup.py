@@ -0,0 +1,85 @@
+"""Profile API startup: the import tree and the lifespan steps.
+
+Usage:
+    python scripts/profile_startup.py [min_ms]
+
+Imports app.main in a fresh interpreter under ``-X importtime`` and prints
+the import tree, keeping modules whose cumulative time is at least
+``min_ms`` (default 5), followed by the slowest modules by self time.
+Then it runs the app's lifespan startup in this process and prints the
+duration of each step it records (seeding, client setup). Seeding needs
+the database in DATABASE_URL; set SEED_ON_STARTUP=false to skip it.
+"""
+import sys
+import os
+import asyncio
+import re
+import subprocess
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+SLOWEST = 15
+
+
+def _import_times():
+    """(depth, module, self ms, cumulative ms) in import order, parents after their children."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(1)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((len(indent) // 2, module, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def _print_tree(rows, min_ms: float) -> None:
+    # -X importtime lists a module after everything it imported; reverse for a top-down tree
+    for depth, module, _, cumulative_ms in reversed(rows):
+        if cumulative_ms >= min_ms:
+            print(f"{cumulative_ms:>9.1f}  {'  ' * depth}{module}")
+
+
+async def _lifespan_timings():
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return imported - started, ready - imported, app.state.startup_timings
+
+
+def profile_startup(min_ms: float) -> None:
+    rows = _import_times()
+    total_ms = sum(cumulative for depth, _, _, cumulative in rows if depth == 0)
+    print(f"Import tree (cumulative ms, modules >= {min_ms:g} ms):")
+    _print_tree(rows, min_ms)
+
+    print(f"\nSlowest modules by self time (of {len(rows)} imported, {total_ms:.0f} ms total):")
+    for _, module, self_ms, _ in sorted(rows, key=lambda row: row[2], reverse=True)[:SLOWEST]:
+        print(f"{self_ms:>9.1f}  {module}")
+
+    import_s, startup_s, steps = asyncio.run(_lifespan_timings())
+    print("\nStartup (ms):")
+    print(f"{import_s * 1000:>9.1f}  import app.main (warm bytecode, this process)")
+    for name, seconds in steps.items():
+        print(f"{seconds * 1000:>9.1f}  {name}")
+    print(f"{startup_s * 1000:>9.1f}  lifespan startup total")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python scripts/profile_startup.py [min_ms]")
+        sys.exit(1)
+    profile_startup(float(sys.argv[1]) if len(sys.argv) == 2 else 5.0)
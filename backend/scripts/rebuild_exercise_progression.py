@@ -0,0 +1,45 @@
+"""Rebuild the weekly exercise progression rollup from workout history.
+
+Usage:
+    python scripts/rebuild_exercise_progression.py [email]
+
+Rebuilds every user's weekly stats, or just one user's when an email is given.
+Safe to re-run at any time.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.exercise_progression import rebuild_exercise_progression
+
+
+def rebuild_progression(email: str = None):
+    db = SessionLocal()
+    try:
+        user_id = None
+        if email:
+            user = db.query(User).filter(User.email == email).first()
+            if not user:
+                print(f"User not found: {email}")
+                sys.exit(1)
+            user_id = user.id
+
+        count = rebuild_exercise_progression(db, user_id)
+        db.commit()
+        print(f"✓ Rebuilt {count} weekly exercise stats")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Failed to rebuild exercise progression: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python scripts/rebuild_exercise_progression.py [email]")
+        sys.exit(1)
+    rebuild_progression(sys.argv[1] if len(sys.argv) == 2 else None)
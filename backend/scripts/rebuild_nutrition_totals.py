@@ -0,0 +1,61 @@
+"""Rebuild or verify the daily nutrition rollup against raw meal rows.
+
+Usage:
+    python scripts/rebuild_nutrition_totals.py [--verify] [email]
+
+Without --verify, recomputes every user's daily totals (or one user's when
+an email is given) from meals and meal items. With --verify, only reports
+days where the rollup disagrees with the raw rows and exits non-zero if
+any are found. Safe to re-run at any time.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.nutrition_totals import rebuild_daily_totals, verify_daily_totals
+
+
+def rebuild_nutrition_totals(email: str = None, verify: bool = False) -> int:
+    db = SessionLocal()
+    try:
+        user_id = None
+        if email:
+            user = db.query(User).filter(User.email == email).first()
+            if not user:
+                print(f"User not found: {email}")
+                return 1
+            user_id = user.id
+
+        if verify:
+            mismatches = verify_daily_totals(db, user_id)
+            for mismatch_user, day, detail in mismatches:
+                print(f"✗ {mismatch_user} {day}: {detail}")
+            if mismatches:
+                print(f"✗ {len(mismatches)} day(s) out of sync — rerun without --verify to rebuild")
+                return 1
+            print("✓ Daily nutrition totals match raw meal rows")
+            return 0
+
+        count = rebuild_daily_totals(db, user_id)
+        db.commit()
+        print(f"✓ Rebuilt {count} daily nutrition totals")
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Failed to rebuild daily nutrition totals: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    verify = "--verify" in args
+    args = [arg for arg in args if arg != "--verify"]
+    if len(args) > 1:
+        print("Usage: python scripts/rebuild_nutrition_totals.py [--verify] [email]")
+        sys.exit(1)
+    sys.exit(rebuild_nutrition_totals(args[0] if args else None, verify))
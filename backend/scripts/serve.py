@@ -0,0 +1,43 @@
+"""Start the API server in the mode chosen by SERVER_MODE.
+
+Usage:
+    python scripts/serve.py
+
+single: one uvicorn process, which seeds reference data at startup.
+multi:  gunicorn preloads the app, seeds once under an advisory lock, and
+        forks WEB_CONCURRENCY uvicorn workers (see gunicorn.conf.py).
+
+Both drain in-flight requests for GRACEFUL_TIMEOUT_SECONDS on SIGTERM.
+"""
+import sys
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.config import settings
+
+
+def serve():
+    os.chdir(BACKEND_DIR)
+    if settings.SERVER_MODE == "multi":
+        args = ["gunicorn", "--config", "gunicorn.conf.py", "app.main:app"]
+    elif settings.SERVER_MODE == "single":
+        args = [
+            "uvicorn", "app.main:app",
+            "--host", settings.SERVER_HOST,
+            "--port", str(settings.SERVER_PORT),
+            "--timeout-keep-alive", str(settings.KEEPALIVE_SECONDS),
+            "--timeout-graceful-shutdown", str(settings.GRACEFUL_TIMEOUT_SECONDS),
+        ]
+    else:
+        print(f"Unknown SERVER_MODE {settings.SERVER_MODE!r}; use 'single' or 'multi'")
+        sys.exit(1)
+
+    print(f"Starting API server ({settings.SERVER_MODE} mode)")
+    # Replace this process so the server receives the container's signals directly
+    os.execvp(args[0], args)
+
+
+if __name__ == "__main__":
+    serve()
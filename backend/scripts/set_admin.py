@@ -2,6 +2,9 @@
 
 Usage:
     python scripts/set_admin.py <email>
+
+Running API workers cache principals, so the new role takes effect there
+within PRINCIPAL_CACHE_TTL_SECONDS.
 """
 import sys
 import os
@@ -0,0 +1,84 @@
+"""Local stand-in for the Open Food Facts API.
+
+Usage:
+    python scripts/stub_open_food_facts.py [port] [delay_ms]
+
+Serves canned responses for /api/v2/product/<barcode>.json and
+/cgi/search.pl so the proxy and its cache can be exercised without the
+live API. Run the backend with OPEN_FOOD_FACTS_BASE_URL=http://127.0.0.1:<port>.
+Barcodes starting with 0 are reported as unknown. Every upstream request
+is logged with a running count, which makes cache hits and coalesced
+requests easy to see; delay_ms slows responses so concurrent lookups
+overlap.
+"""
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+DELAY_SECONDS = 0.0
+REQUEST_COUNT = 0
+
+
+def _product(barcode: str) -> dict:
+    return {
+        "code": barcode,
+        "product_name": f"Stub Product {barcode}",
+        "brands": "Stub Foods",
+        "serving_size": "30g",
+        "serving_quantity": 30,
+        "nutriments": {
+            "energy-kcal_100g": 400,
+            "proteins_100g": 20,
+            "carbohydrates_100g": 50,
+            "fat_100g": 10,
+        },
+        "image_url": None,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        global REQUEST_COUNT
+        REQUEST_COUNT += 1
+        print(f"[{REQUEST_COUNT}] GET {self.path}")
+        time.sleep(DELAY_SECONDS)
+
+        url = urlparse(self.path)
+        if url.path.startswith("/api/v2/product/") and url.path.endswith(".json"):
+            barcode = url.path[len("/api/v2/product/"):-len(".json")]
+            if barcode.startswith("0"):
+                self._send(404, {"status": 0, "status_verbose": "product not found"})
+            else:
+                self._send(200, {"status": 1, "product": _product(barcode)})
+        elif url.path == "/cgi/search.pl":
+            params = parse_qs(url.query)
+            page_size = int(params.get("page_size", ["20"])[0])
+            term = params.get("search_terms", [""])[0]
+            products = [_product(f"{abs(hash(term)) % 10**12:012d}{i}") for i in range(min(page_size, 5))]
+            self._send(200, {"count": len(products), "products": products})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: python scripts/stub_open_food_facts.py [port] [delay_ms]")
+        sys.exit(1)
+    port = int(sys.argv[1]) if len(sys.argv) >= 2 else 8081
+    DELAY_SECONDS = (int(sys.argv[2]) if len(sys.argv) == 3 else 0) / 1000
+    print(f"✓ Stub Open Food Facts listening on http://127.0.0.1:{port}")
+    ThreadingHTTPServer(("127.0.0.1", port), StubHandler).serve_forever()
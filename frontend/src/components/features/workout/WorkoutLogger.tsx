@@ -6,6 +6,7 @@ import {
   completeWorkout,
   saveWorkoutAsTemplate,
   getPreviousPerformance,
+  getWorkoutPreviousPerformance,
   deleteWorkout,
   getTemplate,
   updateTemplate,
@@ -130,22 +131,18 @@ export const WorkoutLogger: React.FC<WorkoutLoggerProps> = ({
     const fetchPreviousPerformance = async () => {
       if (!workout) return;
 
+      // Skip if every exercise was already fetched
       const exerciseIds = new Set(workout.sets.map((s) => s.exercise_id));
+      if ([...exerciseIds].every((id) => previousPerformance[id])) return;
 
-      for (const exerciseId of exerciseIds) {
-        // Skip if already fetched
-        if (previousPerformance[exerciseId]) continue;
-
-        try {
-          const previous = await getPreviousPerformance(workout.id, exerciseId);
-          setPreviousPerformance((prev) => ({
-            ...prev,
-            [exerciseId]: previous,
-          }));
-        } catch (error) {
-          console.error('Failed to fetch previous performance:', error);
+      const results = await getWorkoutPreviousPerformance(workout.id);
+      setPreviousPerformance((prev) => {
+        const next = { ...prev };
+        for (const previous of results) {
+          next[previous.exercise_id] = previous;
         }
-      }
+        return next;
+      });
     };
 
     fetchPreviousPerformance();
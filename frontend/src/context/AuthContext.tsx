@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import api from '../services/api';
+import { syncTimezone } from '../services/settings.service';
 import { User, LoginCredentials, RegisterData, TokenResponse } from '../types/auth';
 
 interface AuthContextType {
@@ -32,6 +33,12 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
     setLoading(false);
   }, []);
 
+  useEffect(() => {
+    if (user) {
+      syncTimezone().catch(() => undefined);
+    }
+  }, [user]);
+
   const login = async (credentials: LoginCredentials) => {
     const response = await api.post<TokenResponse>('/auth/login', credentials);
     const { access_token, refresh_token } = response.data;
@@ -59,6 +66,7 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
   const logout = () => {
     localStorage.removeItem('access_token');
     localStorage.removeItem('refresh_token');
+    localStorage.removeItem('timezone');
     setUser(null);
   };
 
@@ -55,6 +55,8 @@ export const AdminPage: React.FC = () => {
   const [growth, setGrowth] = useState<UserGrowthPoint[]>([]);
   const [users, setUsers] = useState<UserDetailRow[]>([]);
   const [totalUsers, setTotalUsers] = useState(0);
+  const [usersCursor, setUsersCursor] = useState<string | null>(null);
+  const [loadingMoreUsers, setLoadingMoreUsers] = useState(false);
   const [adoption, setAdoption] = useState<FeatureAdoption | null>(null);
   const [loading, setLoading] = useState(true);
 
@@ -70,6 +72,7 @@ export const AdminPage: React.FC = () => {
       setGrowth(growthData.data_points);
       setUsers(userData.users);
       setTotalUsers(userData.total);
+      setUsersCursor(userData.next_cursor);
       setAdoption(adoptionData);
     } catch (err) {
       console.error('Failed to fetch admin data:', err);
@@ -82,6 +85,21 @@ export const AdminPage: React.FC = () => {
     fetchData();
   }, [fetchData]);
 
+  const loadMoreUsers = async () => {
+    if (!usersCursor) return;
+    setLoadingMoreUsers(true);
+    try {
+      const userData = await getUserList(usersCursor);
+      setUsers((prev) => [...prev, ...userData.users]);
+      setTotalUsers(userData.total);
+      setUsersCursor(userData.next_cursor);
+    } catch (err) {
+      console.error('Failed to fetch more users:', err);
+    } finally {
+      setLoadingMoreUsers(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="min-h-screen pb-20">
@@ -243,6 +261,15 @@ export const AdminPage: React.FC = () => {
               </tbody>
             </table>
           </div>
+          {usersCursor && (
+            <button
+              onClick={loadMoreUsers}
+              disabled={loadingMoreUsers}
+              className="btn btn-secondary w-full mt-4"
+            >
+              {loadingMoreUsers ? 'Loading...' : `Load more (${users.length} of ${totalUsers})`}
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { Header } from '../components/layout/Header';
-import { getDailyCoaching } from '../services/coaching.service';
+import { streamDailyCoaching } from '../services/coaching.service';
 import { DailyCoaching, COACH_OPTIONS } from '../types/coaching';
 
 export const CoachingPage: React.FC = () => {
@@ -12,7 +12,23 @@ export const CoachingPage: React.FC = () => {
     try {
       setLoading(true);
       setError(false);
-      const data = await getDailyCoaching();
+      setCoaching(null);
+      const data = await streamDailyCoaching((section, delta) => {
+        // Show sections as they stream in; the final payload replaces them
+        setLoading(false);
+        setCoaching((current) => {
+          const partial = current || {
+            coach_name: '',
+            coach_title: '',
+            coach_type: '',
+            summary: '',
+            workout_tips: '',
+            nutrition_tips: '',
+            generated_at: new Date().toISOString(),
+          };
+          return { ...partial, [section]: (partial[section] + delta).trimStart() };
+        });
+      });
       setCoaching(data);
     } catch {
       setError(true);
@@ -16,8 +16,8 @@ export const getUserGrowth = async (days: number = 30): Promise<UserGrowthRespon
   return response.data;
 };
 
-export const getUserList = async (): Promise<UserListResponse> => {
-  const response = await api.get('/admin/users');
+export const getUserList = async (cursor?: string): Promise<UserListResponse> => {
+  const response = await api.get('/admin/users', { params: cursor ? { cursor } : {} });
   return response.data;
 };
 
@@ -1,12 +1,95 @@
 import api from './api';
-import { CoachInsight, DailyCoaching } from '../types/coaching';
+import { CoachInsight, CoachingJob, CoachingPending, DailyCoaching } from '../types/coaching';
+
+const MAX_WAIT_MS = 120_000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Coaching is generated by a background worker: a 202 means it is queued,
+// so poll the job until it finishes, then fetch the coaching again.
+const getGeneratedCoaching = async <T>(path: string): Promise<T> => {
+  const deadline = Date.now() + MAX_WAIT_MS;
+  for (;;) {
+    const response = await api.get<T | CoachingPending>(path);
+    if (response.status !== 202) {
+      return response.data as T;
+    }
+
+    const pending = response.data as CoachingPending;
+    let job: CoachingJob;
+    do {
+      if (Date.now() > deadline) {
+        throw new Error('Coaching is taking longer than expected');
+      }
+      await sleep(pending.retry_after_seconds * 1000);
+      job = (await api.get<CoachingJob>(`/coaching/jobs/${pending.job_id}`)).data;
+    } while (job.status === 'pending' || job.status === 'running');
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Failed to generate coaching');
+    }
+  }
+};
 
 export const getCoachInsight = async (): Promise<CoachInsight> => {
-  const response = await api.get('/coaching/insight');
-  return response.data;
+  return getGeneratedCoaching<CoachInsight>('/coaching/insight');
 };
 
 export const getDailyCoaching = async (): Promise<DailyCoaching> => {
-  const response = await api.get('/coaching/daily-coaching');
-  return response.data;
+  return getGeneratedCoaching<DailyCoaching>('/coaching/daily-coaching');
+};
+
+type CoachingSection = 'summary' | 'workout_tips' | 'nutrition_tips';
+
+// Streams today's coaching over Server-Sent Events, calling onSection with
+// each text delta as it is generated. Falls back to getDailyCoaching when
+// the stream can't be opened (e.g. an expired token, which axios refreshes).
+export const streamDailyCoaching = async (
+  onSection: (section: CoachingSection, delta: string) => void
+): Promise<DailyCoaching> => {
+  const token = localStorage.getItem('access_token');
+  const response = await fetch(`${api.defaults.baseURL}/coaching/daily-coaching/stream`, {
+    headers: {
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+  }).catch(() => null);
+  if (!response || !response.ok || !response.body) {
+    return getDailyCoaching();
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) {
+      throw new Error('Coaching stream ended unexpectedly');
+    }
+    buffer += value;
+
+    let boundary: number;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      for (const line of message.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === 'section') {
+        onSection(payload.section, payload.delta);
+      } else if (event === 'done') {
+        await reader.cancel();
+        return payload as DailyCoaching;
+      } else if (event === 'error') {
+        await reader.cancel();
+        throw new Error(payload.detail || 'Failed to generate coaching');
+      }
+    }
+  }
 };
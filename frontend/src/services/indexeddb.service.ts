@@ -104,6 +104,7 @@ export const clearAllData = async () => {
   await db.nutritionSummaries.clear();
   await db.cheatDays.clear();
   await db.syncQueue.clear();
+  localStorage.removeItem('syncCursor');
 };
 
 // Get unsynced queue items
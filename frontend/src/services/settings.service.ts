@@ -12,3 +12,11 @@ export const updateUserSettings = async (
   const response = await api.put('/user/settings', data);
   return response.data;
 };
+
+// Coaching days follow the user's timezone; tell the server when the browser's changes
+export const syncTimezone = async (): Promise<void> => {
+  const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
+  if (!timezone || localStorage.getItem('timezone') === timezone) return;
+  await updateUserSettings({ timezone });
+  localStorage.setItem('timezone', timezone);
+};
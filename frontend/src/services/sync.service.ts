@@ -6,6 +6,20 @@ import {
   markAsError,
   SyncQueueItem,
 } from './indexeddb.service';
+import { Exercise, WorkoutTemplate, Workout } from '../types/workout';
+import { Food, Meal, MealCategory } from '../types/nutrition';
+
+interface SyncChangesResponse {
+  exercises: Exercise[];
+  foods: Food[];
+  meal_categories: MealCategory[];
+  templates: WorkoutTemplate[];
+  workouts: Workout[];
+  meals: Meal[];
+  deleted: { entity: string; id: string }[];
+  next_cursor: string;
+  has_more: boolean;
+}
 
 export interface SyncStatus {
   isSyncing: boolean;
@@ -116,80 +130,8 @@ class SyncService {
     }
 
     try {
-      // Pull exercises
-      const exercisesRes = await api.get('/exercises?limit=500');
-      if (exercisesRes.data) {
-        await db.exercises.bulkPut(exercisesRes.data);
-      }
-
-      // Pull workout templates
-      const templatesRes = await api.get('/workouts/templates');
-      if (templatesRes.data) {
-        await db.workoutTemplates.bulkPut(templatesRes.data);
-      }
-
-      // Pull recent workouts (last 30 days)
-      const thirtyDaysAgo = new Date();
-      thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-      const workoutsRes = await api.get(
-        `/workouts?start_date=${thirtyDaysAgo.toISOString().split('T')[0]}`
-      );
-      if (workoutsRes.data) {
-        await db.workouts.bulkPut(workoutsRes.data);
-
-        // Pull full details (with sets) for each recent workout
-        // to populate the sets table for offline access
-        for (const workout of workoutsRes.data) {
-          try {
-            const fullWorkout = await api.get(`/workouts/${workout.id}`);
-            if (fullWorkout.data) {
-              await db.workouts.put(fullWorkout.data);
-              if (fullWorkout.data.sets?.length > 0) {
-                await db.sets.bulkPut(fullWorkout.data.sets);
-              }
-            }
-          } catch {
-            // Individual workout detail fetch failed, skip it
-          }
-        }
-      }
-
-      // Pull meal categories
-      const categoriesRes = await api.get('/nutrition/meal-categories');
-      if (categoriesRes.data) {
-        await db.mealCategories.bulkPut(categoriesRes.data);
-      }
-
-      // Pull foods
-      const foodsRes = await api.get('/nutrition/foods?limit=500');
-      if (foodsRes.data?.items) {
-        await db.foods.bulkPut(foodsRes.data.items);
-      }
-
-      // Pull recent meals (last 7 days) with full details
-      const sevenDaysAgo = new Date();
-      sevenDaysAgo.setDate(sevenDaysAgo.getDate() - 7);
-      const mealsRes = await api.get(
-        `/nutrition/meals?date=${sevenDaysAgo.toISOString().split('T')[0]}`
-      );
-      if (mealsRes.data) {
-        await db.meals.bulkPut(mealsRes.data);
-
-        // Pull full details (with items) for each recent meal
-        for (const meal of mealsRes.data) {
-          try {
-            const fullMeal = await api.get(`/nutrition/meals/${meal.id}`);
-            if (fullMeal.data) {
-              await db.meals.put(fullMeal.data);
-              if (fullMeal.data.items?.length > 0) {
-                await db.mealItems.bulkPut(fullMeal.data.items);
-              }
-            }
-          } catch {
-            // Individual meal detail fetch failed, skip it
-          }
-        }
-      }
+      // Pull everything changed since the last sync, one page at a time
+      await this.pullChanges();
 
       // Pull today's nutrition summary for cache
       try {
@@ -232,6 +174,80 @@ class SyncService {
     }
   }
 
+  // Apply delta pages from /sync/changes until the server has no more
+  private async pullChanges(): Promise<void> {
+    let cursor = localStorage.getItem('syncCursor');
+    let hasMore = true;
+
+    while (hasMore) {
+      const res = await api.get<SyncChangesResponse>('/sync/changes', {
+        params: cursor ? { since: cursor } : {},
+      });
+      const page = res.data;
+
+      await db.transaction(
+        'rw',
+        [
+          db.exercises,
+          db.foods,
+          db.mealCategories,
+          db.workoutTemplates,
+          db.workouts,
+          db.sets,
+          db.meals,
+          db.mealItems,
+        ],
+        async () => {
+          await db.exercises.bulkPut(page.exercises);
+          await db.foods.bulkPut(page.foods);
+          await db.mealCategories.bulkPut(page.meal_categories);
+          await db.workoutTemplates.bulkPut(page.templates);
+
+          // Workouts and meals arrive with their full child lists, so replace children wholesale
+          for (const workout of page.workouts) {
+            await db.workouts.put(workout);
+            await db.sets.where('workout_id').equals(workout.id).delete();
+            await db.sets.bulkPut(workout.sets);
+          }
+          for (const meal of page.meals) {
+            await db.meals.put(meal);
+            await db.mealItems.where('meal_id').equals(meal.id).delete();
+            await db.mealItems.bulkPut(meal.items);
+          }
+
+          for (const tombstone of page.deleted) {
+            switch (tombstone.entity) {
+              case 'exercises':
+                await db.exercises.delete(tombstone.id);
+                break;
+              case 'foods':
+                await db.foods.delete(tombstone.id);
+                break;
+              case 'meal_categories':
+                await db.mealCategories.delete(tombstone.id);
+                break;
+              case 'templates':
+                await db.workoutTemplates.delete(tombstone.id);
+                break;
+              case 'workouts':
+                await db.workouts.delete(tombstone.id);
+                await db.sets.where('workout_id').equals(tombstone.id).delete();
+                break;
+              case 'meals':
+                await db.meals.delete(tombstone.id);
+                await db.mealItems.where('meal_id').equals(tombstone.id).delete();
+                break;
+            }
+          }
+        }
+      );
+
+      cursor = page.next_cursor;
+      hasMore = page.has_more;
+      localStorage.setItem('syncCursor', cursor);
+    }
+  }
+
   // Full sync: push pending changes, then pull latest data
   async fullSync(): Promise<void> {
     console.log('Starting full sync...');
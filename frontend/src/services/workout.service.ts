@@ -17,6 +17,7 @@ import {
   WorkoutWeeklyStats,
   LastCompletedWorkout,
   RecentPR,
+  ExerciseProgression,
 } from '../types/workout';
 
 // Exercises
@@ -451,6 +452,33 @@ export const getRecentPRs = async (): Promise<RecentPR[]> => {
   return response.data;
 };
 
+// Exercise Progression (weekly top weight, e1RM, volume)
+export const getExerciseProgression = async (
+  exerciseId: string,
+  weeks = 52
+): Promise<ExerciseProgression> => {
+  const response = await api.get(`/workouts/analytics/exercises/${exerciseId}`, {
+    params: { weeks },
+  });
+  return response.data;
+};
+
+// Previous Performance for every exercise in a workout (one request)
+export const getWorkoutPreviousPerformance = async (
+  workoutId: string,
+  exerciseIds: string[] = []
+): Promise<PreviousPerformance[]> => {
+  try {
+    const params = new URLSearchParams();
+    exerciseIds.forEach((id) => params.append('exercise_id', id));
+    const response = await api.get(`/workouts/${workoutId}/previous-performance`, { params });
+    return response.data;
+  } catch (error) {
+    console.error('Failed to fetch previous performance:', error);
+    return [];
+  }
+};
+
 // Previous Performance
 export const getPreviousPerformance = async (
   workoutId: string,
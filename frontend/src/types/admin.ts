@@ -31,6 +31,7 @@ export interface UserDetailRow {
 export interface UserListResponse {
   users: UserDetailRow[];
   total: number;
+  next_cursor: string | null;
 }
 
 export interface FeatureAdoption {
@@ -24,6 +24,22 @@ export interface DailyCoaching {
   generated_at: string;
 }
 
+export interface CoachingPending {
+  status: 'pending' | 'running';
+  job_id: string;
+  poll_url: string;
+  retry_after_seconds: number;
+}
+
+export interface CoachingJob {
+  job_id: string;
+  section: string;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  attempts: number;
+  error: string | null;
+  updated_at: string;
+}
+
 export const COACH_OPTIONS: CoachPersona[] = [
   {
     key: 'old_school',
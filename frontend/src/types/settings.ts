@@ -11,6 +11,7 @@ export interface UserSettings {
   macro_percentage_carbs: number | null;
   macro_percentage_fat: number | null;
   coach_type: string;
+  timezone: string;
 }
 
 export interface UpdateUserSettingsRequest {
@@ -26,4 +27,5 @@ export interface UpdateUserSettingsRequest {
   macro_percentage_carbs?: number | null;
   macro_percentage_fat?: number | null;
   coach_type?: string;
+  timezone?: string;
 }
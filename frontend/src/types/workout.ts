@@ -176,3 +176,20 @@ export interface RecentPR {
   date_achieved: string;
   previous_best: number | null;
 }
+
+export interface ExerciseWeekStats {
+  week_start: string;
+  set_count: number;
+  total_reps: number;
+  tonnage: number;
+  top_weight: number | null;
+  e1rm_epley: number | null;
+  e1rm_brzycki: number | null;
+}
+
+export interface ExerciseProgression {
+  exercise_id: string;
+  exercise_name: string;
+  best_e1rm: number | null;
+  weeks: ExerciseWeekStats[];
+}